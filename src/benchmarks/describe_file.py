@@ -0,0 +1,37 @@
+# Copyright (c) Facebook, Inc. and its affiliates.
+#
+# This source code is licensed under the MIT license found in the
+# LICENSE file in the root directory of this source tree.
+import os
+import time
+
+from benchmarks.lib import make_controller
+
+# wide enough for the sidebar, which the description pane is part of
+MAX_X = 201
+MAX_Y = 60
+
+
+def main() -> None:
+    # files that exist, so there is something to describe
+    paths = sorted(
+        os.path.join(root, name)
+        for (root, _dirs, names) in os.walk("pathpicker")
+        for name in names
+        if name.endswith(".py")
+    )
+    controller = make_controller(
+        [f"./{path}:1: a match" for path in paths], max_x=MAX_X, max_y=MAX_Y
+    )
+    for label in ["first time", "again"]:
+        start = time.perf_counter()
+        for _ in paths:
+            controller.file_details.describe_file()
+            controller.move_index(1)
+        elapsed = (time.perf_counter() - start) * 1000 / len(paths)
+        print(f"described {len(paths)} files ({label}) in {elapsed:.2f}ms each")
+        controller.jump_to_index(0)
+
+
+if __name__ == "__main__":
+    main()
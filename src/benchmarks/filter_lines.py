@@ -0,0 +1,33 @@
+# Copyright (c) Facebook, Inc. and its affiliates.
+#
+# This source code is licensed under the MIT license found in the
+# LICENSE file in the root directory of this source tree.
+import time
+from typing import List, Optional
+
+from benchmarks.lib import make_long_list
+from pathpicker.text_index import TrigramIndex
+
+NUM_LINES = 1000000
+# typed one key at a time, like the / filter does
+QUERY = "dir_42/module_1"
+
+
+def main() -> None:
+    lines = make_long_list(NUM_LINES)
+    index = TrigramIndex(NUM_LINES, lines.__getitem__)
+    start = time.perf_counter()
+    while index.index_chunk():
+        pass
+    print(f"indexed {NUM_LINES} lines in {time.perf_counter() - start:.1f}s")
+
+    result: Optional[List[int]] = None
+    for end in range(1, len(QUERY) + 1):
+        start = time.perf_counter()
+        result = index.search(QUERY[:end], result)
+        elapsed = (time.perf_counter() - start) * 1000
+        print(f"{QUERY[:end]!r}: {len(result)} lines in {elapsed:.1f}ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,40 @@
+# Copyright (c) Facebook, Inc. and its affiliates.
+#
+# This source code is licensed under the MIT license found in the
+# LICENSE file in the root directory of this source tree.
+import time
+
+from benchmarks.lib import make_long_list
+from pathpicker.fuzzy import FuzzyFinder
+
+NUM_PATHS = 1000000
+# typed one key at a time, like the fuzzy finder prompt does
+QUERY = "nest42mod7"
+
+
+def main() -> None:
+    paths = make_long_list(NUM_PATHS)
+    finder = FuzzyFinder(NUM_PATHS, paths.__getitem__)
+    start = time.perf_counter()
+    while finder.prepare_chunk():
+        pass
+    print(f"prepared {NUM_PATHS} paths in {time.perf_counter() - start:.1f}s")
+
+    for end in range(1, len(QUERY) + 1):
+        # what a keystroke costs before the first results are shown,
+        # the rest of the batches are scored in between keystrokes
+        start = time.perf_counter()
+        finder.start(QUERY[:end])
+        finder.score_batch()
+        first_batch = (time.perf_counter() - start) * 1000
+        while finder.score_batch():
+            pass
+        total = (time.perf_counter() - start) * 1000
+        print(
+            f"{QUERY[:end]!r}: {finder.get_num_matched()} matches, first "
+            f"results in {first_batch:.1f}ms, all ranked in {total:.0f}ms"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,35 @@
+# Copyright (c) Facebook, Inc. and its affiliates.
+#
+# This source code is licensed under the MIT license found in the
+# LICENSE file in the root directory of this source tree.
+from benchmarks.lib import make_controller, make_long_list, time_per_second
+
+NUM_LINES = 20000
+NUM_MOVES = 5000
+
+
+def main() -> None:
+    controller = make_controller(make_long_list(NUM_LINES))
+
+    deltas = [-1, 1]
+
+    def move_hover(paint: bool = False) -> None:
+        # bounce between two rows so the viewport never scrolls and
+        # we only measure the cost of updating the hovered lines
+        deltas.reverse()
+        controller.move_index(deltas[0])
+        if paint:
+            controller.process_dirty()
+        controller.reset_dirty()
+
+    def move_hover_and_paint() -> None:
+        move_hover(paint=True)
+
+    rate = time_per_second(NUM_MOVES, move_hover)
+    print(f"{rate:.0f} hover moves per second over {NUM_LINES} lines")
+    rate = time_per_second(NUM_MOVES, move_hover_and_paint)
+    print(f"{rate:.0f} hover moves (with repaint) per second")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,52 @@
+# Copyright (c) Facebook, Inc. and its affiliates.
+#
+# This source code is licensed under the MIT license found in the
+# LICENSE file in the root directory of this source tree.
+import time
+from typing import Callable, List, Tuple
+
+import process_input
+from pathpicker.key_bindings import KeyBindings
+from pathpicker.screen_control import Controller
+from pathpicker.screen_flags import ScreenFlags
+from tests.lib.curses_api import CursesForTest
+from tests.lib.screen import ScreenForTest
+
+# Benchmarks are run from the src directory, e.g.:
+#   python -m benchmarks.hover_moves
+
+
+def make_long_list(num_lines: int) -> List[str]:
+    return [
+        f"src/pathpicker/some/nested/dir_{i % 97}/module_{i}.py:{i}: a match"
+        for i in range(num_lines)
+    ]
+
+
+def make_controller(
+    lines: List[str],
+    max_x: int = 120,
+    max_y: int = 40,
+    args: Tuple[str, ...] = (),
+) -> Controller:
+    line_objs = process_input.get_line_objs_from_lines(
+        lines, validate_file_exists=False
+    )
+    screen = ScreenForTest([], max_x=max_x, max_y=max_y)
+    controller = Controller(
+        ScreenFlags.init_from_args(list(args)),
+        KeyBindings([]),
+        screen,
+        line_objs,
+        CursesForTest(),
+    )
+    controller.print_all()
+    controller.reset_dirty()
+    return controller
+
+
+def time_per_second(num_runs: int, func: Callable[[], None]) -> float:
+    start = time.perf_counter()
+    for _ in range(num_runs):
+        func()
+    return num_runs / (time.perf_counter() - start)
@@ -0,0 +1,51 @@
+# Copyright (c) Facebook, Inc. and its affiliates.
+#
+# This source code is licensed under the MIT license found in the
+# LICENSE file in the root directory of this source tree.
+from typing import Tuple
+
+from benchmarks.lib import make_controller, make_long_list, time_per_second
+
+NUM_LINES = 200000
+NUM_PAGES = 200
+
+
+def page_back_and_forth(args: Tuple[str, ...]) -> None:
+    controller = make_controller(make_long_list(NUM_LINES), args=args)
+    drawn = [0]
+    output_line = controller.output_line
+
+    def counting_output_line(line_obj):  # type: ignore
+        drawn[0] += 1
+        output_line(line_obj)
+
+    controller.output_line = counting_output_line  # type: ignore
+    num_pages = [0]
+
+    def page_and_paint() -> None:
+        # page down, then back up again over the same lines
+        if num_pages[0] % (2 * NUM_PAGES) < NUM_PAGES:
+            controller.page_down()
+        else:
+            controller.page_up()
+        num_pages[0] += 1
+        # we leave out refresh_screen since copying a pad onto the
+        # screen is much slower in ScreenForTest than in curses
+        controller.process_dirty()
+        controller.reset_dirty()
+
+    rate = time_per_second(2 * NUM_PAGES, page_and_paint)
+    name = " ".join(args) or "default"
+    print(
+        f"{name}: {drawn[0] / num_pages[0]:.1f} lines drawn per page, "
+        f"{rate:.0f} pages per second"
+    )
+
+
+def main() -> None:
+    page_back_and_forth(())
+    page_back_and_forth(("--pad-scrolling",))
+
+
+if __name__ == "__main__":
+    main()
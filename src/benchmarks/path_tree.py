@@ -0,0 +1,45 @@
+# Copyright (c) Facebook, Inc. and its affiliates.
+#
+# This source code is licensed under the MIT license found in the
+# LICENSE file in the root directory of this source tree.
+import time
+
+from benchmarks.lib import make_long_list
+from pathpicker.path_tree import PathTree
+
+NUM_PATHS = 1000000
+
+
+def open_tree(tree: PathTree) -> str:
+    """Open the tree and then its first directory"""
+    start = time.perf_counter()
+    tree.get_visible_nodes()[0].expanded = True
+    middle = time.perf_counter()
+    tree.get_visible_nodes()
+    end = time.perf_counter()
+    return (
+        f"tree in {(middle - start) * 1000:.0f}ms, "
+        f"first directory in {(end - middle) * 1000:.0f}ms"
+    )
+
+
+def main() -> None:
+    paths = [line.split(":")[0] for line in make_long_list(NUM_PATHS)]
+    cold_tree = PathTree(NUM_PATHS, paths.__getitem__)
+    print(f"opened before grouping: {open_tree(cold_tree)}")
+
+    tree = PathTree(NUM_PATHS, paths.__getitem__)
+    start = time.perf_counter()
+    chunks = 1
+    while tree.prepare_chunk():
+        chunks += 1
+    total = time.perf_counter() - start
+    print(
+        f"grouped in the background in {chunks} chunks of "
+        f"{total / chunks * 1000:.1f}ms, {total:.1f}s in total"
+    )
+    print(f"opened after grouping: {open_tree(tree)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,50 @@
+# Copyright (c) Facebook, Inc. and its affiliates.
+#
+# This source code is licensed under the MIT license found in the
+# LICENSE file in the root directory of this source tree.
+from typing import List
+
+from benchmarks.lib import make_controller, time_per_second
+
+GIT_DIFF_COLOR_INPUT = "./tests/inputs/gitLongDiffColor.txt"
+NUM_PAINTS = 200
+
+
+def make_ls_color_lines(num_lines: int) -> List[str]:
+    # what `ls --color -1 somedir/*` looks like
+    colors = ["01;34", "01;32", "0", "01;36", "0"]
+    return [
+        f"\x1b[0m\x1b[{colors[i % len(colors)]}msomedir/entry_{i}.txt\x1b[0m"
+        for i in range(num_lines)
+    ]
+
+
+def count_calls_per_line(name: str, lines: List[str]) -> None:
+    controller = make_controller(lines, max_x=200, max_y=60)
+    screen = controller.stdscr
+    calls = [0]
+    addstr = screen.addstr
+
+    def counting_addstr(y_pos: int, x_pos: int, string: str, attr: int) -> None:
+        calls[0] += 1
+        addstr(y_pos, x_pos, string, attr)
+
+    screen.addstr = counting_addstr  # type: ignore
+    controller.print_content()
+    _min_x, min_y, _max_x, max_y = controller.get_chrome_boundaries()
+    calls_per_line = calls[0] / min(max_y - min_y, len(lines))
+    rate = time_per_second(NUM_PAINTS, controller.print_content)
+    print(
+        f"{name}: {calls_per_line:.2f} curses calls per line, "
+        f"{rate:.0f} paints per second"
+    )
+
+
+def main() -> None:
+    with open(GIT_DIFF_COLOR_INPUT) as file:
+        count_calls_per_line("git diff --color", file.read().split("\n"))
+    count_calls_per_line("ls --color", make_ls_color_lines(1000))
+
+
+if __name__ == "__main__":
+    main()
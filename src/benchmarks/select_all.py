@@ -0,0 +1,25 @@
+# Copyright (c) Facebook, Inc. and its affiliates.
+#
+# This source code is licensed under the MIT license found in the
+# LICENSE file in the root directory of this source tree.
+from benchmarks.lib import make_controller, make_long_list, time_per_second
+
+NUM_LINES = 100000
+NUM_TOGGLES = 20
+
+
+def main() -> None:
+    controller = make_controller(make_long_list(NUM_LINES))
+
+    def toggle_select_all_and_paint() -> None:
+        controller.toggle_select_all()
+        controller.process_dirty()
+        controller.reset_dirty()
+        controller.get_selected_paths()
+
+    rate = time_per_second(NUM_TOGGLES, toggle_select_all_and_paint)
+    print(f"{rate:.1f} select all toggles per second over {NUM_LINES} lines")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,27 @@
+# Copyright (c) Facebook, Inc. and its affiliates.
+#
+# This source code is licensed under the MIT license found in the
+# LICENSE file in the root directory of this source tree.
+from benchmarks.lib import make_controller, make_long_list, time_per_second
+
+NUM_LINES = 500000
+NUM_PATTERNS = 5
+# matches roughly half of the lines, in runs of one
+PATTERN = "re:[02468].py$"
+
+
+def main() -> None:
+    controller = make_controller(make_long_list(NUM_LINES))
+
+    def select_by_pattern_and_paint() -> None:
+        controller.select_by_pattern(PATTERN)
+        controller.select_by_pattern("!" + PATTERN)
+        controller.process_dirty()
+        controller.reset_dirty()
+
+    rate = time_per_second(NUM_PATTERNS, select_by_pattern_and_paint)
+    print(f"{rate:.1f} pattern selections per second over {NUM_LINES} lines")
+
+
+if __name__ == "__main__":
+    main()
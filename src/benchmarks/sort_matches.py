@@ -0,0 +1,25 @@
+# Copyright (c) Facebook, Inc. and its affiliates.
+#
+# This source code is licensed under the MIT license found in the
+# LICENSE file in the root directory of this source tree.
+import time
+
+from benchmarks.lib import make_controller, make_long_list
+from pathpicker.match_sort import SORT_ORDERS
+
+NUM_LINES = 200000
+
+
+def main() -> None:
+    controller = make_controller(make_long_list(NUM_LINES))
+    # twice around, the second time every order is cached
+    for _ in range(2):
+        for _ in SORT_ORDERS:
+            start = time.perf_counter()
+            controller.cycle_sort_order()
+            elapsed = (time.perf_counter() - start) * 1000
+            print(f"sorted by {controller.sort_order} in {elapsed:.0f}ms")
+
+
+if __name__ == "__main__":
+    main()
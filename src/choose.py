@@ -6,7 +6,7 @@ import curses
 import os
 import pickle
 import sys
-from typing import Dict, List, Optional
+from typing import Dict, Iterator, List, Optional, Tuple, Union
 
 from pathpicker import logger, output, screen_control, state_files
 from pathpicker.curses_api import CursesApi, CursesApiBase
@@ -75,12 +75,12 @@ def set_selections_from_pickle(
     selection_path: str, line_objs: Dict[int, LineBase]
 ) -> None:
     try:
-        selected_indices = pickle.load(open(selection_path, "rb"))
+        selection = pickle.load(open(selection_path, "rb"))
     except (OSError, KeyError, pickle.PickleError):
         output.append_error(LOAD_SELECTION_WARNING)
         output.append_exit()
         sys.exit(1)
-    for index in selected_indices:
+    for index in get_selected_indices(selection):
         if index >= len(line_objs.items()):
             error = f"Found index {index} more than total matches"
             output.append_error(error)
@@ -93,7 +93,27 @@ def set_selections_from_pickle(
             output.append_error(error)
 
 
+def get_selected_indices(selection: List[Union[int, Tuple[int, int]]]) -> Iterator[int]:
+    # selections are saved as (start, end) ranges of indices, but
+    # older versions saved every index on its own
+    for entry in selection:
+        if isinstance(entry, int):
+            yield entry
+        else:
+            (start, end) = entry
+            yield from range(start, end)
+
+
 def main(argv: List[str]) -> int:
+    # the script is only written out once, however we leave (even the
+    # sys.exit calls deep in the controller)
+    try:
+        return run(argv)
+    finally:
+        output.flush()
+
+
+def run(argv: List[str]) -> int:
     file_path = state_files.get_pickle_file_path()
     if not os.path.exists(file_path):
         print("Nothing to do!")
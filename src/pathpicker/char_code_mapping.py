@@ -13,4 +13,7 @@ CODE_TO_CHAR.update(
 # special exceptions
 CODE_TO_CHAR[10] = "ENTER"
 
+ESCAPE_KEY = "\x1b"
+BACKSPACE_KEYS = ["BACKSPACE", "\x7f", "\x08"]
+
 CHAR_TO_CODE: Dict[str, int] = {v: k for k, v in CODE_TO_CHAR.items()}
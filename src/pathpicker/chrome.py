@@ -0,0 +1,406 @@
+# Copyright (c) Facebook, Inc. and its affiliates.
+#
+# This source code is licensed under the MIT license found in the
+# LICENSE file in the root directory of this source tree.
+import curses
+from typing import TYPE_CHECKING, Dict, List
+
+from pathpicker import logger, usage_strings
+from pathpicker.color_printer import ColorPrinter
+from pathpicker.facets import Facet, get_facet_label
+from pathpicker.file_info import LOADING_DESCRIPTION, get_description_lines
+from pathpicker.line_format import LineBase, LineMatch
+from pathpicker.regions import Region
+from pathpicker.screen_flags import ScreenFlags
+
+if TYPE_CHECKING:
+    from pathpicker.screen_control import Controller
+
+CHROME_MIN_X = 5
+CHROME_MIN_Y = 0
+
+SELECT_MODE = "SELECT"
+COMMAND_MODE = "COMMAND_MODE"
+X_MODE = "X_MODE"
+
+# options for displayed to the user at the bottom of the screen
+SHORT_NAV_OPTION_SELECTION_STR = "[f|A] selection"
+SHORT_NAV_OPTION_NAVIGATION_STR = "[down|j|up|k|space|b] navigation"
+SHORT_NAV_OPTION_OPEN_STR = "[enter] open"
+SHORT_NAV_OPTION_QUICK_SELECT_STR = "[x] quick select mode"
+SHORT_NAV_OPTION_COMMAND_STR = "[c] command mode"
+
+SHORT_COMMAND_USAGE = (
+    "command examples: | git add | git checkout HEAD~1 -- | mv $F ../here/ |"
+)
+SHORT_COMMAND_PROMPT = "Type a command below! Paths will be appended or replace $F"
+FACETS_HEADER = "Facets:"
+# the rows the description pane takes: its header, a blank row and the
+# lines of the description
+DESCRIPTION_ROWS = 8
+# the facets take at most a quarter of the sidebar, so on a short screen
+# the usage still has some room
+FACETS_SHARE = 4
+MORE_USAGE = "    ... and more in fpp --help"
+# the facets never take the rows of the basic keys, which end with
+# MORE_USAGE instead of a blank row when the rest of the keys do not fit
+CORE_USAGE_ROWS = len(usage_strings.USAGE_PAGE.split("\n"))
+PREVIEW_HEADER = "Preview of"
+LOADING_PREVIEW = "reading the file..."
+
+INVISIBLE_CURSOR = 0
+BLOCK_CURSOR = 2
+
+
+class HelperChrome:
+    def __init__(
+        self, printer: ColorPrinter, screen_control: "Controller", flags: ScreenFlags
+    ):
+        self.printer = printer
+        self.screen_control = screen_control
+        self.flags = flags
+        self.mode = SELECT_MODE
+        self.width = 50
+        self.sidebar_y = 0
+        self.description_clear = True
+        # a one off message, like the result of selecting by pattern
+        self.status = ""
+        self.side_region = Region(printer)
+        self.bottom_region = Region(printer)
+        if self.get_is_sidebar_mode():
+            logger.add_event("init_wide_mode")
+        else:
+            logger.add_event("init_narrow_mode")
+
+    def output(self, mode: str) -> None:
+        self.mode = mode
+        self.layout()
+        for func in [self.output_side, self.output_bottom, self.toggle_cursor]:
+            try:
+                func()
+            except curses.error:
+                pass
+
+    def layout(self) -> None:
+        max_y, max_x = self.screen_control.get_screen_dimensions()
+        if self.get_is_sidebar_mode():
+            self.side_region.set_geometry(
+                self.get_min_y(), self.get_border_x(), max_y, max_x
+            )
+        else:
+            self.bottom_region.set_geometry(max_y - 2, self.get_min_x(), max_y, max_x)
+
+    def output_description(self, line_obj: LineMatch) -> None:
+        self.output_description_pane(line_obj)
+
+    def set_status(self, status: str) -> None:
+        self.status = status
+
+    def clear_status(self) -> bool:
+        """Clear the status, returning whether there was one to clear"""
+        had_status = bool(self.status)
+        self.status = ""
+        return had_status
+
+    def toggle_cursor(self) -> None:
+        # only include cursor when in command mode
+        if self.mode == COMMAND_MODE:
+            curses.curs_set(BLOCK_CURSOR)
+        else:
+            curses.curs_set(INVISIBLE_CURSOR)
+
+    def reduce_max_y(self, max_y: int) -> int:
+        if self.get_is_sidebar_mode():
+            return max_y
+        return max_y - 4
+
+    def reduce_max_x(self, max_x: int) -> int:
+        if not self.get_is_sidebar_mode():
+            return max_x
+        return max_x - self.width
+
+    def get_min_x(self) -> int:
+        if self.mode == COMMAND_MODE:
+            return 0
+        return self.screen_control.get_chrome_boundaries()[0]
+
+    def get_min_y(self) -> int:
+        return self.screen_control.get_chrome_boundaries()[1]
+
+    def get_is_sidebar_mode(self) -> bool:
+        _max_y, max_x = self.screen_control.get_screen_dimensions()
+        return max_x > 200
+
+    def get_border_x(self) -> int:
+        if self.mode == COMMAND_MODE:
+            return len(SHORT_COMMAND_PROMPT) + 20
+        _max_y, max_x = self.screen_control.get_screen_dimensions()
+        return max_x - self.width
+
+    def trim_line(self, line: str, width: int) -> str:
+        return line[:width]
+
+    def output_description_pane(self, line_obj: LineMatch) -> None:
+        if not self.get_is_sidebar_mode():
+            return
+        _height, width = self.side_region.get_size()
+        start_y = self.sidebar_y + 1
+        start_x = 2
+        header_line = "Description for " + line_obj.path + " :"
+        line_prefix = "    * "
+        file_infos = self.screen_control.file_details.file_infos
+        info = file_infos.peek(line_obj.path)
+        if info is not None:
+            desc_lines = get_description_lines(info)
+        elif file_infos.has(line_obj.path):
+            desc_lines = ["could not read the file"]
+        else:
+            desc_lines = [LOADING_DESCRIPTION]
+        printer = self.side_region.printer
+        printer.addstr(start_y, start_x, header_line)
+        y_pos = start_y + 2
+        for desc_line in desc_lines:
+            desc_line = self.trim_line(desc_line, width - start_x - len(line_prefix))
+            printer.addstr(y_pos, start_x, line_prefix + desc_line)
+            y_pos = y_pos + 1
+        self.description_clear = False
+
+    # to fix bug where description pane may not clear on scroll
+    def clear_description_pane(self) -> None:
+        if self.description_clear:
+            return
+        height, width = self.side_region.get_size()
+        start_y = self.sidebar_y + 1
+        self.side_region.printer.clear_square(start_y, height - 1, 2, width)
+        self.description_clear = True
+
+    def output_side(self) -> None:
+        if not self.get_is_sidebar_mode():
+            return
+        printer = self.side_region.printer
+        height, width = self.side_region.get_size()
+        usage = usage_strings.USAGE_PAGE + usage_strings.USAGE_MORE_KEYS
+        if self.mode == COMMAND_MODE:
+            usage = usage_strings.USAGE_COMMAND
+        usage_lines = usage.split("\n")
+        facets = [] if self.mode == COMMAND_MODE else self.list_facets(height)
+        # the facets and then the description go under the usage, which
+        # gives up its last rows when the screen is too short for all
+        # of them, so the description always fits
+        num_rows = height - DESCRIPTION_ROWS - (len(facets) + 2 if facets else 0)
+        preview_file = self.screen_control.file_details.preview_file
+        if preview_file and self.mode != COMMAND_MODE:
+            self.sidebar_y = self.output_preview(min(height // 2, num_rows))
+        else:
+            self.sidebar_y = self.output_usage(usage_lines, num_rows)
+        if facets:
+            self.sidebar_y = self.output_facets(facets, self.sidebar_y + 1)
+        for y_pos in range(height):
+            printer.addstr(y_pos, 0, "|")
+        if self.status:
+            printer.addstr(height - 1, 2, self.trim_line(self.status, width - 2))
+
+    def output_usage(self, usage_lines: List[str], num_rows: int) -> int:
+        """Show as much of the usage as fits in the rows, returning the
+        last row we used"""
+        if len(usage_lines) > num_rows:
+            # the pointer to the rest takes the place of the blank row
+            usage_lines = usage_lines[: max(num_rows - 1, 0)] + [MORE_USAGE]
+        for index, usage_line in enumerate(usage_lines):
+            self.side_region.printer.addstr(index, 2, usage_line)
+        return len(usage_lines) - 1
+
+    def output_preview(self, num_rows: int) -> int:
+        """Show the lines around the hovered match in the top rows,
+        returning the last row we used"""
+        printer = self.side_region.printer
+        _height, width = self.side_region.get_size()
+        printer.clear_square(0, num_rows, 2, width)
+        line_obj = self.screen_control.line_matches[self.screen_control.hover_index]
+        printer.addstr(
+            0, 2, self.trim_line(f"{PREVIEW_HEADER} {line_obj.path}", width - 2)
+        )
+        preview = self.screen_control.file_details.get_preview(num_rows - 2)
+        if preview is None or preview.note:
+            note = preview.note if preview else LOADING_PREVIEW
+            printer.addstr(2, 2, self.trim_line(f"    ({note})", width - 2))
+            return num_rows - 1
+        for offset, text in enumerate(preview.lines):
+            line_num = preview.first_line + offset
+            marker = ">" if line_num == line_obj.get_line_num() else " "
+            line = f"{marker}{line_num:>6} {text}"
+            printer.addstr(offset + 2, 2, self.trim_line(line, width - 2))
+        return num_rows - 1
+
+    def list_facets(self, height: int) -> List[Facet]:
+        """The facets we have room for, with the header and a blank row"""
+        facet_index = self.screen_control.facet_index
+        num_rows = min(
+            height // FACETS_SHARE, height - DESCRIPTION_ROWS - CORE_USAGE_ROWS
+        )
+        facets = facet_index.list_facets()[: max(num_rows - 2, 0)]
+        # the digits only toggle the facets we show
+        facet_index.listed = facets
+        return facets
+
+    def output_facets(self, facets: List[Facet], y_start: int) -> int:
+        """List the facets under the usage, returning the row the
+        description goes under"""
+        facet_index = self.screen_control.facet_index
+        printer = self.side_region.printer
+        _height, width = self.side_region.get_size()
+        printer.addstr(y_start, 2, FACETS_HEADER)
+        for number, facet in enumerate(facets, 1):
+            check = "x" if facet in facet_index.active else " "
+            line = (
+                f"    [{number}] [{check}] {get_facet_label(facet)} "
+                f"({facet_index.get_count(facet)})"
+            )
+            printer.addstr(y_start + number, 2, self.trim_line(line, width - 2))
+        # leave a blank row before the description, like the usage does
+        return y_start + len(facets) + 1
+
+    def output_bottom(self) -> None:
+        if self.get_is_sidebar_mode():
+            return
+        printer = self.bottom_region.printer
+        _height, width = self.bottom_region.get_size()
+        # first output text since we might throw an exception during border
+        usage_str = {
+            SELECT_MODE: self.get_short_nav_usage_string(),
+            X_MODE: self.get_short_nav_usage_string(),
+            COMMAND_MODE: SHORT_COMMAND_USAGE,
+        }[self.mode]
+        border_str = "_" * width
+        printer.addstr(0, 0, border_str)
+        printer.addstr(1, 0, self.status or usage_str)
+
+    def get_short_nav_usage_string(self) -> str:
+        nav_options = [
+            SHORT_NAV_OPTION_SELECTION_STR,
+            SHORT_NAV_OPTION_NAVIGATION_STR,
+            SHORT_NAV_OPTION_OPEN_STR,
+            SHORT_NAV_OPTION_QUICK_SELECT_STR,
+            SHORT_NAV_OPTION_COMMAND_STR,
+        ]
+
+        # it does not make sense to give the user the option to "open" the selection
+        # in all-input mode
+        if self.flags.get_all_input():
+            nav_options.remove(SHORT_NAV_OPTION_OPEN_STR)
+
+        return ", ".join(nav_options)
+
+
+class ScrollBar:
+    def __init__(
+        self,
+        printer: ColorPrinter,
+        lines: Dict[int, LineBase],
+        screen_control: "Controller",
+    ):
+        self.printer = printer
+        self.screen_control = screen_control
+        # the scroll bar shares its column with the quick select labels
+        self.region = Region(printer)
+        # what we last drew on each row, so we only redraw what changed
+        self.drawn_rows: Dict[int, str] = {}
+        self.num_lines = len(lines)
+        self.box_start_fraction = 0.0
+        self.box_stop_fraction = 0.0
+        self.calc_box_fractions()
+
+        # see if we are activated
+        self.activated = True
+        max_y, _max_x = self.screen_control.get_screen_dimensions()
+        if self.num_lines < max_y:
+            self.activated = False
+            logger.add_event("no_scrollbar")
+        else:
+            logger.add_event("needed_scrollbar")
+
+    def get_is_activated(self) -> bool:
+        return self.activated
+
+    def set_num_lines(self, num_lines: int) -> None:
+        # at least one, so an empty view does not divide by zero
+        self.num_lines = max(num_lines, 1)
+        self.calc_box_fractions()
+
+    def calc_box_fractions(self) -> None:
+        # what we can see is basically the fraction of our screen over
+        # total num lines
+        max_y, _max_x = self.screen_control.get_screen_dimensions()
+        frac_displayed = min(1.0, (max_y / float(self.num_lines)))
+        self.box_start_fraction = -self.screen_control.get_scroll_offset() / float(
+            self.num_lines
+        )
+        self.box_stop_fraction = self.box_start_fraction + frac_displayed
+
+    def layout(self) -> None:
+        max_y, _max_x = self.screen_control.get_screen_dimensions()
+        self.region.set_geometry(0, 0, max_y, CHROME_MIN_X)
+
+    def output(self) -> None:
+        self.layout()
+        self.drawn_rows = {}
+        if not self.activated:
+            return
+        self.output_rows(self.get_rows())
+        try:
+            self.output_border()
+        except curses.error:
+            pass
+
+    def update(self) -> bool:
+        """Redraw only the rows whose contents changed since we last
+        drew, returning whether we drew anything"""
+        if not self.activated:
+            return False
+        rows = self.get_rows()
+        changed_rows = {
+            y_pos: row
+            for y_pos, row in rows.items()
+            if self.drawn_rows.get(y_pos) != row
+        }
+        self.output_rows(changed_rows)
+        return bool(changed_rows)
+
+    def output_rows(self, rows: Dict[int, str]) -> None:
+        for y_pos, row in rows.items():
+            self.drawn_rows[y_pos] = row
+            try:
+                self.region.printer.addstr(y_pos, 0, row)
+            except curses.error:
+                pass
+
+    def get_min_y(self) -> int:
+        return self.screen_control.get_chrome_boundaries()[1] + 1
+
+    def output_border(self) -> None:
+        x_pos = 4
+        height, _width = self.region.get_size()
+        for y_pos in range(0, height):
+            self.region.printer.addstr(y_pos, x_pos, " ")
+
+    def get_rows(self) -> Dict[int, str]:
+        """The caps, base and box (in that order of precedence) drawn
+        on each row"""
+        max_y, _max_x = self.screen_control.get_screen_dimensions()
+        rows: Dict[int, str] = {}
+        for y_pos in [self.get_min_y() - 1, max_y - 1]:
+            rows[y_pos] = "==="
+        for y_pos in range(self.get_min_y(), max_y - 1):
+            rows[y_pos] = " . "
+
+        top_y = max_y - 2
+        min_y = self.get_min_y()
+        diff = top_y - min_y
+        box_start_y = int(diff * self.box_start_fraction) + min_y
+        box_stop_y = int(diff * self.box_stop_fraction) + min_y
+
+        rows[box_start_y] = "/-\\"
+        for y_pos in range(box_start_y + 1, box_stop_y):
+            rows[y_pos] = "|-|"
+        rows[box_stop_y] = "\\-/"
+        return rows
@@ -2,11 +2,70 @@
 #
 # This source code is licensed under the MIT license found in the
 # LICENSE file in the root directory of this source tree.
-from typing import Optional
+import copy
+from collections import OrderedDict
+from typing import Dict, Optional, Tuple
 
+from pathpicker import palette
 from pathpicker.curses_api import CursesApiBase
 from pathpicker.screen import ScreenBase
 
+ColorPair = Tuple[int, int]
+
+
+class ColorPairAllocator:
+
+    """Maps (fg, bg) combinations onto the limited number of curses
+    color pairs. Once we run out, the least recently used pair is
+    redefined -- but only if it has not been used in the current frame,
+    since redefining a pair recolors everything already drawn with it"""
+
+    def __init__(
+        self,
+        curses_api: CursesApiBase,
+        reserved: Dict[ColorPair, int],
+        fallback_index: int,
+    ):
+        self.curses_api = curses_api
+        self.reserved = reserved
+        self.fallback_index = fallback_index
+        self.num_pairs = curses_api.get_color_pairs()
+        # least recently used first
+        self.pairs: "OrderedDict[ColorPair, int]" = OrderedDict()
+        self.last_used_frame: Dict[int, int] = {}
+        self.frame = 0
+
+    def begin_frame(self) -> None:
+        """Start a new frame; call this whenever the screen is erased"""
+        self.frame += 1
+
+    def get_pair_index(self, color_pair: ColorPair) -> int:
+        if color_pair in self.reserved:
+            return self.reserved[color_pair]
+        index = self.pairs.get(color_pair)
+        if index is not None:
+            self.pairs.move_to_end(color_pair)
+        else:
+            index = self.allocate(color_pair)
+            if index is None:
+                return self.fallback_index
+        self.last_used_frame[index] = self.frame
+        return index
+
+    def allocate(self, color_pair: ColorPair) -> Optional[int]:
+        new_index = len(self.reserved) + len(self.pairs)
+        if new_index >= self.num_pairs:
+            if not self.pairs:
+                return None
+            oldest_pair, new_index = next(iter(self.pairs.items()))
+            if self.last_used_frame[new_index] == self.frame:
+                # everything is on screen right now
+                return None
+            del self.pairs[oldest_pair]
+        self.curses_api.init_pair(new_index, *color_pair)
+        self.pairs[color_pair] = new_index
+        return new_index
+
 
 class ColorPrinter:
 
@@ -17,29 +76,43 @@ class ColorPrinter:
     CURRENT_COLORS = -1
 
     def __init__(self, screen: ScreenBase, curses_api: CursesApiBase):
-        self.colors = {}
-        self.colors[(0, 0)] = 0  # 0,0 = white on black is hardcoded
+        reserved = {}
+        reserved[(0, 0)] = 0  # 0,0 = white on black is hardcoded
         # in general, we want to use -1,-1 for most "normal" text printing
-        self.colors[(-1, -1)] = self.DEFAULT_COLOR_INDEX
+        reserved[(-1, -1)] = self.DEFAULT_COLOR_INDEX
         self.curses_api = curses_api
         self.curses_api.init_pair(self.DEFAULT_COLOR_INDEX, -1, -1)
+        self.color_pairs = ColorPairAllocator(
+            curses_api, reserved, self.DEFAULT_COLOR_INDEX
+        )
+        # 256-color input gets mapped onto what the terminal supports
+        self.palette_map = palette.get_palette_map(curses_api.get_colors())
         self.screen = screen
         self.current_attributes = 0  # initialized in set_attributes
 
+    def begin_frame(self) -> None:
+        self.color_pairs.begin_frame()
+
+    def for_screen(self, screen: ScreenBase) -> "ColorPrinter":
+        """Return a printer for another window (e.g. a subwindow or pad
+        of our screen) that shares our color pairs"""
+        printer = copy.copy(self)
+        printer.screen = screen
+        return printer
+
     def set_attributes(self, fg_color: int, bg_color: int, other: int) -> None:
         self.current_attributes = self.get_attributes(fg_color, bg_color, other)
 
+    def get_palette_color(self, color: int) -> int:
+        # negative colors mean "use the terminal default"
+        if 0 <= color < len(self.palette_map):
+            return self.palette_map[color]
+        return color
+
     def get_attributes(self, fg_color: int, bg_color: int, other: int) -> int:
-        color_index = -1
-        color_pair = (fg_color, bg_color)
-        if color_pair not in self.colors:
-            new_index = len(self.colors)
-            if new_index < self.curses_api.get_color_pairs():
-                self.curses_api.init_pair(new_index, fg_color, bg_color)
-                self.colors[color_pair] = new_index
-                color_index = new_index
-        else:
-            color_index = self.colors[color_pair]
+        color_index = self.color_pairs.get_pair_index(
+            (self.get_palette_color(fg_color), self.get_palette_color(bg_color))
+        )
 
         attr = self.curses_api.color_pair(color_index)
 
@@ -32,6 +32,10 @@ class CursesApiBase(ABC):
     def get_color_pairs(self) -> int:
         pass
 
+    @abstractmethod
+    def get_colors(self) -> int:
+        pass
+
     @abstractmethod
     def exit(self) -> None:
         pass
@@ -65,6 +69,10 @@ class CursesApi(CursesApiBase):
         assert hasattr(curses, "COLOR_PAIRS"), "curses is not initialized!"
         return curses.COLOR_PAIRS
 
+    def get_colors(self) -> int:
+        assert hasattr(curses, "COLORS"), "curses is not initialized!"
+        return curses.COLORS
+
     def exit(self) -> None:
         sys.exit(0)
 
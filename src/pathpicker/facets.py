@@ -0,0 +1,112 @@
+# Copyright (c) Facebook, Inc. and its affiliates.
+#
+# This source code is licensed under the MIT license found in the
+# LICENSE file in the root directory of this source tree.
+import os
+from typing import Dict, List, NamedTuple, Sequence, Set, Tuple
+
+from pathpicker.parse import PREPEND_PATH
+from pathpicker.repos import REPOS
+
+EXTENSION = "extension"
+TOP_DIR = "top_dir"
+ROOT = "root"
+# how many facets of every kind we list, at most nine in total so each
+# of them can be toggled with a single digit
+LISTED_PER_KIND = {EXTENSION: 4, TOP_DIR: 3, ROOT: 2}
+
+
+class Facet(NamedTuple):
+    kind: str
+    value: str
+
+
+def get_roots() -> List[str]:
+    """The directories prepend_dir resolves paths against, longest
+    first so the most specific one wins"""
+    home = os.path.expanduser("~/")
+    roots = [PREPEND_PATH, "./", "../", "/"]
+    roots += [f"{home}{repo}/" for repo in REPOS if repo]
+    return sorted(set(roots), key=len, reverse=True)
+
+
+ROOTS = get_roots()
+
+
+def get_facets(path: str) -> Tuple[Facet, Facet, Facet]:
+    """The root a path was resolved against, the first directory under
+    it and the extension of the file"""
+    root = next((root for root in ROOTS if path.startswith(root)), "")
+    rest = path[len(root) :]
+    top_dir = rest[: rest.find("/") + 1]
+    basename = rest[rest.rfind("/") + 1 :]
+    extension = os.path.splitext(basename)[1]
+    return (Facet(ROOT, root), Facet(TOP_DIR, top_dir), Facet(EXTENSION, extension))
+
+
+def get_facet_label(facet: Facet) -> str:
+    if facet.kind == EXTENSION:
+        return f"*{facet.value}" if facet.value else "no extension"
+    if facet.kind == TOP_DIR:
+        return facet.value or "top level files"
+    return f"under {facet.value}" if facet.value else "other roots"
+
+
+class FacetIndex:
+
+    """The matches of every facet (like every .py file), kept up to
+    date as the matches come in. Only the matches of the facets that are
+    turned on are shown: facets of the same kind add up, and facets of
+    different kinds narrow each other down"""
+
+    def __init__(self) -> None:
+        self.matches: Dict[Facet, List[int]] = {}
+        self.num_matches = 0
+        self.active: Set[Facet] = set()
+        # the facets last shown to the user, which the digits toggle
+        self.listed: List[Facet] = []
+
+    def add(self, path: str, match_index: int) -> None:
+        for facet in get_facets(path):
+            matches = self.matches.get(facet)
+            if matches is None:
+                self.matches[facet] = [match_index]
+            else:
+                matches.append(match_index)
+        self.num_matches += 1
+
+    def get_count(self, facet: Facet) -> int:
+        return len(self.matches.get(facet, ()))
+
+    def list_facets(self) -> List[Facet]:
+        """The biggest facets of every kind, leaving out the ones that
+        would not narrow anything down (unless they are on)"""
+        self.listed = []
+        for kind, limit in LISTED_PER_KIND.items():
+            facets = [
+                facet
+                for facet, matches in self.matches.items()
+                if facet.kind == kind
+                and (len(matches) < self.num_matches or facet in self.active)
+            ]
+            facets.sort(key=lambda facet: (-self.get_count(facet), facet.value))
+            self.listed += facets[:limit]
+        return self.listed
+
+    def toggle(self, facet: Facet) -> None:
+        if facet in self.active:
+            self.active.remove(facet)
+        else:
+            self.active.add(facet)
+
+    def get_active_matches(self) -> Sequence[int]:
+        """The sorted matches of the facets that are on. A single facet
+        hands out its own list, so turning it on does not copy anything"""
+        if not self.active:
+            return range(self.num_matches)
+        if len(self.active) == 1:
+            return self.matches[next(iter(self.active))]
+        by_kind: Dict[str, Set[int]] = {}
+        for facet in self.active:
+            by_kind.setdefault(facet.kind, set()).update(self.matches[facet])
+        return sorted(set.intersection(*by_kind.values()))
@@ -0,0 +1,121 @@
+# Copyright (c) Facebook, Inc. and its affiliates.
+#
+# This source code is licensed under the MIT license found in the
+# LICENSE file in the root directory of this source tree.
+from typing import TYPE_CHECKING, Optional
+
+from pathpicker import logger
+from pathpicker.file_info import (
+    DESCRIBE_WAIT,
+    PREFETCH_NEIGHBOURS,
+    FileInfoCache,
+    FileInfoPrefetcher,
+)
+from pathpicker.line_format import LineMatch
+from pathpicker.preview import FilePreviewer, Preview
+from pathpicker.scheduler import DEFAULT_TIME_SLICE
+
+if TYPE_CHECKING:
+    from pathpicker.screen_control import Controller
+
+
+class FileDetails:
+
+    """What the sidebar shows about the file of the hovered match: its
+    description and a preview of the lines around the match. Both read
+    the file in the background so moving the hover never blocks on it"""
+
+    def __init__(self, controller: "Controller"):
+        self.controller = controller
+        # what the description pane shows about the files we described
+        self.file_infos = FileInfoCache()
+        self.prefetcher = FileInfoPrefetcher(self.file_infos)
+        # once a file is described we prefetch around the hover
+        self.prefetch_descriptions = False
+        # the sidebar can show the lines around the hovered match instead
+        # of the usage
+        self.previewer = FilePreviewer()
+        self.preview_file = False
+
+    def get_hovered_line(self) -> LineMatch:
+        return self.controller.line_matches[self.controller.hover_index]
+
+    def describe_file(self) -> None:
+        """Describe the hovered file once the prefetch thread has read
+        it. If that takes a while we show what we had (or a placeholder)
+        and fill it in when it arrives"""
+        helper_chrome = self.controller.helper_chrome
+        if not helper_chrome.get_is_sidebar_mode():
+            # there is no pane to describe it in
+            return
+        line_obj = self.get_hovered_line()
+        self.prefetch_descriptions = True
+        self.prefetch_file_infos()
+        read = self.prefetcher.wait_for(line_obj.path, DESCRIBE_WAIT)
+        helper_chrome.output_description(line_obj)
+        if not read:
+            self.controller.scheduler.submit(
+                "describe_file", None, lambda: self.fill_in_description(line_obj)
+            )
+
+    def fill_in_description(self, line_obj: LineMatch) -> bool:
+        """Show the description once the file is read, unless the pane
+        was cleared (e.g. by moving) since. Returns whether to keep
+        waiting"""
+        helper_chrome = self.controller.helper_chrome
+        if helper_chrome.description_clear:
+            return False
+        read = self.prefetcher.wait_for(line_obj.path, DEFAULT_TIME_SLICE)
+        # a file we could not read will not be read by waiting longer
+        failed = self.file_infos.has(line_obj.path) and (
+            self.file_infos.peek(line_obj.path) is None
+        )
+        if not read and not failed:
+            return True
+        helper_chrome.output_description(line_obj)
+        return False
+
+    def prefetch_file_infos(self) -> None:
+        """Read the hovered file and the files of the matches around it
+        in the background, dropping whatever was left around the old
+        hover"""
+        controller = self.controller
+        if not controller.view.get_num_matches():
+            return
+        neighbours = [
+            controller.view.get_nearest_match(controller.hover_index, delta)
+            for distance in range(1, PREFETCH_NEIGHBOURS + 1)
+            for delta in [distance, -distance]
+        ]
+        paths = [controller.line_matches[index].path for index in neighbours]
+        self.prefetcher.prefetch(
+            [self.get_hovered_line().path]
+            + [path for path in paths if not self.file_infos.has(path)]
+        )
+
+    def toggle_preview(self) -> None:
+        controller = self.controller
+        if not controller.helper_chrome.get_is_sidebar_mode():
+            controller.helper_chrome.set_status("The preview needs a wider terminal")
+            return
+        self.preview_file = not self.preview_file
+        logger.add_event("toggle_preview")
+        controller.dirty_all()
+
+    def get_preview(self, num_lines: int) -> Optional[Preview]:
+        """The lines around the hovered match, or None while its file is
+        being indexed, which goes on in the background"""
+        line_obj = self.get_hovered_line()
+        preview = self.previewer.get_preview(
+            line_obj.path, line_obj.get_line_num(), num_lines
+        )
+        if preview is None:
+            self.controller.scheduler.submit("preview", None, self.index_preview)
+        return preview
+
+    def index_preview(self) -> bool:
+        if self.previewer.index_pending():
+            return True
+        if self.preview_file:
+            self.controller.print_chrome()
+        return False
@@ -0,0 +1,195 @@
+# Copyright (c) Facebook, Inc. and its affiliates.
+#
+# This source code is licensed under the MIT license found in the
+# LICENSE file in the root directory of this source tree.
+import grp
+import mmap
+import os
+import pwd
+import stat
+import threading
+import time
+from collections import OrderedDict
+from functools import lru_cache
+from typing import List, NamedTuple, Optional, Set
+
+# how many files we keep the description of, most recently used first
+MAX_CACHED_FILES = 1024
+# counting lines a slice of the mapped file at a time keeps the copies
+# small while the counting itself is done in C
+LINE_COUNT_CHUNK = 1 << 20
+TIME_FORMAT = "%m/%d/%Y %H:%M:%S"
+# how many matches on either side of the hovered one we prefetch
+PREFETCH_NEIGHBOURS = 5
+# how long d waits for the hovered file before showing a placeholder,
+# plenty for a local disk
+DESCRIBE_WAIT = 0.1
+LOADING_DESCRIPTION = "loading..."
+
+
+class FileInfo(NamedTuple):
+    stat: os.stat_result
+    user: str
+    group: str
+    num_lines: int
+
+
+# looking a name up can go out to NSS (e.g. LDAP), and a handful of
+# users and groups own every file we show
+@lru_cache(maxsize=None)
+def get_user_name(uid: int) -> str:
+    try:
+        return pwd.getpwuid(uid).pw_name
+    except KeyError:
+        return str(uid)
+
+
+@lru_cache(maxsize=None)
+def get_group_name(gid: int) -> str:
+    try:
+        return grp.getgrgid(gid).gr_name
+    except KeyError:
+        return str(gid)
+
+
+def count_lines(path: str, file_stat: os.stat_result) -> int:
+    """The number of newlines in a file, like wc -l"""
+    if not stat.S_ISREG(file_stat.st_mode) or file_stat.st_size == 0:
+        return 0
+    with open(path, "rb") as file, mmap.mmap(
+        file.fileno(), 0, access=mmap.ACCESS_READ
+    ) as mapped:
+        return sum(
+            mapped[start : start + LINE_COUNT_CHUNK].count(b"\n")
+            for start in range(0, len(mapped), LINE_COUNT_CHUNK)
+        )
+
+
+def read_file_info(path: str, file_stat: os.stat_result) -> FileInfo:
+    return FileInfo(
+        file_stat,
+        get_user_name(file_stat.st_uid),
+        get_group_name(file_stat.st_gid),
+        count_lines(path, file_stat),
+    )
+
+
+def format_size(size: int) -> str:
+    for unit in ["B", "K", "M", "G", "T", "P", "E", "Z"]:
+        if size < 1024:
+            return f"{size}{unit}"
+        size //= 1024
+    raise AssertionError("Unreachable")
+
+
+def get_description_lines(info: FileInfo) -> List[str]:
+    file_stat = info.stat
+    accessed = time.strftime(TIME_FORMAT, time.localtime(file_stat.st_atime))
+    modified = time.strftime(TIME_FORMAT, time.localtime(file_stat.st_mtime))
+    lines_caption = "lines" if info.num_lines > 1 else "line"
+    return [
+        f"last accessed: {accessed}",
+        f"last modified: {modified}",
+        f"owned by user: {info.user}, {file_stat.st_uid}",
+        f"owned by group: {info.group}, {file_stat.st_gid}",
+        f"size: {format_size(file_stat.st_size)}",
+        f"length: {info.num_lines} {lines_caption}",
+    ]
+
+
+class FileInfoCache:
+
+    """What we describe about the files we have shown (None for the ones
+    we could not read), so describing a file again only costs a stat. An
+    entry is read again once the file is modified, and the least
+    recently used ones are dropped past MAX_CACHED_FILES. The prefetch
+    thread fills the cache too, so the entries are only touched under a
+    lock (and the file system never is)"""
+
+    def __init__(self) -> None:
+        self.infos: "OrderedDict[str, Optional[FileInfo]]" = OrderedDict()
+        self.lock = threading.Lock()
+
+    def has(self, path: str) -> bool:
+        with self.lock:
+            return path in self.infos
+
+    def peek(self, path: str) -> Optional[FileInfo]:
+        """What we last read about the file, without going to the file
+        system"""
+        with self.lock:
+            return self.infos.get(path)
+
+    def get(self, path: str) -> Optional[FileInfo]:
+        info = self.peek(path)
+        try:
+            file_stat = os.stat(path)
+            if (
+                info is not None
+                and info.stat.st_mtime_ns == file_stat.st_mtime_ns
+                and info.stat.st_size == file_stat.st_size
+            ):
+                # the access time is the only thing that changes on a read
+                info = info._replace(stat=file_stat)
+            else:
+                info = read_file_info(path, file_stat)
+        except (OSError, ValueError):
+            info = None
+        self.put(path, info)
+        return info
+
+    def put(self, path: str, info: Optional[FileInfo]) -> None:
+        with self.lock:
+            self.infos[path] = info
+            self.infos.move_to_end(path)
+            while len(self.infos) > MAX_CACHED_FILES:
+                self.infos.popitem(last=False)
+
+
+class FileInfoPrefetcher:
+
+    """Reads the infos of files on a worker thread, so describing a file
+    on a slow (e.g. network) mount never blocks the UI. Asking for new
+    paths drops the ones we have not got to yet, so the worker follows
+    the cursor instead of a backlog"""
+
+    def __init__(self, cache: FileInfoCache):
+        self.cache = cache
+        self.condition = threading.Condition()
+        # the paths to read, first one first
+        self.wanted: List[str] = []
+        # the paths read since they were last asked for
+        self.fetched: Set[str] = set()
+        self.thread: Optional[threading.Thread] = None
+
+    def prefetch(self, paths: List[str]) -> None:
+        with self.condition:
+            self.wanted = list(dict.fromkeys(paths))
+            self.fetched.difference_update(self.wanted)
+            self.condition.notify_all()
+        if self.thread is None:
+            self.thread = threading.Thread(target=self.run, daemon=True)
+            self.thread.start()
+
+    def run(self) -> None:
+        while True:
+            with self.condition:
+                while not self.wanted:
+                    self.condition.wait()
+                path = self.wanted.pop(0)
+            self.cache.get(path)
+            with self.condition:
+                self.fetched.add(path)
+                self.condition.notify_all()
+
+    def wait_for(self, path: str, timeout: float) -> bool:
+        """Wait (up to the timeout) for the path we asked for to be read,
+        returning whether it was"""
+        deadline = time.monotonic() + timeout
+        with self.condition:
+            while path not in self.fetched:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return False
+                self.condition.wait(remaining)
+        return True
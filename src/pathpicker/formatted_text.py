@@ -5,8 +5,10 @@
 import curses
 import re
 from collections import namedtuple
-from typing import Optional, Tuple
+from functools import lru_cache
+from typing import List, Optional, Tuple
 
+from pathpicker import palette
 from pathpicker.color_printer import ColorPrinter
 
 
@@ -22,6 +24,16 @@ class FormattedText:
     Range = namedtuple("Range", "bottom top")
     FOREGROUND_RANGE = Range(30, 39)
     BACKGROUND_RANGE = Range(40, 49)
+    BRIGHT_FOREGROUND_RANGE = Range(90, 97)
+    BRIGHT_BACKGROUND_RANGE = Range(100, 107)
+    NUM_BASIC_COLORS = 8
+    # 38;5;N (256 color) or 38;2;R;G;B (truecolor), and 48;... for background
+    EXTENDED_FOREGROUND = 38
+    EXTENDED_BACKGROUND = 48
+    EXTENDED_256_COLOR = 5
+    EXTENDED_TRUE_COLOR = 2
+    # inputs only ever use a small set of distinct escape sequences
+    MAX_CACHED_FORMATTINGS = 1024
 
     def __init__(self, text: Optional[str] = None):
         self.text = text
@@ -39,6 +51,7 @@ class FormattedText:
         return self.plain_text
 
     @classmethod
+    @lru_cache(maxsize=MAX_CACHED_FORMATTINGS)
     def parse_formatting(cls, formatting: str) -> Tuple[int, int, int]:
         """Parse ANSI formatting; the formatting passed in should be
         stripped of the control characters and ending character"""
@@ -46,11 +59,36 @@ class FormattedText:
         bg_color = -1
         other = 0
         int_values = [int(value) for value in formatting.split(";") if value]
-        for code in int_values:
-            if cls.FOREGROUND_RANGE.bottom <= code <= cls.FOREGROUND_RANGE.top:
+        index = 0
+        while index < len(int_values):
+            code = int_values[index]
+            index += 1
+            if code in (cls.EXTENDED_FOREGROUND, cls.EXTENDED_BACKGROUND):
+                color, index = cls.parse_extended_color(int_values, index)
+                if color is not None and code == cls.EXTENDED_FOREGROUND:
+                    fg_color = color
+                elif color is not None:
+                    bg_color = color
+            elif cls.FOREGROUND_RANGE.bottom <= code <= cls.FOREGROUND_RANGE.top:
                 fg_color = code - cls.FOREGROUND_RANGE.bottom
             elif cls.BACKGROUND_RANGE.bottom <= code <= cls.BACKGROUND_RANGE.top:
                 bg_color = code - cls.BACKGROUND_RANGE.bottom
+            elif (
+                cls.BRIGHT_FOREGROUND_RANGE.bottom
+                <= code
+                <= cls.BRIGHT_FOREGROUND_RANGE.top
+            ):
+                fg_color = (
+                    code - cls.BRIGHT_FOREGROUND_RANGE.bottom + cls.NUM_BASIC_COLORS
+                )
+            elif (
+                cls.BRIGHT_BACKGROUND_RANGE.bottom
+                <= code
+                <= cls.BRIGHT_BACKGROUND_RANGE.top
+            ):
+                bg_color = (
+                    code - cls.BRIGHT_BACKGROUND_RANGE.bottom + cls.NUM_BASIC_COLORS
+                )
             elif code == cls.BOLD_ATTRIBUTE:
                 other = other | curses.A_BOLD
             elif code == cls.UNDERLINE_ATTRIBUTE:
@@ -58,6 +96,23 @@ class FormattedText:
 
         return fg_color, bg_color, other
 
+    @classmethod
+    def parse_extended_color(
+        cls, int_values: List[int], index: int
+    ) -> Tuple[Optional[int], int]:
+        """Parse the color following a 38 or 48 code, returning the xterm
+        color index (if any) and the index of the next code to parse"""
+        mode = int_values[index] if index < len(int_values) else None
+        if mode == cls.EXTENDED_256_COLOR and index + 1 < len(int_values):
+            return min(int_values[index + 1], palette.NUM_XTERM_COLORS - 1), index + 2
+        if mode == cls.EXTENDED_TRUE_COLOR and index + 3 < len(int_values):
+            red, green, blue = (
+                min(value, 255) for value in int_values[index + 1 : index + 4]
+            )
+            return palette.get_xterm_index_for_rgb(red, green, blue), index + 4
+        # malformed, so we can't know where the next code starts
+        return None, len(int_values)
+
     @classmethod
     def get_sequence_for_attributes(
         cls, fg_color: int, bg_color: int, attr: int
@@ -79,6 +134,11 @@ class FormattedText:
     ) -> None:
         """Print out using ncurses. Note that if any formatting changes
         occur, the attribute set is changed and not restored"""
+        # adjacent segments that end up with the same attributes are
+        # merged into one run so we only call into curses once for them
+        run_start = x_pos
+        run_pieces: List[str] = []
+        run_attributes = ColorPrinter.CURRENT_COLORS
         printed_so_far = 0
         for index, val in enumerate(self.segments):
             if printed_so_far >= max_len:
@@ -86,13 +146,24 @@ class FormattedText:
             if index % 2 == 1:
                 # text
                 to_print = val[0 : max_len - printed_so_far]
-                printer.addstr(
-                    y_pos, x_pos + printed_so_far, to_print, ColorPrinter.CURRENT_COLORS
-                )
+                if not to_print:
+                    continue
+                attributes = printer.current_attributes
+                if run_pieces and attributes != run_attributes:
+                    printer.addstr(
+                        y_pos, run_start, "".join(run_pieces), run_attributes
+                    )
+                    run_pieces = []
+                if not run_pieces:
+                    run_start = x_pos + printed_so_far
+                    run_attributes = attributes
+                run_pieces.append(to_print)
                 printed_so_far += len(to_print)
             else:
                 # formatting
                 printer.set_attributes(*self.parse_formatting(val))
+        if run_pieces:
+            printer.addstr(y_pos, run_start, "".join(run_pieces), run_attributes)
 
     def find_segment_place(self, to_go: int) -> Tuple[int, int]:
         index = 1
@@ -0,0 +1,192 @@
+# Copyright (c) Facebook, Inc. and its affiliates.
+#
+# This source code is licensed under the MIT license found in the
+# LICENSE file in the root directory of this source tree.
+import heapq
+from bisect import bisect_left
+from functools import partial
+from itertools import compress
+from typing import Callable, List, Optional, Sequence, Tuple
+
+# how many paths we prepare or score per call, small enough to fit in
+# the time slice of the idle scheduler
+PREPARE_CHUNK_PATHS = 5000
+SCORE_BATCH_PATHS = 5000
+# we only rank (and show) the best matches
+MAX_RESULTS = 1000
+
+NO_SCORE = -1
+ALL_BITS = (1 << 64) - 1
+MATCH_SCORE = 16
+CONSECUTIVE_BONUS = 12
+BOUNDARY_BONUS = 10
+BASENAME_BONUS = 8
+GAP_PENALTY = 1
+SEPARATORS = "/_-. "
+
+
+def get_char_mask(text: str) -> int:
+    """A bit for every character (folded onto 64 bits) in the text, so
+    a path can only match a query if it has all of the query's bits"""
+    mask = 0
+    for char in set(text):
+        mask |= 1 << (ord(char) & 63)
+    return mask
+
+
+def is_subsequence(query: str, text: str) -> bool:
+    position = -1
+    for char in query:
+        position = text.find(char, position + 1)
+        if position < 0:
+            return False
+    return True
+
+
+def get_positions(query: str, text: str) -> Optional[List[int]]:
+    """Where the characters of the query are in the text, or None if
+    they are not all there in order. Like fzf, we find where the first
+    match ends and then walk back from there, to get the tightest match
+    instead of the one that starts first"""
+    end = -1
+    for char in query:
+        end = text.find(char, end + 1)
+        if end < 0:
+            return None
+    positions = []
+    position = end + 1
+    for char in reversed(query):
+        position = text.rfind(char, 0, position)
+        positions.append(position)
+    positions.reverse()
+    return positions
+
+
+def get_score(query: str, text: str) -> int:
+    """Score how well the query matches the text: matches that are
+    consecutive, start a path segment or are in the basename score
+    higher, and gaps score lower. Returns NO_SCORE if the text does not
+    contain the characters of the query in order"""
+    # a match in the basename is almost always what we are after
+    basename_start = text.rfind("/") + 1
+    positions = get_positions(query, text[basename_start:])
+    if positions is not None:
+        positions = [basename_start + position for position in positions]
+    else:
+        positions = get_positions(query, text)
+        if positions is None:
+            return NO_SCORE
+    score = 0
+    previous = -2
+    for position in positions:
+        score += MATCH_SCORE
+        if position == previous + 1:
+            score += CONSECUTIVE_BONUS
+        elif position == 0 or text[position - 1] in SEPARATORS:
+            score += BOUNDARY_BONUS
+        elif previous >= 0:
+            score -= GAP_PENALTY * min(position - previous - 1, MATCH_SCORE)
+        previous = position
+    if positions and positions[0] >= basename_start:
+        score += BASENAME_BONUS
+    # between otherwise equal matches, prefer the shorter path
+    return max(score * 256 - len(text), 0)
+
+
+class FuzzyFinder:
+
+    """Ranks paths by how well they fuzzily match a query.
+
+    Paths are prepared (lowercased and given a character mask) in the
+    background. Paths are then ranked a batch at a time, so the best
+    matches so far can be shown right away. Each batch first drops the
+    paths that do not have every character of the query by comparing
+    masks, which is cheap since it loops in C, and only scores the
+    rest"""
+
+    def __init__(self, num_paths: int, get_path: Callable[[int], str]):
+        self.num_paths = num_paths
+        self.get_path = get_path
+        self.texts: List[str] = []
+        self.masks: List[int] = []
+        # the bits that every prepared path has
+        self.common_mask = ALL_BITS
+        self.query = ""
+        self.query_mask = 0
+        # the paths we rank for the query, how many of them we went
+        # through so far and the ones that matched
+        self.candidates: Sequence[int] = []
+        self.num_scored = 0
+        self.matched: List[int] = []
+        # the best (score, -index) pairs so far, worst first
+        self.best: List[Tuple[int, int]] = []
+
+    def prepare_chunk(self) -> bool:
+        """Prepare the next chunk of paths, returning whether there are
+        paths left to prepare"""
+        start = len(self.texts)
+        for index in range(start, min(start + PREPARE_CHUNK_PATHS, self.num_paths)):
+            text = self.get_path(index).lower()
+            self.texts.append(text)
+            mask = get_char_mask(text)
+            self.masks.append(mask)
+            self.common_mask &= mask
+        return len(self.texts) < self.num_paths
+
+    def get_text(self, index: int) -> str:
+        if index < len(self.texts):
+            return self.texts[index]
+        return self.get_path(index).lower()
+
+    def start(self, query: str) -> None:
+        """Start ranking the paths for a new query"""
+        query = query.lower()
+        if self.query and not self.has_more() and is_subsequence(self.query, query):
+            # anything that matches the new query matched the old one
+            self.candidates = self.matched
+        else:
+            self.candidates = range(self.num_paths)
+        self.query = query
+        self.query_mask = get_char_mask(query)
+        self.num_scored = 0
+        self.matched = []
+        self.best = []
+
+    def has_more(self) -> bool:
+        return self.num_scored < len(self.candidates)
+
+    def filter_batch(self, batch: Sequence[int]) -> Sequence[int]:
+        """Drop the paths that are missing characters of the query"""
+        query_mask = self.query_mask
+        if query_mask & self.common_mask == query_mask:
+            return batch
+        # the batch is sorted, so only its start has been prepared
+        split = bisect_left(batch, len(self.masks))
+        (prepared, unprepared) = (batch[:split], batch[split:])
+        masks = map(self.masks.__getitem__, prepared)
+        has_all = map(query_mask.__eq__, map(query_mask.__and__, masks))
+        return list(compress(prepared, has_all)) + list(unprepared)
+
+    def score_batch(self) -> bool:
+        """Score the next batch of paths, returning whether there are
+        paths left to score"""
+        batch = self.candidates[self.num_scored : self.num_scored + SCORE_BATCH_PATHS]
+        self.num_scored += len(batch)
+        batch = self.filter_batch(batch)
+        scores = map(partial(get_score, self.query), map(self.get_text, batch))
+        for index, score in zip(batch, scores):
+            if score == NO_SCORE:
+                continue
+            self.matched.append(index)
+            if len(self.best) < MAX_RESULTS:
+                heapq.heappush(self.best, (score, -index))
+            elif (score, -index) > self.best[0]:
+                heapq.heapreplace(self.best, (score, -index))
+        return self.has_more()
+
+    def get_results(self) -> List[int]:
+        """The indexes of the best paths so far, best first"""
+        return [-negated for _score, negated in sorted(self.best, reverse=True)]
+
+    def get_num_matched(self) -> int:
+        return len(self.matched)
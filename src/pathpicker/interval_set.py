@@ -0,0 +1,134 @@
+# Copyright (c) Facebook, Inc. and its affiliates.
+#
+# This source code is licensed under the MIT license found in the
+# LICENSE file in the root directory of this source tree.
+from bisect import bisect_left, bisect_right
+from typing import Callable, Iterable, Iterator, List, Tuple
+
+
+class IntervalSet:
+    """A set of integers stored as sorted, disjoint half open ranges.
+
+    The ranges are kept as one flat, strictly increasing list of
+    boundaries [start0, end0, start1, end1, ...], so an integer is in
+    the set if an odd number of boundaries are at or below it. Lookups
+    are a binary search, and adding, removing or toggling a range only
+    replaces the boundaries that fall inside of it"""
+
+    def __init__(self, ranges: Iterable[Tuple[int, int]] = ()):
+        self.bounds: List[int] = []
+        self.count = 0
+        for start, end in ranges:
+            self.add_range(start, end)
+
+    @staticmethod
+    def from_indexes(indexes: Iterable[int]) -> "IntervalSet":
+        interval_set = IntervalSet()
+        for index in sorted(set(indexes)):
+            bounds = interval_set.bounds
+            if bounds and bounds[-1] == index:
+                bounds[-1] = index + 1
+            else:
+                bounds.extend([index, index + 1])
+        interval_set.count = interval_set.get_covered(interval_set.bounds, 0)
+        return interval_set
+
+    def __contains__(self, index: int) -> bool:
+        return bisect_right(self.bounds, index) % 2 == 1
+
+    def __len__(self) -> int:
+        return self.count
+
+    def __iter__(self) -> Iterator[int]:
+        for start, end in self.get_ranges():
+            yield from range(start, end)
+
+    def get_ranges(self) -> List[Tuple[int, int]]:
+        return list(zip(self.bounds[0::2], self.bounds[1::2]))
+
+    @staticmethod
+    def get_covered(bounds: List[int], first_position: int) -> int:
+        """How much the given boundaries add to our count, if they
+        start at the given position in our list of boundaries"""
+        covered = 0
+        for position, bound in enumerate(bounds, first_position):
+            covered += bound if position % 2 else -bound
+        return covered
+
+    def replace_bounds(self, low: int, high: int, new_bounds: List[int]) -> None:
+        old_bounds = self.bounds[low:high]
+        self.count += self.get_covered(new_bounds, low) - self.get_covered(
+            old_bounds, low
+        )
+        self.bounds[low:high] = new_bounds
+
+    def add_range(self, start: int, end: int) -> None:
+        if start >= end:
+            return
+        low = bisect_left(self.bounds, start)
+        high = bisect_right(self.bounds, end)
+        new_bounds = []
+        # we only need new boundaries if we are not already inside (or
+        # right next to) a range, otherwise we merge with it
+        if low % 2 == 0:
+            new_bounds.append(start)
+        if high % 2 == 0:
+            new_bounds.append(end)
+        self.replace_bounds(low, high, new_bounds)
+
+    def remove_range(self, start: int, end: int) -> None:
+        if start >= end:
+            return
+        low = bisect_left(self.bounds, start)
+        high = bisect_right(self.bounds, end)
+        new_bounds = []
+        # cut the ranges that stick out on either side
+        if low % 2 == 1:
+            new_bounds.append(start)
+        if high % 2 == 1:
+            new_bounds.append(end)
+        self.replace_bounds(low, high, new_bounds)
+
+    def toggle_range(self, start: int, end: int) -> None:
+        if start >= end:
+            return
+        low = bisect_left(self.bounds, start)
+        high = bisect_right(self.bounds, end)
+        # flipping a range is the same as flipping membership at both of
+        # its ends, so boundaries that meet cancel each other out
+        new_bounds = sorted(set(self.bounds[low:high]) ^ {start, end})
+        self.replace_bounds(low, high, new_bounds)
+
+    def combine(
+        self, other: "IntervalSet", keep: Callable[[bool, bool], bool]
+    ) -> "IntervalSet":
+        """Build the set of integers for which keep(in self, in other)
+        is true, by merging the boundaries of both sets in one pass"""
+        result = IntervalSet()
+        bounds, other_bounds = (self.bounds, other.bounds)
+        position, other_position = (0, 0)
+        num_bounds, num_other_bounds = (len(bounds), len(other_bounds))
+        inside = False
+        while position < num_bounds or other_position < num_other_bounds:
+            if other_position == num_other_bounds or (
+                position < num_bounds
+                and bounds[position] <= other_bounds[other_position]
+            ):
+                bound = bounds[position]
+            else:
+                bound = other_bounds[other_position]
+            # membership flips at every boundary, and a boundary can be
+            # in both lists at once
+            if position < num_bounds and bounds[position] == bound:
+                position += 1
+            if (
+                other_position < num_other_bounds
+                and other_bounds[other_position] == bound
+            ):
+                other_position += 1
+            now_inside = keep(position % 2 == 1, other_position % 2 == 1)
+            if now_inside != inside:
+                result.bounds.append(bound)
+                inside = now_inside
+        result.count = result.get_covered(result.bounds, 0)
+        return result
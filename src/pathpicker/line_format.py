@@ -4,11 +4,8 @@
 # LICENSE file in the root directory of this source tree.
 import curses
 import os
-import subprocess
-import time
 from abc import ABC, abstractmethod
-from pathlib import Path
-from typing import TYPE_CHECKING, Optional, Tuple
+from typing import TYPE_CHECKING, Dict, Optional, Tuple
 
 from pathpicker import parse
 from pathpicker.color_printer import ColorPrinter
@@ -22,14 +19,26 @@ if TYPE_CHECKING:
 class LineBase(ABC):
     def __init__(self) -> None:
         self.controller: Optional["Controller"] = None
+        self.index = 0
 
     def set_controller(self, controller: "Controller") -> None:
         self.controller = controller
 
+    def get_screen_index(self) -> int:
+        """The row we are drawn on, which is our index unless the
+        controller is hiding some lines"""
+        if self.controller is None:
+            return self.index
+        return self.controller.view.get_row(self.index)
+
     @abstractmethod
     def output(self, printer: ColorPrinter) -> None:
         pass
 
+    @abstractmethod
+    def get_line(self) -> str:
+        pass
+
 
 class SimpleLine(LineBase):
     def __init__(self, formatted_line: FormattedText, index: int):
@@ -39,15 +48,18 @@ class SimpleLine(LineBase):
 
     def output(self, printer: ColorPrinter) -> None:
         assert self.controller is not None
-        (min_x, min_y, max_x, max_y) = self.controller.get_chrome_boundaries()
-        max_len = min(max_x - min_x, len(str(self)))
-        y_pos = min_y + self.index + self.controller.get_scroll_offset()
+        (max_y, max_x) = self.controller.get_content_dimensions()
+        max_len = min(max_x, len(str(self)))
+        y_pos = self.get_screen_index() + self.controller.get_content_offset()
 
-        if y_pos < min_y or y_pos >= max_y:
+        if y_pos < 0 or y_pos >= max_y:
             # won't be displayed!
             return
 
-        self.formatted_line.print_text(y_pos, min_x, printer, max_len)
+        self.formatted_line.print_text(y_pos, 0, printer, max_len)
+
+    def get_line(self) -> str:
+        return str(self.formatted_line)
 
     def __str__(self) -> str:
         return str(self.formatted_line)
@@ -58,6 +70,9 @@ class LineMatch(LineBase):
     # this is inserted between long files, so it looks like
     # ./src/foo/bar/something|...|baz/foo.py
     TRUNCATE_DECORATOR = "|...|"
+    # we only ever render a handful of (hovered, selected, width)
+    # combinations per line, unless the screen keeps getting resized
+    MAX_CACHED_DECORATED_MATCHES = 16
 
     def __init__(
         self,
@@ -105,66 +120,44 @@ class LineMatch(LineBase):
         self.selected = False
         self.hovered = False
         self.is_truncated = False
+        # our index in the list of matches, once a controller has one
+        self.match_index = 0
 
         # precalculate the pre, post, and match strings
         (self.before_text, _) = self.formatted_line.breakat(self.start)
         (_, self.after_text) = self.formatted_line.breakat(self.end)
 
         self.decorated_match = FormattedText()
+        self.decorated_match_cache: Dict[
+            Tuple[bool, bool, Optional[int]], FormattedText
+        ] = {}
+        self.decorated_match_max_len: Optional[int] = None
         self.update_decorated_match()
 
+    def set_match_index(self, match_index: int) -> None:
+        self.match_index = match_index
+
     def toggle_select(self) -> None:
-        self.set_select(not self.selected)
+        self.set_select(not self.get_selected())
 
     def set_select(self, val: bool) -> None:
-        self.selected = val
+        # once we have a controller, its selection model is the source
+        # of truth for which matches are selected
+        if self.controller:
+            self.controller.selection.set_selected(self.match_index, val)
+        else:
+            self.selected = val
         self.update_decorated_match()
 
     def set_hover(self, val: bool) -> None:
         self.hovered = val
         self.update_decorated_match()
 
-    def get_screen_index(self) -> int:
-        return self.index
-
     def get_path(self) -> str:
         return self.path
 
-    def get_file_size(self) -> str:
-        size = os.path.getsize(self.path)
-        for unit in ["B", "K", "M", "G", "T", "P", "E", "Z"]:
-            if size < 1024:
-                return f"size: {size}{unit}"
-            size //= 1024
-        raise AssertionError("Unreachable")
-
-    def get_length_in_lines(self) -> str:
-        output = subprocess.check_output(["wc", "-l", self.path])
-        lines_count = output.strip().split()[0].decode("utf-8")
-        lines_caption = "lines" if int(lines_count) > 1 else "line"
-        return f"length: {lines_count} {lines_caption}"
-
-    def get_time_last_accessed(self) -> str:
-        time_accessed = time.strftime(
-            "%m/%d/%Y %H:%M:%S", time.localtime(os.stat(self.path).st_atime)
-        )
-        return f"last accessed: {time_accessed}"
-
-    def get_time_last_modified(self) -> str:
-        time_modified = time.strftime(
-            "%m/%d/%Y %H:%M:%S", time.localtime(os.stat(self.path).st_mtime)
-        )
-        return f"last modified: {time_modified}"
-
-    def get_owner_user(self) -> str:
-        user_owner_name = Path(self.path).owner()
-        user_owner_id = os.stat(self.path).st_uid
-        return f"owned by user: {user_owner_name}, {user_owner_id}"
-
-    def get_owner_group(self) -> str:
-        group_owner_name = Path(self.path).group()
-        group_owner_id = os.stat(self.path).st_gid
-        return f"owned by group: {group_owner_name}, {group_owner_id}"
+    def get_line(self) -> str:
+        return str(self.formatted_line)
 
     def get_dir(self) -> str:
         return os.path.dirname(self.path)
@@ -182,6 +175,8 @@ class LineMatch(LineBase):
         return self.num
 
     def get_selected(self) -> bool:
+        if self.controller:
+            return self.controller.selection.is_selected(self.match_index)
         return self.selected
 
     def get_before(self) -> str:
@@ -207,7 +202,27 @@ class LineMatch(LineBase):
     def update_decorated_match(self, max_len: Optional[int] = None) -> None:
         """Update the cached decorated match formatted string, and
         dirty the line, if needed"""
-        if self.hovered and self.selected:
+        self.decorated_match_max_len = max_len
+        self.decorated_match = self.get_decorated_match(max_len)
+
+        # we may not be connected to a controller (during process_input,
+        # for example)
+        if self.controller:
+            self.controller.dirty_line(self.index)
+
+    def get_decorated_match(self, max_len: Optional[int]) -> FormattedText:
+        key = (self.hovered, self.get_selected(), max_len)
+        decorated_match = self.decorated_match_cache.get(key)
+        if decorated_match is None:
+            decorated_match = self.build_decorated_match(max_len)
+            if len(self.decorated_match_cache) >= self.MAX_CACHED_DECORATED_MATCHES:
+                self.decorated_match_cache.clear()
+            self.decorated_match_cache[key] = decorated_match
+        return decorated_match
+
+    def build_decorated_match(self, max_len: Optional[int]) -> FormattedText:
+        selected = self.get_selected()
+        if self.hovered and selected:
             attributes = (
                 curses.COLOR_WHITE,
                 curses.COLOR_RED,
@@ -219,7 +234,7 @@ class LineMatch(LineBase):
                 curses.COLOR_BLUE,
                 FormattedText.BOLD_ATTRIBUTE,
             )
-        elif self.selected:
+        elif selected:
             attributes = (
                 curses.COLOR_WHITE,
                 curses.COLOR_GREEN,
@@ -232,11 +247,6 @@ class LineMatch(LineBase):
 
         decorator_text = self.get_decorator()
 
-        # we may not be connected to a controller (during process_input,
-        # for example)
-        if self.controller:
-            self.controller.dirty_line(self.index)
-
         plain_text = decorator_text + self.get_match()
         if max_len and len(plain_text + str(self.before_text)) > max_len:
             # alright, we need to chop the ends off of our
@@ -254,12 +264,12 @@ class LineMatch(LineBase):
             end_match = plain_text[-mid_point : len(plain_text)]
             plain_text = begin_match + self.TRUNCATE_DECORATOR + end_match
 
-        self.decorated_match = FormattedText(
+        return FormattedText(
             FormattedText.get_sequence_for_attributes(*attributes) + plain_text
         )
 
     def get_decorator(self) -> str:
-        if self.selected:
+        if self.get_selected():
             return self.ARROW_DECORATOR
         return ""
 
@@ -283,20 +293,26 @@ class LineMatch(LineBase):
 
     def output(self, printer: ColorPrinter) -> None:
         assert self.controller is not None
-        (min_x, min_y, max_x, max_y) = self.controller.get_chrome_boundaries()
-        y_pos = min_y + self.index + self.controller.get_scroll_offset()
+        (max_y, max_x) = self.controller.get_content_dimensions()
+        y_pos = self.get_screen_index() + self.controller.get_content_offset()
 
-        if y_pos < min_y or y_pos >= max_y:
+        if y_pos < 0 or y_pos >= max_y:
             # won't be displayed!
             return
 
+        # bulk selection changes do not update every line, so make sure
+        # we are decorated for our current state
+        self.decorated_match = self.get_decorated_match(self.decorated_match_max_len)
+
         # we dont care about the after text, but we should be able to see
         # all of the decorated match (which means we need to see up to
         # the end of the decoratedMatch, aka include beforeText)
         important_text_length = len(str(self.before_text)) + len(
             str(self.decorated_match)
         )
-        space_for_printing = max_x - min_x
+        # e.g. the number of hits of a file, when grouping by file
+        prefix = self.controller.get_match_prefix(self)
+        space_for_printing = max_x - len(prefix)
         if important_text_length > space_for_printing:
             # hrm, we need to update our decorated match to show
             # a truncated version since right now we will print off
@@ -314,9 +330,13 @@ class LineMatch(LineBase):
                 self.update_decorated_match()
                 self.is_truncated = False
 
-        max_len = max_x - min_x
-        so_far = (min_x, max_len)
+        so_far = (0, max_x)
 
+        if prefix:
+            prefix_text = FormattedText(
+                FormattedText.get_sequence_for_attributes(0, 0, 0) + prefix
+            )
+            so_far = self.print_up_to(prefix_text, printer, y_pos, *so_far)
         so_far = self.print_up_to(self.before_text, printer, y_pos, *so_far)
         so_far = self.print_up_to(self.decorated_match, printer, y_pos, *so_far)
         so_far = self.print_up_to(self.after_text, printer, y_pos, *so_far)
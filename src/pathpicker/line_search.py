@@ -0,0 +1,136 @@
+# Copyright (c) Facebook, Inc. and its affiliates.
+#
+# This source code is licensed under the MIT license found in the
+# LICENSE file in the root directory of this source tree.
+from typing import TYPE_CHECKING, List, Optional, Sequence
+
+from pathpicker import logger
+from pathpicker.fuzzy import FuzzyFinder
+from pathpicker.text_index import TrigramIndex
+from pathpicker.views import LineView, RankedLineView
+
+if TYPE_CHECKING:
+    from pathpicker.screen_control import Controller
+
+NO_MATCH = -1
+
+
+class LineSearch:
+
+    """The / filter, which narrows the view to the lines containing its
+    query, and the fuzzy finder, which ranks the paths of the matches
+    instead. Only one of them is on at a time, and the indexes they use
+    are built in the background"""
+
+    def __init__(self, controller: "Controller"):
+        self.controller = controller
+        self.filter_query = ""
+        self.filter_result: Optional[List[int]] = None
+        # the match index of every line (or NO_MATCH), built on first use
+        self.match_index_by_line: Optional[List[int]] = None
+        self.text_index = TrigramIndex(controller.num_lines, controller.get_line_text)
+        controller.scheduler.submit("text_index", None, self.text_index.index_chunk)
+        self.fuzzy_finder = FuzzyFinder(
+            controller.num_matches, controller.get_match_path
+        )
+        self.fuzzy_query = ""
+        self.fuzzy_results: List[int] = []
+        controller.scheduler.submit(
+            "fuzzy_paths", None, self.fuzzy_finder.prepare_chunk
+        )
+
+    def is_active(self) -> bool:
+        return bool(self.filter_query or self.fuzzy_query)
+
+    def get_match_indexes(self, line_indexes: List[int]) -> List[int]:
+        """The indexes of the matches on the given lines"""
+        if self.match_index_by_line is None:
+            self.match_index_by_line = [NO_MATCH] * self.controller.num_lines
+            for line in self.controller.line_matches:
+                self.match_index_by_line[line.index] = line.match_index
+        return list(
+            filter(
+                NO_MATCH.__ne__, map(self.match_index_by_line.__getitem__, line_indexes)
+            )
+        )
+
+    def refresh(self) -> None:
+        """Show what the unfiltered view shows now, with the / filter on
+        top of it"""
+        if self.fuzzy_query:
+            # the ranked view only shows matches anyway
+            return
+        self.filter_result = None
+        self.set_filter(self.filter_query)
+
+    def set_filter(self, query: str) -> None:
+        controller = self.controller
+        controller.scheduler.cancel("fuzzy_scores")
+        self.fuzzy_query = ""
+        if not query:
+            self.filter_result = None
+            controller.set_view(controller.get_unfiltered_view())
+        else:
+            # lines without the old query can not have the new one
+            within: Optional[Sequence[int]] = (
+                self.filter_result if self.filter_query in query else None
+            )
+            if within is None and controller.facet_index.active:
+                within = controller.get_input_order_view().line_indexes
+            elif within is None and controller.compact:
+                within = controller.get_compact_line_indexes()
+            self.filter_result = self.text_index.search(query, within)
+            match_indexes = self.get_match_indexes(self.filter_result)
+            controller.set_view(
+                controller.sort_view(LineView(self.filter_result, match_indexes))
+            )
+        self.filter_query = query
+        logger.add_event("set_filter", len(query))
+
+    def begin_filter(self) -> None:
+        """Narrow down the lines as the user types, until they either
+        keep the filter or clear it"""
+        logger.add_event("enter_filter_mode")
+        self.controller.prompt_query("/", self.filter_query, self.set_filter)
+
+    def set_fuzzy_query(self, query: str) -> None:
+        controller = self.controller
+        controller.scheduler.cancel("fuzzy_scores")
+        self.filter_query = ""
+        self.filter_result = None
+        self.fuzzy_query = query
+        if not query:
+            controller.set_view(controller.get_unfiltered_view())
+            return
+        self.fuzzy_finder.start(query)
+        self.fuzzy_results = []
+        if self.score_fuzzy_batch():
+            # keep ranking the rest in between keystrokes
+            controller.scheduler.submit("fuzzy_scores", None, self.score_fuzzy_batch)
+        logger.add_event("set_fuzzy_query", len(query))
+
+    def score_fuzzy_batch(self) -> bool:
+        """Score another batch of paths and show the best ones if they
+        changed, returning whether there are paths left to score"""
+        controller = self.controller
+        more = self.fuzzy_finder.score_batch()
+        results = self.fuzzy_finder.get_results()
+        if results != self.fuzzy_results:
+            # follow the best match, unless the user moved away from it
+            follow = (
+                not self.fuzzy_results
+                or controller.hover_index == self.fuzzy_results[0]
+            )
+            self.fuzzy_results = results
+            lines = controller.line_matches
+            line_indexes = [lines[index].index for index in results]
+            controller.set_view(RankedLineView(line_indexes, results))
+            if follow and results:
+                controller.jump_to_index(results[0])
+        return more
+
+    def begin_fuzzy_find(self) -> None:
+        """Show the paths that best match what the user types (in
+        order), until they either keep the results or clear them"""
+        logger.add_event("enter_fuzzy_mode")
+        self.controller.prompt_query("fuzzy: ", self.fuzzy_query, self.set_fuzzy_query)
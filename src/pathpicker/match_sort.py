@@ -0,0 +1,78 @@
+# Copyright (c) Facebook, Inc. and its affiliates.
+#
+# This source code is licensed under the MIT license found in the
+# LICENSE file in the root directory of this source tree.
+from typing import TYPE_CHECKING, Dict, List, Sequence
+
+from pathpicker.stat_cache import StatCache
+
+if TYPE_CHECKING:
+    from pathpicker.line_format import LineMatch
+
+INPUT_ORDER = "input"
+PATH_ORDER = "path"
+MTIME_ORDER = "mtime"
+SIZE_ORDER = "size"
+# the orders [o] cycles through
+SORT_ORDERS = [INPUT_ORDER, PATH_ORDER, MTIME_ORDER, SIZE_ORDER]
+SORT_DESCRIPTIONS = {
+    INPUT_ORDER: "the order of the input",
+    PATH_ORDER: "path and line",
+    MTIME_ORDER: "last modified, newest first",
+    SIZE_ORDER: "size, largest first",
+}
+# the stat we sort by, largest first
+STAT_ATTRIBUTES = {MTIME_ORDER: "st_mtime", SIZE_ORDER: "st_size"}
+# files that do not exist go last
+MISSING_KEY = float("inf")
+
+
+class MatchSorter:
+
+    """Puts the matches in the order of a key. Every order is sorted
+    once and kept as the rank of each match, so the matches of any view
+    (the ones of a facet, or of the / filter) are sorted by looking up
+    their ranks. Matches with the same key stay together by path"""
+
+    def __init__(self, line_matches: Sequence["LineMatch"], stat_cache: StatCache):
+        self.line_matches = line_matches
+        self.stat_cache = stat_cache
+        self.orders: Dict[str, List[int]] = {}
+        self.ranks: Dict[str, List[int]] = {}
+
+    def get_order(self, order: str) -> List[int]:
+        """Every match in the order"""
+        if order not in self.orders:
+            self.orders[order] = self.sort_all(order)
+        return self.orders[order]
+
+    def sort_all(self, order: str) -> List[int]:
+        matches = self.line_matches
+        if order == INPUT_ORDER:
+            return list(range(len(matches)))
+        if order == PATH_ORDER:
+            lines = [(match.get_path(), match.get_line_num()) for match in matches]
+            return sorted(range(len(matches)), key=lines.__getitem__)
+        stats = self.stat_cache.get_all([match.get_path() for match in matches])
+        attribute = STAT_ATTRIBUTES[order]
+        keys = [
+            MISSING_KEY if stat is None else -getattr(stat, attribute) for stat in stats
+        ]
+        # sorting is stable, so matches with the same key stay by path
+        ordered = self.get_order(PATH_ORDER)[:]
+        ordered.sort(key=keys.__getitem__)
+        return ordered
+
+    def get_ranks(self, order: str) -> List[int]:
+        if order not in self.ranks:
+            ranks = [0] * len(self.line_matches)
+            for rank, match_index in enumerate(self.get_order(order)):
+                ranks[match_index] = rank
+            self.ranks[order] = ranks
+        return self.ranks[order]
+
+    def sort(self, match_indexes: Sequence[int], order: str) -> List[int]:
+        """The (distinct) matches in the order"""
+        if len(match_indexes) == len(self.line_matches):
+            return self.get_order(order)
+        return sorted(match_indexes, key=self.get_ranks(order).__getitem__)
@@ -4,10 +4,16 @@
 # LICENSE file in the root directory of this source tree.
 import os
 import pickle
-from typing import List, Tuple
-
-from pathpicker import logger, state_files
+import shlex
+import shutil
+import sys
+import tempfile
+from typing import Iterable, List, Optional, Tuple
+
+from pathpicker import logger, prefetch, state_files
+from pathpicker.interval_set import IntervalSet
 from pathpicker.line_format import LineMatch
+from pathpicker.prefetch import PagePrefetcher
 
 RED_COLOR = "\033[0;31m"
 NO_COLOR = "\033[0m"
@@ -25,33 +31,80 @@ versions which cannot be resolved.
 
 CONTINUE_WARNING = "Are you sure you want to continue? Ctrl-C to quit"
 
+# what we assume a command line may take when the system does not say
+DEFAULT_ARG_MAX = 128 << 10
+# what we leave of the argument limit for the variables the shell
+# running the script may add to the environment
+ARG_MAX_HEADROOM = 16 << 10
+# every argument and variable also costs a pointer in the argument list
+ARG_POINTER_BYTES = 8
+# past this many files vim opens a quickfix list of them instead of a
+# split (or tab) for every one, unless $FPP_MAX_SPLITS says otherwise
+DEFAULT_MAX_SPLITS = 10
+QUICKFIX_EDITORS = ["vim", "mvim", "gvim", "nvim", "emacs"]
+# the script that runs a command over the files in parallel
+PARALLEL_RUNNER = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "run_parallel.py"
+)
+
+# what the shell could do something with (even where it is quoted, to
+# keep it simple), so a command with any of them is left to the shell
+SHELL_SPECIAL_CHARS = "$`\\*?[{~#();<>|&!\n"
+
+# The script the fpp wrapper runs once we exit. It is built up here and
+# written out in one go by flush, which choose.py calls on the way out
+script_lines: List[str] = []
+# The command (as its arguments) the wrapper runs instead of the script
+# when the shell has nothing to do for it and $FPP_DIRECT_EXEC is set,
+# see set_direct_action
+direct_action: List[str] = []
+# reads the selected files into the page cache while we write the
+# script, when $FPP_PREFETCH is set
+page_prefetcher = PagePrefetcher()
+
 
 # The two main entry points into this module:
 #
 
 
-def exec_composed_command(command: str, line_objs: List[LineMatch]) -> None:
+def exec_composed_command(
+    command: str, line_objs: List[LineMatch], parallel_jobs: int = 0
+) -> None:
     if not command:
         edit_files(line_objs)
         return
 
     logger.add_event("command_on_num_files", len(line_objs))
-    command = compose_command(command, line_objs)
+    if not is_cd_command(command):
+        prefetch_pages(line_objs)
+    if parallel_jobs > 0 and not is_cd_command(command):
+        logger.add_event("parallel_jobs", parallel_jobs)
+        friendly_command = f"{command} (on every file, {parallel_jobs} at a time)"
+        command = compose_parallel_command(command, line_objs, parallel_jobs)
+    else:
+        command = compose_command(command, line_objs)
+        friendly_command = command
     append_alias_expansion()
     append_if_invalid(line_objs)
-    append_friendly_command(command)
+    append_friendly_command(friendly_command, command)
     append_exit()
+    set_direct_action(command, line_objs)
 
 
 def edit_files(line_objs: List[LineMatch]) -> None:
     logger.add_event("editing_num_files", len(line_objs))
+    prefetch_pages(line_objs)
     files_and_line_numbers = [
         (line_obj.get_path(), line_obj.get_line_num()) for line_obj in line_objs
     ]
-    command = join_files_into_command(files_and_line_numbers)
+    if len(line_objs) > get_max_splits() and not os.environ.get("FPP_DISABLE_SPLIT"):
+        command = compose_quickfix_command(line_objs)
+    else:
+        command = join_files_into_command(files_and_line_numbers)
     append_if_invalid(line_objs)
     append_to_file(command)
     append_exit()
+    set_direct_action(command, line_objs)
 
 
 # Private helpers
@@ -67,11 +120,54 @@ def append_if_invalid(line_objs: List[LineMatch]) -> None:
     append_to_file(f'read -p "{CONTINUE_WARNING}" -r')
 
 
+def prefetch_pages(line_objs: List[LineMatch]) -> None:
+    if not os.environ.get("FPP_PREFETCH") or not prefetch.is_supported():
+        return
+    page_prefetcher.start(
+        [os.path.expanduser(line_obj.get_path()) for line_obj in line_objs]
+    )
+
+
+def set_direct_action(command: str, line_objs: List[LineMatch]) -> None:
+    """Have the wrapper exec the command itself, skipping the interactive
+    shell (and the rc files it loads) when there is no warning to show
+    and the command is a program on the PATH with plain arguments. This
+    also skips the user's aliases and functions, so it is opt in"""
+    if not os.environ.get("FPP_DIRECT_EXEC"):
+        return
+    if not all(line.is_resolvable() for line in line_objs):
+        return
+    arguments = get_direct_arguments(command)
+    if arguments is not None:
+        logger.add_event("direct_action")
+        direct_action[:] = arguments
+
+
+def get_direct_arguments(command: str) -> Optional[List[str]]:
+    """The arguments of the command if it runs the same without a shell,
+    or None if it needs one (for a variable, glob, redirection, pipe or
+    several commands) or is not a program on the PATH (like an alias)"""
+    if any(char in command for char in SHELL_SPECIAL_CHARS):
+        return None
+    try:
+        arguments = shlex.split(command)
+    except ValueError:
+        # an unbalanced quote
+        return None
+    if not arguments or "=" in arguments[0]:
+        return None
+    if shutil.which(arguments[0]) is None:
+        return None
+    return arguments
+
+
 def output_selection(line_objs: List[LineMatch]) -> None:
     file_path = state_files.get_selection_file_path()
-    indices = [line.index for line in line_objs]
+    # selections tend to be long runs of lines, so we save the
+    # (start, end) ranges of the line indices instead of every index
+    ranges = IntervalSet.from_indexes(line.index for line in line_objs).get_ranges()
     file = open(file_path, "wb")
-    pickle.dump(indices, file)
+    pickle.dump(ranges, file)
     file.close()
 
 
@@ -88,6 +184,61 @@ def get_editor_and_path() -> Tuple[str, str]:
     return "vim", "vim"
 
 
+def get_max_splits() -> int:
+    try:
+        return int(os.environ.get("FPP_MAX_SPLITS", DEFAULT_MAX_SPLITS))
+    except ValueError:
+        return DEFAULT_MAX_SPLITS
+
+
+def compose_quickfix_command(line_objs: List[LineMatch]) -> str:
+    """Open the files as a quickfix list (path:line:text, the way grep
+    prints them) in editors that have one, rather than a split each"""
+    (editor, editor_path) = get_editor_and_path()
+    if editor.split()[0] not in QUICKFIX_EDITORS:
+        return join_files_into_command(
+            [(line_obj.get_path(), line_obj.get_line_num()) for line_obj in line_objs]
+        )
+    logger.add_event("quickfix_num_files", len(line_objs))
+    paths = [
+        os.path.abspath(os.path.expanduser(line_obj.get_path()))
+        for line_obj in line_objs
+    ]
+    quickfix_path = state_files.get_quickfix_file_path()
+    args_path = state_files.get_args_file_path()
+    quickfix = "".join(
+        f"{path}:{max(line_obj.get_line_num(), 1)}:{get_quickfix_text(line_obj)}\n"
+        for (path, line_obj) in zip(paths, line_objs)
+    )
+    write_atomically(quickfix_path, quickfix.encode())
+    if editor.split()[0] == "emacs":
+        quickfix_file = escape_double_quoted(quickfix_path)
+        elisp = f'(progn (find-file "{quickfix_file}") (grep-mode))'
+        return f"{editor_path} --eval {shlex.quote(elisp)}"
+    # the files also make up the argument list, for :next and friends
+    write_atomically(args_path, "".join(f"{path}\n" for path in paths).encode())
+    args_file = escape_double_quoted(args_path)
+    add_args = (
+        'silent! exe "argadd" '
+        f'join(map(readfile("{args_file}"), "fnameescape(v:val)"))'
+    )
+    return (
+        f"{editor_path} -q {shlex.quote(quickfix_path)}"
+        f" +{shlex.quote(add_args)} +copen +{shlex.quote('wincmd p')}"
+    )
+
+
+def get_quickfix_text(line_obj: LineMatch) -> str:
+    """What the line says after the path (and line number) we matched,
+    since the quickfix entry already starts with them"""
+    return str(line_obj.after_text).lstrip(":").strip()
+
+
+def escape_double_quoted(text: str) -> str:
+    """Escape text for a double quoted elisp or vim script string"""
+    return text.replace("\\", "\\\\").replace('"', '\\"')
+
+
 def join_files_into_command(files_and_line_numbers: List[Tuple[str, int]]) -> str:
     editor, editor_path = get_editor_and_path()
     cmd = editor_path + " "
@@ -143,8 +294,10 @@ def compose_command(command: str, line_objs: List[LineMatch]) -> str:
 
 def compose_file_command(command: str, line_objs: List[LineMatch]) -> str:
     command = command.encode().decode("utf-8")
-    paths = [f"'{line_obj.get_path()}'" for line_obj in line_objs]
-    path_str = " ".join(paths)
+    paths = [line_obj.get_path() for line_obj in line_objs]
+    if get_arguments_size(paths) > get_argument_budget():
+        return compose_batched_command(command, paths)
+    path_str = " ".join(f"'{path}'" for path in paths)
     if "$F" in command:
         command = command.replace("$F", path_str)
     else:
@@ -152,12 +305,84 @@ def compose_file_command(command: str, line_objs: List[LineMatch]) -> str:
     return command
 
 
+def compose_batched_command(command: str, paths: List[str]) -> str:
+    """Run the command over the paths in as few batches as fit in a
+    command line, through xargs reading the paths from a list file"""
+    logger.add_event("batching_num_files", len(paths))
+    file_list_path = write_file_list(paths)
+    command = shlex.quote(get_arguments_command(command))
+    return (
+        f"xargs -0 -s {get_argument_budget()} sh -c {command} sh"
+        f" < '{file_list_path}'"
+    )
+
+
+def compose_parallel_command(
+    command: str, line_objs: List[LineMatch], parallel_jobs: int
+) -> str:
+    """Run the command once for every file, parallel_jobs at a time"""
+    command = command.encode().decode("utf-8")
+    file_list_path = write_file_list([line_obj.get_path() for line_obj in line_objs])
+    arguments = [
+        sys.executable,
+        PARALLEL_RUNNER,
+        str(parallel_jobs),
+        file_list_path,
+        get_arguments_command(command),
+    ]
+    return " ".join(map(shlex.quote, arguments))
+
+
+def get_arguments_command(command: str) -> str:
+    """The command for sh -c, with $F standing for its arguments"""
+    if "$F" in command:
+        return command.replace("$F", '"$@"')
+    return f'{command} "$@"'
+
+
+def write_file_list(paths: List[str]) -> str:
+    """Write the paths NUL-delimited to the list file, returning its
+    path"""
+    file_list_path = state_files.get_file_list_path()
+    write_atomically(
+        file_list_path, b"".join(os.fsencode(path) + b"\0" for path in paths)
+    )
+    return file_list_path
+
+
+def get_arg_max() -> int:
+    try:
+        arg_max = os.sysconf("SC_ARG_MAX")
+    except (OSError, ValueError):
+        return DEFAULT_ARG_MAX
+    return arg_max if arg_max > 0 else DEFAULT_ARG_MAX
+
+
+def get_arguments_size(arguments: Iterable[str]) -> int:
+    """The bytes the arguments take when passed to a command"""
+    return sum(
+        len(os.fsencode(argument)) + 1 + ARG_POINTER_BYTES for argument in arguments
+    )
+
+
+def get_argument_budget() -> int:
+    """The bytes the arguments of a command may take, with what the
+    environment takes out of the limit"""
+    environment = (f"{name}={value}" for (name, value) in os.environ.items())
+    return get_arg_max() - get_arguments_size(environment) - ARG_MAX_HEADROOM
+
+
 def output_nothing() -> None:
     append_to_file('echo "nothing to do!"; exit 1')
 
 
 def clear_file() -> None:
-    write_to_file("")
+    # written right away, so the last script is never run again if we
+    # do not make it to the flush
+    del script_lines[:]
+    del direct_action[:]
+    write_atomically(state_files.get_script_output_file_path(), b"")
+    write_atomically(state_files.get_action_file_path(), b"")
 
 
 def append_alias_expansion() -> None:
@@ -178,10 +403,10 @@ fi
         )
 
 
-def append_friendly_command(command: str) -> None:
+def append_friendly_command(command: str, script: str) -> None:
     header = 'echo "executing command:"\necho "' + command.replace('"', '\\"') + '"'
     append_to_file(header)
-    append_to_file(command)
+    append_to_file(script)
 
 
 def append_error(text: str) -> None:
@@ -189,10 +414,7 @@ def append_error(text: str) -> None:
 
 
 def append_to_file(command: str) -> None:
-    file = open(state_files.get_script_output_file_path(), "a")
-    file.write(command + "\n")
-    file.close()
-    logger.output()
+    script_lines.append(command)
 
 
 def append_exit() -> None:
@@ -210,7 +432,31 @@ def append_exit() -> None:
 
 
 def write_to_file(command: str) -> None:
-    file = open(state_files.get_script_output_file_path(), "w")
-    file.write(command + "\n")
-    file.close()
+    script_lines[:] = [command]
+    del direct_action[:]
+
+
+def flush() -> None:
+    """Write out the script and the action, and the log along with
+    them"""
+    script = "".join(f"{line}\n" for line in script_lines)
+    write_atomically(state_files.get_script_output_file_path(), script.encode())
+    action = b"".join(os.fsencode(argument) + b"\0" for argument in direct_action)
+    write_atomically(state_files.get_action_file_path(), action)
+    if page_prefetcher.thread is not None:
+        prefetched = page_prefetcher.wait(prefetch.PREFETCH_WAIT)
+        logger.add_event("prefetched_bytes", prefetched)
     logger.output()
+
+
+def write_atomically(path: str, content: bytes) -> None:
+    """Write a temporary file next to the path and rename it over the
+    path, so the wrapper never runs half a script"""
+    (handle, temp_path) = tempfile.mkstemp(dir=os.path.dirname(path))
+    try:
+        with os.fdopen(handle, "wb") as file:
+            file.write(content)
+        os.replace(temp_path, path)
+    except BaseException:
+        os.remove(temp_path)
+        raise
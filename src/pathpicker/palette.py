@@ -0,0 +1,108 @@
+# Copyright (c) Facebook, Inc. and its affiliates.
+#
+# This source code is licensed under the MIT license found in the
+# LICENSE file in the root directory of this source tree.
+from functools import lru_cache
+from typing import List, Tuple
+
+# Helpers for mapping 256-color and 24-bit input colors onto whatever
+# palette the terminal actually supports. Colors are expressed as
+# xterm 256-color indices throughout.
+
+RGB = Tuple[int, int, int]
+
+NUM_XTERM_COLORS = 256
+NUM_SYSTEM_COLORS = 16
+NUM_BASIC_COLORS = 8
+CUBE_START = 16
+GRAYSCALE_START = 232
+
+# the default xterm values for the 16 system colors; terminals theme
+# these, so we never quantize truecolor input onto them
+SYSTEM_COLORS: List[RGB] = [
+    (0, 0, 0),
+    (205, 0, 0),
+    (0, 205, 0),
+    (205, 205, 0),
+    (0, 0, 238),
+    (205, 0, 205),
+    (0, 205, 205),
+    (229, 229, 229),
+    (127, 127, 127),
+    (255, 0, 0),
+    (0, 255, 0),
+    (255, 255, 0),
+    (92, 92, 255),
+    (255, 0, 255),
+    (0, 255, 255),
+    (255, 255, 255),
+]
+CUBE_LEVELS = [0, 95, 135, 175, 215, 255]
+
+
+def get_xterm_rgb(index: int) -> RGB:
+    if index < CUBE_START:
+        return SYSTEM_COLORS[index]
+    if index < GRAYSCALE_START:
+        index -= CUBE_START
+        return (
+            CUBE_LEVELS[index // 36],
+            CUBE_LEVELS[(index // 6) % 6],
+            CUBE_LEVELS[index % 6],
+        )
+    level = 8 + (index - GRAYSCALE_START) * 10
+    return level, level, level
+
+
+def get_distance(first: RGB, second: RGB) -> int:
+    return sum((a - b) * (a - b) for a, b in zip(first, second))
+
+
+def get_nearest_cube_level(value: int) -> int:
+    return min(
+        range(len(CUBE_LEVELS)), key=lambda level: abs(CUBE_LEVELS[level] - value)
+    )
+
+
+@lru_cache(maxsize=4096)
+def get_xterm_index_for_rgb(red: int, green: int, blue: int) -> int:
+    """Quantize a 24-bit color to the closest color of the 6x6x6 cube
+    or the grayscale ramp"""
+    rgb = (red, green, blue)
+    cube_index = (
+        CUBE_START
+        + 36 * get_nearest_cube_level(red)
+        + 6 * get_nearest_cube_level(green)
+        + get_nearest_cube_level(blue)
+    )
+    gray_step = min(max((sum(rgb) // 3 - 8 + 5) // 10, 0), 23)
+    gray_index = GRAYSCALE_START + gray_step
+    if get_distance(rgb, get_xterm_rgb(gray_index)) < get_distance(
+        rgb, get_xterm_rgb(cube_index)
+    ):
+        return gray_index
+    return cube_index
+
+
+def get_nearest_color(rgb: RGB, available: List[int]) -> int:
+    return min(available, key=lambda color: get_distance(rgb, get_xterm_rgb(color)))
+
+
+def get_palette_map(num_colors: int) -> List[int]:
+    """Build a lookup table from every xterm color index to the closest
+    color the terminal can display"""
+    if num_colors >= NUM_XTERM_COLORS:
+        return list(range(NUM_XTERM_COLORS))
+    available = list(range(min(max(num_colors, NUM_BASIC_COLORS), NUM_SYSTEM_COLORS)))
+    # bright system colors fall back to their normal counterparts
+    bright_colors = [
+        index % len(available) for index in range(len(available), NUM_SYSTEM_COLORS)
+    ]
+    return (
+        available
+        + bright_colors
+        + [
+            get_nearest_color(get_xterm_rgb(index), available)
+            for index in range(NUM_SYSTEM_COLORS, NUM_XTERM_COLORS)
+        ]
+    )
@@ -0,0 +1,69 @@
+# Copyright (c) Facebook, Inc. and its affiliates.
+#
+# This source code is licensed under the MIT license found in the
+# LICENSE file in the root directory of this source tree.
+import os
+import subprocess
+import sys
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import BinaryIO, List, Tuple
+
+RED_COLOR = "\033[0;31m"
+NO_COLOR = "\033[0m"
+
+
+def read_file_list(path: str) -> List[str]:
+    """The paths of a NUL-delimited list file"""
+    with open(path, "rb") as file:
+        return [os.fsdecode(path) for path in file.read().split(b"\0") if path]
+
+
+def run_command(command: str, path: str) -> Tuple[int, bytes]:
+    """Run the command with the path as its "$@", returning its exit
+    status and everything it printed"""
+    result = subprocess.run(
+        ["sh", "-c", command, "sh", path],
+        stdin=subprocess.DEVNULL,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.STDOUT,
+        check=False,
+    )
+    return (result.returncode, result.stdout)
+
+
+def run_in_parallel(
+    command: str, paths: List[str], jobs: int, out: BinaryIO
+) -> List[str]:
+    """Run the command once per path, jobs at a time. What each one
+    printed is written out in one piece once it is done, under a line
+    with our progress, so the outputs never interleave. Returns the paths
+    the command failed on, in the order they were given"""
+    failed = set()
+    with ThreadPoolExecutor(max_workers=jobs) as executor:
+        futures = {executor.submit(run_command, command, path): path for path in paths}
+        for (done, future) in enumerate(as_completed(futures), 1):
+            path = futures[future]
+            (status, printed) = future.result()
+            progress = f"[{done}/{len(paths)}] {path}"
+            if status != 0:
+                failed.add(path)
+                progress += f" {RED_COLOR}failed with {status}{NO_COLOR}"
+            out.write(f"{progress}\n".encode())
+            out.write(printed)
+            out.flush()
+    return [path for path in paths if path in failed]
+
+
+def main(argv: List[str]) -> int:
+    (jobs, file_list_path, command) = argv[1:]
+    paths = read_file_list(file_list_path)
+    out = sys.stdout.buffer
+    failed = run_in_parallel(command, paths, int(jobs), out)
+    if not failed:
+        out.write(f"ran on {len(paths)} files\n".encode())
+        return 0
+    summary = f"failed on {len(failed)} of {len(paths)} files:"
+    out.write(f"{RED_COLOR}{summary}{NO_COLOR}\n".encode())
+    for path in failed:
+        out.write(f"  {path}\n".encode())
+    return 1
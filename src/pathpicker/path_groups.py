@@ -0,0 +1,64 @@
+# Copyright (c) Facebook, Inc. and its affiliates.
+#
+# This source code is licensed under the MIT license found in the
+# LICENSE file in the root directory of this source tree.
+from typing import Dict, List, Set
+
+# the matches of an expanded file are shown under its first match
+EXPANDED_INDENT = "    "
+
+
+class PathGroups:
+
+    """The matches of every path, in the order the paths first appear,
+    built as the matches come in. Grouping by file shows one row per
+    path (its first match) plus the matches of the files the user
+    expanded, so it costs as much as the number of unique paths"""
+
+    def __init__(self) -> None:
+        self.matches_by_path: Dict[str, List[int]] = {}
+        self.expanded_paths: Set[str] = set()
+
+    def add(self, path: str, match_index: int) -> None:
+        matches = self.matches_by_path.get(path)
+        if matches is None:
+            self.matches_by_path[path] = [match_index]
+        else:
+            matches.append(match_index)
+
+    def get_first_indexes(self) -> List[int]:
+        return [matches[0] for matches in self.matches_by_path.values()]
+
+    def get_matches(self, path: str) -> List[int]:
+        return self.matches_by_path[path]
+
+    def toggle_expanded(self, path: str) -> None:
+        if path in self.expanded_paths:
+            self.expanded_paths.remove(path)
+        else:
+            self.expanded_paths.add(path)
+
+    def get_shown_indexes(self) -> List[int]:
+        """The matches we show, every file followed by the rest of its
+        matches if it is expanded"""
+        if not self.expanded_paths:
+            return self.get_first_indexes()
+        shown: List[int] = []
+        for path, matches in self.matches_by_path.items():
+            if path in self.expanded_paths:
+                shown.extend(matches)
+            else:
+                shown.append(matches[0])
+        return shown
+
+    def get_prefix(self, path: str, match_index: int, line_num: int) -> str:
+        """What we show in front of a match: the number of hits and the
+        first line number for the first match of a file, and an indent
+        for the other (expanded) ones"""
+        matches = self.matches_by_path[path]
+        if match_index != matches[0]:
+            return EXPANDED_INDENT
+        hits = f"{len(matches)} hit" + ("s" if len(matches) > 1 else "")
+        if line_num:
+            return f"[{hits}, line {line_num}] "
+        return f"[{hits}] "
@@ -0,0 +1,161 @@
+# Copyright (c) Facebook, Inc. and its affiliates.
+#
+# This source code is licensed under the MIT license found in the
+# LICENSE file in the root directory of this source tree.
+from array import array
+from typing import Callable, Dict, List, Optional
+
+SEPARATOR = "/"
+# how many paths we group by directory per call, small enough to fit
+# in the time slice of the idle scheduler
+GROUP_CHUNK_PATHS = 5000
+
+
+class TreeNode:
+
+    """A directory (its name ends with a separator) or a file in the
+    tree of matched paths"""
+
+    def __init__(self, name: str, parent: Optional["TreeNode"]):
+        self.name = name
+        self.parent = parent
+        self.depth = 0
+        # the matches of a file, or of the files right in a directory
+        self.match_indexes: "array[int]" = array("i")
+        # the number of matches under the node
+        self.count = 0
+        self.children: Dict[str, "TreeNode"] = {}
+        self.sorted_children: Optional[List["TreeNode"]] = None
+        self.files_grouped = False
+        self.expanded = False
+
+    def is_dir(self) -> bool:
+        return self.parent is None or self.name.endswith(SEPARATOR)
+
+    def add_match(self, index: int) -> None:
+        self.match_indexes.append(index)
+        self.count += 1
+
+
+class PathTree:
+
+    """The paths of the matches as a trie of their directories.
+
+    The paths are grouped by their directory a chunk at a time in the
+    background, and the trie is then built out of the directories only,
+    which are far fewer than the paths. The files in a directory are
+    only grouped once it is opened, so opening the tree or a directory
+    costs as much as what is shown"""
+
+    def __init__(self, num_paths: int, get_path: Callable[[int], str]):
+        self.num_paths = num_paths
+        self.get_path = get_path
+        self.num_grouped = 0
+        self.dirs: Dict[str, "array[int]"] = {}
+        self.root = TreeNode("", None)
+        self.built = False
+
+    def prepare_chunk(self) -> bool:
+        """Group the next chunk of paths by directory, returning whether
+        there are paths left to group"""
+        start = self.num_grouped
+        end = min(start + GROUP_CHUNK_PATHS, self.num_paths)
+        dirs = self.dirs
+        for index in range(start, end):
+            path = self.get_path(index)
+            directory = path[: path.rfind(SEPARATOR) + 1]
+            indexes = dirs.get(directory)
+            if indexes is None:
+                indexes = dirs[directory] = array("i")
+            indexes.append(index)
+        self.num_grouped = end
+        return end < self.num_paths
+
+    def prepare(self) -> TreeNode:
+        """Group whatever paths are left and build the trie, returning
+        its root"""
+        while self.prepare_chunk():
+            pass
+        if not self.built:
+            for directory, indexes in self.dirs.items():
+                node = self.root
+                for name in directory.split(SEPARATOR)[:-1]:
+                    name += SEPARATOR
+                    child = node.children.get(name)
+                    if child is None:
+                        child = node.children[name] = TreeNode(name, node)
+                    node = child
+                node.match_indexes = indexes
+            self.finish_node(self.root)
+            self.built = True
+        return self.root
+
+    def finish_node(self, node: TreeNode) -> None:
+        """Set the depth and count of the nodes under the node, showing
+        a directory that only has another directory in it (and so on)
+        as one node, like a/b/c/"""
+        while (
+            node.parent is not None
+            and len(node.children) == 1
+            and not node.match_indexes
+        ):
+            (child,) = node.children.values()
+            node.name += child.name
+            node.match_indexes = child.match_indexes
+            node.children = child.children
+            for grandchild in node.children.values():
+                grandchild.parent = node
+        node.count = len(node.match_indexes)
+        for child in node.children.values():
+            child.depth = node.depth + 1
+            self.finish_node(child)
+            node.count += child.count
+
+    def group_files(self, node: TreeNode) -> None:
+        for index in node.match_indexes:
+            path = self.get_path(index)
+            name = path[path.rfind(SEPARATOR) + 1 :]
+            child = node.children.get(name)
+            if child is None:
+                child = node.children[name] = TreeNode(name, node)
+                child.depth = node.depth + 1
+            child.add_match(index)
+        node.files_grouped = True
+
+    def get_children(self, node: TreeNode) -> List[TreeNode]:
+        """The children of a directory, directories first and then by
+        name"""
+        children = node.sorted_children
+        if children is None:
+            if not node.files_grouped:
+                self.group_files(node)
+            children = node.sorted_children = sorted(
+                node.children.values(),
+                key=lambda child: (not child.is_dir(), child.name),
+            )
+        return children
+
+    def get_match_indexes(self, node: TreeNode) -> List[int]:
+        """Every match under the node"""
+        indexes: List[int] = []
+        nodes = [node]
+        while nodes:
+            node = nodes.pop()
+            indexes.extend(node.match_indexes)
+            if node.is_dir():
+                nodes.extend(
+                    child for child in node.children.values() if child.is_dir()
+                )
+        return indexes
+
+    def get_visible_nodes(self) -> List[TreeNode]:
+        """The nodes under the expanded directories, in the order we
+        show them (the root itself is not shown)"""
+        nodes: List[TreeNode] = []
+        stack = self.get_children(self.prepare())[::-1]
+        while stack:
+            node = stack.pop()
+            nodes.append(node)
+            if node.expanded:
+                stack.extend(self.get_children(node)[::-1])
+        return nodes
@@ -0,0 +1,50 @@
+# Copyright (c) Facebook, Inc. and its affiliates.
+#
+# This source code is licensed under the MIT license found in the
+# LICENSE file in the root directory of this source tree.
+import fnmatch
+import re
+from itertools import compress, count
+from typing import Callable, List, Match, NamedTuple, Optional
+
+Matcher = Callable[[str], Optional[Match[str]]]
+
+# Patterns typed into the select by pattern prompt are globs that have
+# to match the end of the path, unless they start with one of these
+UNSELECT_PREFIX = "!"
+WHOLE_LINE_PREFIX = "line:"
+REGEX_PREFIX = "re:"
+# the paths of matches are absolute or start with ./ (see
+# parse.prepend_dir), so a glob like src/*.py matches them from any
+# directory down, much like a .gitignore pattern
+PATH_SUFFIX = "(?:.*/)?"
+
+
+class SelectionPattern(NamedTuple):
+    matches: Matcher
+    select: bool
+    whole_line: bool
+
+
+def parse_selection_pattern(text: str) -> SelectionPattern:
+    """Parse something like "!line:re:TODO|FIXME", raising re.error
+    for invalid regexes"""
+    select = not text.startswith(UNSELECT_PREFIX)
+    if not select:
+        text = text[len(UNSELECT_PREFIX) :]
+    whole_line = text.startswith(WHOLE_LINE_PREFIX)
+    if whole_line:
+        text = text[len(WHOLE_LINE_PREFIX) :]
+    if text.startswith(REGEX_PREFIX):
+        matches = re.compile(text[len(REGEX_PREFIX) :]).search
+    elif whole_line:
+        matches = re.compile(fnmatch.translate(text)).match
+    else:
+        matches = re.compile(PATH_SUFFIX + fnmatch.translate(text)).match
+    return SelectionPattern(matches, select, whole_line)
+
+
+def get_matching_indexes(matches: Matcher, haystack: List[str]) -> List[int]:
+    # map and compress keep the loop over every string in C, which
+    # matters once there are hundreds of thousands of them
+    return list(compress(count(), map(matches, haystack)))
@@ -0,0 +1,66 @@
+# Copyright (c) Facebook, Inc. and its affiliates.
+#
+# This source code is licensed under the MIT license found in the
+# LICENSE file in the root directory of this source tree.
+import os
+import stat
+import threading
+from typing import List, Optional
+
+# how much of a file we ask for, so a huge log does not push everything
+# else out of the page cache
+MAX_PREFETCH_FILE_BYTES = 64 << 20
+# how long we wait on the way out for the worker to get through the
+# files (the reads it started go on without us)
+PREFETCH_WAIT = 0.5
+
+
+def is_supported() -> bool:
+    # posix_fadvise is missing on macOS, where we do without
+    return hasattr(os, "posix_fadvise")
+
+
+def prefetch_file(path: str) -> int:
+    """Ask the kernel to read the start of a file into the page cache,
+    returning how many bytes we asked for"""
+    try:
+        handle = os.open(path, os.O_RDONLY)
+    except (OSError, ValueError):
+        return 0
+    try:
+        file_stat = os.fstat(handle)
+        if not stat.S_ISREG(file_stat.st_mode):
+            return 0
+        length = min(file_stat.st_size, MAX_PREFETCH_FILE_BYTES)
+        os.posix_fadvise(handle, 0, length, os.POSIX_FADV_WILLNEED)
+        return length
+    except OSError:
+        return 0
+    finally:
+        os.close(handle)
+
+
+class PagePrefetcher:
+
+    """Warms the page cache with the selected files on a worker thread
+    while we write the script, so the editor (or command) opens them from
+    memory instead of reading one after another from a cold disk"""
+
+    def __init__(self) -> None:
+        self.thread: Optional[threading.Thread] = None
+        self.num_bytes = 0
+
+    def start(self, paths: List[str]) -> None:
+        self.thread = threading.Thread(target=self.run, args=(paths,), daemon=True)
+        self.thread.start()
+
+    def run(self, paths: List[str]) -> None:
+        for path in dict.fromkeys(paths):
+            self.num_bytes += prefetch_file(path)
+
+    def wait(self, timeout: float) -> int:
+        """Wait (up to the timeout) for the worker, returning how many
+        bytes it asked for so far"""
+        if self.thread is not None:
+            self.thread.join(timeout)
+        return self.num_bytes
@@ -0,0 +1,186 @@
+# Copyright (c) Facebook, Inc. and its affiliates.
+#
+# This source code is licensed under the MIT license found in the
+# LICENSE file in the root directory of this source tree.
+import mmap
+import os
+import stat
+from array import array
+from collections import OrderedDict
+from itertools import accumulate, chain
+from typing import List, NamedTuple, Optional, Tuple
+
+# files bigger than this are not previewed at all
+MAX_PREVIEW_FILE_BYTES = 32 << 20
+# a file with a NUL byte in its first few KB is taken to be binary
+BINARY_SNIFF_BYTES = 8192
+# how much of a file we look for newlines in at a time, so moving the
+# hover never waits on more than this; the rest is done while idle
+INDEX_CHUNK_BYTES = 256 << 10
+# the most of a line we show (minified files have huge ones)
+MAX_PREVIEW_LINE_BYTES = 512
+# the budget of the recently shown previews we keep
+PREVIEW_CACHE_BYTES = 1 << 20
+# the files we keep mapped (with the newlines we found in them)
+MAX_MAPPED_FILES = 16
+TAB_SIZE = 4
+
+# a file by its path, mtime and size
+FileKey = Tuple[str, int, int]
+# the lines of a file from a line, as many as fit
+PreviewKey = Tuple[str, int, int, int, int]
+
+
+class Preview(NamedTuple):
+    # the number (from 1) of the first line
+    first_line: int
+    lines: List[str]
+    # why there are no lines to show, if there are not
+    note: str = ""
+
+
+class MappedFile:
+
+    """A file mapped in memory, with the offsets of the lines in it found
+    as far as they were needed, a chunk at a time"""
+
+    def __init__(self, path: str, size: int):
+        with open(path, "rb") as file:
+            # the mapping keeps its own handle on the file
+            self.mapped = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        self.size = size
+        self.line_starts: "array[int]" = array("q", [0])
+        self.indexed = 0
+
+    def is_binary(self) -> bool:
+        return self.mapped.find(b"\0", 0, BINARY_SNIFF_BYTES) != -1
+
+    def has_line(self, line: int) -> bool:
+        """Whether we know where the line (counting from 0) ends, or that
+        it is the last one"""
+        return len(self.line_starts) > line + 1 or self.indexed >= self.size
+
+    def index_chunk(self) -> None:
+        start = self.indexed
+        chunk = self.mapped[start : start + INDEX_CHUNK_BYTES]
+        self.indexed += len(chunk)
+        last_newline = chunk.rfind(b"\n")
+        if last_newline == -1:
+            return
+        lengths = map(len, chunk[:last_newline].split(b"\n"))
+        line_starts = accumulate(chain([start], (length + 1 for length in lengths)))
+        next(line_starts)
+        self.line_starts.extend(line_starts)
+        if self.indexed < self.size:
+            # the line after the last newline may go on in the next chunk
+            self.indexed = start + last_newline + 1
+
+    def get_lines(self, first: int, last: int) -> List[bytes]:
+        """The lines from first up to last (counting from 0), which have
+        to be indexed"""
+        starts = self.line_starts
+        lines = []
+        for line in range(first, min(last, len(starts))):
+            start = starts[line]
+            if start >= self.size:
+                # the newline at the end of the file does not start a line
+                break
+            end = starts[line + 1] - 1 if line + 1 < len(starts) else self.size
+            end = min(end, start + MAX_PREVIEW_LINE_BYTES)
+            lines.append(self.mapped[start:end])
+        return lines
+
+    def close(self) -> None:
+        self.mapped.close()
+
+
+def decode_line(line: bytes) -> str:
+    return line.decode("utf-8", "replace").rstrip("\r").expandtabs(TAB_SIZE)
+
+
+def get_preview_bytes(preview: Preview) -> int:
+    return sum(map(len, preview.lines))
+
+
+class FilePreviewer:
+
+    """The lines around a match, read through mmap. Files are indexed a
+    chunk at a time, so a preview that needs more than a chunk is left
+    pending and finished while the user is idle. Huge and binary files
+    are skipped after a stat and a peek at their first few KB"""
+
+    def __init__(self) -> None:
+        # the key of a file includes its mtime and size, so a modified
+        # file is mapped and indexed again
+        self.files: "OrderedDict[FileKey, MappedFile]" = OrderedDict()
+        self.previews: "OrderedDict[PreviewKey, Preview]" = OrderedDict()
+        self.preview_bytes = 0
+        # the preview we could not make without indexing more
+        self.pending: Optional[Tuple[str, int, int]] = None
+
+    def get_preview(
+        self, path: str, line_num: int, num_lines: int
+    ) -> Optional[Preview]:
+        """The lines around the line (or the top of the file when we do
+        not know the line), or None if the file is still being indexed"""
+        self.pending = None
+        first_line = max(line_num - num_lines // 3, 1)
+        try:
+            file_stat = os.stat(path)
+        except (OSError, ValueError):
+            return Preview(first_line, [], "could not read the file")
+        if not stat.S_ISREG(file_stat.st_mode):
+            return Preview(first_line, [], "not a file")
+        if file_stat.st_size > MAX_PREVIEW_FILE_BYTES:
+            return Preview(first_line, [], "too big to preview")
+        if file_stat.st_size == 0:
+            return Preview(first_line, [], "empty file")
+        key = (path, file_stat.st_mtime_ns, file_stat.st_size)
+        preview_key = key + (first_line, num_lines)
+        preview = self.previews.get(preview_key)
+        if preview is not None:
+            self.previews.move_to_end(preview_key)
+            return preview
+        try:
+            mapped_file = self.get_mapped_file(key)
+        except (OSError, ValueError):
+            return Preview(first_line, [], "could not read the file")
+        if mapped_file.is_binary():
+            return Preview(first_line, [], "binary file")
+        last_line = first_line + num_lines - 1
+        if not mapped_file.has_line(last_line - 1):
+            mapped_file.index_chunk()
+        if not mapped_file.has_line(last_line - 1):
+            self.pending = (path, line_num, num_lines)
+            return None
+        lines = mapped_file.get_lines(first_line - 1, last_line)
+        if not lines:
+            # the line is past the end of the file
+            return Preview(first_line, [], "no such line")
+        preview = Preview(first_line, list(map(decode_line, lines)))
+        self.add_preview(preview_key, preview)
+        return preview
+
+    def index_pending(self) -> bool:
+        """Index the file of the pending preview a chunk further,
+        returning whether it is still pending"""
+        if self.pending is None:
+            return False
+        self.get_preview(*self.pending)
+        return self.pending is not None
+
+    def get_mapped_file(self, key: FileKey) -> MappedFile:
+        mapped_file = self.files.get(key)
+        if mapped_file is None:
+            mapped_file = self.files[key] = MappedFile(key[0], key[2])
+            if len(self.files) > MAX_MAPPED_FILES:
+                self.files.popitem(last=False)[1].close()
+        self.files.move_to_end(key)
+        return mapped_file
+
+    def add_preview(self, key: PreviewKey, preview: Preview) -> None:
+        self.previews[key] = preview
+        self.preview_bytes += get_preview_bytes(preview)
+        while self.preview_bytes > PREVIEW_CACHE_BYTES and len(self.previews) > 1:
+            (_key, dropped) = self.previews.popitem(last=False)
+            self.preview_bytes -= get_preview_bytes(dropped)
@@ -0,0 +1,160 @@
+# Copyright (c) Facebook, Inc. and its affiliates.
+#
+# This source code is licensed under the MIT license found in the
+# LICENSE file in the root directory of this source tree.
+from typing import Collection, List, Optional, Set, Tuple
+
+from pathpicker.color_printer import ColorPrinter
+from pathpicker.screen import PadBase
+
+# with --pad-scrolling, lines are drawn into the pad a chunk at a time
+# and the pad holds a few chunks around the viewport (curses pads can
+# not be more than 32767 rows tall)
+PAD_CHUNK_LINES = 2048
+PAD_NUM_CHUNKS = 3
+
+
+class Region:
+
+    """A rectangular part of the screen drawn through its own curses
+    subwindow, so that it can be erased and refreshed without touching
+    the rest of the screen"""
+
+    def __init__(self, printer: ColorPrinter):
+        self.parent_printer = printer
+        self.printer = printer
+        # format of (MINY, MINX, MAXY, MAXX)
+        self.geometry: Optional[Tuple[int, int, int, int]] = None
+        self.hidden = False
+
+    def set_geometry(self, min_y: int, min_x: int, max_y: int, max_x: int) -> None:
+        """Move the region, recreating its window only if it changed"""
+        screen_max_y, screen_max_x = self.parent_printer.screen.getmaxyx()
+        # curses refuses to create windows that do not fit in their parent
+        min_y = max(min(min_y, screen_max_y - 1), 0)
+        min_x = max(min(min_x, screen_max_x - 1), 0)
+        max_y = max(min(max_y, screen_max_y), min_y + 1)
+        max_x = max(min(max_x, screen_max_x), min_x + 1)
+        if self.geometry == (min_y, min_x, max_y, max_x):
+            return
+        self.geometry = (min_y, min_x, max_y, max_x)
+        self.printer = self.make_printer(max_y - min_y, max_x - min_x, min_y, min_x)
+
+    def make_printer(
+        self, num_lines: int, num_cols: int, begin_y: int, begin_x: int
+    ) -> ColorPrinter:
+        return self.parent_printer.for_screen(
+            self.parent_printer.screen.derwin(num_lines, num_cols, begin_y, begin_x)
+        )
+
+    def get_size(self) -> Tuple[int, int]:
+        return self.printer.screen.getmaxyx()
+
+    def get_is_offscreen(self) -> bool:
+        return False
+
+    def get_line_offset(self, scroll_offset: int) -> int:
+        """What to add to a line index to get the row it is drawn on"""
+        return scroll_offset
+
+    def reset(self) -> None:
+        """Erase the region. The color pairs it used stay taken until the
+        controller starts a new frame, since the other regions may use
+        them too"""
+        self.hidden = False
+        self.printer.screen.erase()
+
+    def hide(self) -> None:
+        """Stop showing the region until it is reset, e.g. while
+        something else is drawn on top of it"""
+        self.hidden = True
+
+    def scroll(self) -> None:
+        # a window only has the rows on the screen, so start over
+        self.reset()
+
+    def reveal(self, top: int, bottom: int) -> Collection[int]:
+        """The indexes of the lines that still need to be drawn to show
+        the lines from top to bottom"""
+        return range(top, bottom)
+
+    def noutrefresh(self) -> None:
+        if not self.hidden:
+            self.printer.screen.noutrefresh()
+
+
+class PadRegion(Region):
+
+    """A region drawn into an off screen pad that holds more lines than
+    fit on the screen. Lines are drawn a chunk at a time as they are
+    scrolled into view, and scrolling just changes the part of the pad
+    that we copy onto the screen"""
+
+    def __init__(self, printer: ColorPrinter, chunk_lines: int = PAD_CHUNK_LINES):
+        super().__init__(printer)
+        self.chunk_lines = chunk_lines
+        self.num_chunks = PAD_NUM_CHUNKS
+        self.pad: Optional[PadBase] = None
+        # the first chunk held by the pad and the chunks drawn so far
+        self.first_chunk = 0
+        self.drawn_chunks: Set[int] = set()
+        # the line shown at the top of the region
+        self.top = 0
+
+    def make_printer(
+        self, num_lines: int, num_cols: int, begin_y: int, begin_x: int
+    ) -> ColorPrinter:
+        # leave room for the viewport to straddle two chunks
+        self.num_chunks = max(PAD_NUM_CHUNKS, num_lines // self.chunk_lines + 2)
+        self.pad = self.parent_printer.screen.newpad(
+            self.num_chunks * self.chunk_lines, num_cols
+        )
+        self.drawn_chunks = set()
+        return self.parent_printer.for_screen(self.pad)
+
+    def get_is_offscreen(self) -> bool:
+        return True
+
+    def get_line_offset(self, scroll_offset: int) -> int:
+        return -self.first_chunk * self.chunk_lines
+
+    def reset(self) -> None:
+        super().reset()
+        self.drawn_chunks = set()
+
+    def scroll(self) -> None:
+        # we keep everything we drew, reveal moves the pad if needed
+        pass
+
+    def reveal(self, top: int, bottom: int) -> Collection[int]:
+        self.top = top
+        first_chunk = top // self.chunk_lines
+        last_chunk = max(bottom - 1, top) // self.chunk_lines
+        if (
+            first_chunk < self.first_chunk
+            or last_chunk >= self.first_chunk + self.num_chunks
+        ):
+            # center the pad on the viewport and start over
+            spare_chunks = self.num_chunks - (last_chunk - first_chunk + 1)
+            self.first_chunk = max(first_chunk - spare_chunks // 2, 0)
+            self.reset()
+        lines: List[int] = []
+        for chunk in range(first_chunk, last_chunk + 1):
+            if chunk not in self.drawn_chunks:
+                self.drawn_chunks.add(chunk)
+                start = chunk * self.chunk_lines
+                lines.extend(range(start, start + self.chunk_lines))
+        return lines
+
+    def noutrefresh(self) -> None:
+        if self.pad is None or self.geometry is None or self.hidden:
+            return
+        (min_y, min_x, max_y, max_x) = self.geometry
+        self.pad.noutrefresh_region(
+            self.top - self.first_chunk * self.chunk_lines,
+            0,
+            min_y,
+            min_x,
+            max_y - 1,
+            max_x - 1,
+        )
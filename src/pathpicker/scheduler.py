@@ -0,0 +1,120 @@
+# Copyright (c) Facebook, Inc. and its affiliates.
+#
+# This source code is licensed under the MIT license found in the
+# LICENSE file in the root directory of this source tree.
+import heapq
+import time
+from typing import Callable, Dict, Hashable, List, Optional, Tuple
+
+# A job does a small, bounded amount of work and returns True if
+# it wants to be run again (e.g. it processed one chunk of many)
+Job = Callable[[], bool]
+
+# how long we are willing to spend on background work before
+# checking for another keystroke
+DEFAULT_TIME_SLICE = 0.02
+
+# jobs without a row (e.g. building an index over every line) are
+# run after everything that is tied to a visible row
+GLOBAL_PRIORITY = 1 << 62
+
+NO_TIMEOUT = -1
+
+
+class IdleScheduler:
+
+    """A small cooperative scheduler for work that should only
+    happen while the user is idle. Jobs tied to a screen row are
+    ordered by their distance from the viewport and dropped once the
+    viewport moves too far away from them"""
+
+    def __init__(
+        self,
+        time_slice: float = DEFAULT_TIME_SLICE,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.time_slice = time_slice
+        self.clock = clock
+        self.viewport: Tuple[int, int] = (0, 0)
+        # heap of (priority, sequence, key), jobs are looked up by key
+        # so cancelled or resubmitted entries can be skipped lazily
+        self.queue: List[Tuple[int, int, Hashable]] = []
+        self.jobs: Dict[Hashable, Tuple[Optional[int], int, Job]] = {}
+        self.sequence = 0
+
+    def get_priority(self, row: Optional[int]) -> int:
+        if row is None:
+            return GLOBAL_PRIORITY
+        top, bottom = self.viewport
+        if row < top:
+            return top - row
+        if row >= bottom:
+            return row - bottom + 1
+        return 0
+
+    def get_cancel_distance(self) -> int:
+        # anything more than a couple of screens away is stale
+        top, bottom = self.viewport
+        return max(2 * (bottom - top), 1)
+
+    def submit(self, key: Hashable, row: Optional[int], job: Job) -> None:
+        """Queue a job, replacing any pending job with the same key"""
+        self.sequence += 1
+        self.jobs[key] = (row, self.sequence, job)
+        heapq.heappush(self.queue, (self.get_priority(row), self.sequence, key))
+
+    def cancel(self, key: Hashable) -> None:
+        self.jobs.pop(key, None)
+
+    def has_pending(self) -> bool:
+        return bool(self.jobs)
+
+    def get_timeout(self) -> int:
+        """The getch timeout (in ms) to use while waiting for input:
+        poll if we have work to do, otherwise block"""
+        return 0 if self.has_pending() else NO_TIMEOUT
+
+    def set_viewport(self, top: int, bottom: int) -> None:
+        if (top, bottom) == self.viewport:
+            return
+        self.viewport = (top, bottom)
+        cancel_distance = self.get_cancel_distance()
+        stale = [
+            key
+            for key, (row, _sequence, _job) in self.jobs.items()
+            if row is not None and self.get_priority(row) > cancel_distance
+        ]
+        for key in stale:
+            del self.jobs[key]
+        self.queue = [
+            (self.get_priority(row), sequence, key)
+            for key, (row, sequence, _job) in self.jobs.items()
+        ]
+        heapq.heapify(self.queue)
+
+    def pop_job(self) -> Optional[Tuple[Hashable, Optional[int], Job]]:
+        while self.queue:
+            _priority, sequence, key = heapq.heappop(self.queue)
+            entry = self.jobs.get(key)
+            if entry is None or entry[1] != sequence:
+                # cancelled or superseded by a newer submit
+                continue
+            row, _sequence, job = entry
+            del self.jobs[key]
+            return key, row, job
+        return None
+
+    def run_slice(self) -> int:
+        """Run jobs, closest to the viewport first, until we run out of
+        jobs or exceed our time slice. Returns the number of jobs run"""
+        deadline = self.clock() + self.time_slice
+        num_run = 0
+        while self.clock() < deadline:
+            popped = self.pop_job()
+            if popped is None:
+                break
+            key, row, job = popped
+            num_run += 1
+            if job() and key not in self.jobs:
+                self.submit(key, row, job)
+        return num_run
@@ -2,11 +2,9 @@
 #
 # This source code is licensed under the MIT license found in the
 # LICENSE file in the root directory of this source tree.
+import curses
 from abc import ABC, abstractmethod
-from typing import TYPE_CHECKING, Tuple
-
-if TYPE_CHECKING:
-    import curses
+from typing import Tuple
 
 
 class ScreenBase(ABC):
@@ -18,6 +16,24 @@ class ScreenBase(ABC):
     def refresh(self) -> None:
         pass
 
+    @abstractmethod
+    def noutrefresh(self) -> None:
+        pass
+
+    @abstractmethod
+    def doupdate(self) -> None:
+        pass
+
+    @abstractmethod
+    def derwin(
+        self, num_lines: int, num_cols: int, begin_y: int, begin_x: int
+    ) -> "ScreenBase":
+        pass
+
+    @abstractmethod
+    def newpad(self, num_lines: int, num_cols: int) -> "PadBase":
+        pass
+
     @abstractmethod
     def erase(self) -> None:
         pass
@@ -31,7 +47,11 @@ class ScreenBase(ABC):
         pass
 
     @abstractmethod
-    def delch(self, y_pos: int, x_pos: int) -> None:
+    def clrtoeol(self) -> None:
+        pass
+
+    @abstractmethod
+    def timeout(self, delay: int) -> None:
         pass
 
     @abstractmethod
@@ -43,6 +63,24 @@ class ScreenBase(ABC):
         pass
 
 
+class PadBase(ScreenBase):
+
+    """An off screen window that can be larger than the screen, of
+    which we only copy a part onto the screen"""
+
+    @abstractmethod
+    def noutrefresh_region(
+        self,
+        pad_min_y: int,
+        pad_min_x: int,
+        min_y: int,
+        min_x: int,
+        max_y: int,
+        max_x: int,
+    ) -> None:
+        pass
+
+
 class CursesScreen(ScreenBase):
     def __init__(self, screen: "curses._CursesWindow"):
         self.screen = screen
@@ -53,6 +91,20 @@ class CursesScreen(ScreenBase):
     def refresh(self) -> None:
         self.screen.refresh()
 
+    def noutrefresh(self) -> None:
+        self.screen.noutrefresh()
+
+    def doupdate(self) -> None:
+        curses.doupdate()
+
+    def derwin(
+        self, num_lines: int, num_cols: int, begin_y: int, begin_x: int
+    ) -> ScreenBase:
+        return CursesScreen(self.screen.derwin(num_lines, num_cols, begin_y, begin_x))
+
+    def newpad(self, num_lines: int, num_cols: int) -> PadBase:
+        return CursesPad(curses.newpad(num_lines, num_cols))
+
     def erase(self) -> None:
         self.screen.erase()
 
@@ -62,8 +114,11 @@ class CursesScreen(ScreenBase):
     def addstr(self, y_pos: int, x_pos: int, string: str, attr: int) -> None:
         self.screen.addstr(y_pos, x_pos, string, attr)
 
-    def delch(self, y_pos: int, x_pos: int) -> None:
-        self.screen.delch(y_pos, x_pos)
+    def clrtoeol(self) -> None:
+        self.screen.clrtoeol()
+
+    def timeout(self, delay: int) -> None:
+        self.screen.timeout(delay)
 
     def getch(self) -> int:
         return self.screen.getch()
@@ -75,3 +130,16 @@ class CursesScreen(ScreenBase):
         if isinstance(result, int):
             return str(result)
         return result.decode("utf-8")
+
+
+class CursesPad(CursesScreen, PadBase):
+    def noutrefresh_region(
+        self,
+        pad_min_y: int,
+        pad_min_x: int,
+        min_y: int,
+        min_x: int,
+        max_y: int,
+        max_x: int,
+    ) -> None:
+        self.screen.noutrefresh(pad_min_y, pad_min_x, min_y, min_x, max_y, max_x)
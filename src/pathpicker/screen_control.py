@@ -3,19 +3,49 @@
 # This source code is licensed under the MIT license found in the
 # LICENSE file in the root directory of this source tree.
 import curses
+import re
 import signal
 import sys
 from types import FrameType
-from typing import Dict, List, Tuple
-
-from pathpicker import logger, output, usage_strings
-from pathpicker.char_code_mapping import CODE_TO_CHAR
+from typing import Callable, Collection, Dict, List, Optional, Tuple
+
+from pathpicker import logger, output
+from pathpicker.char_code_mapping import BACKSPACE_KEYS, CODE_TO_CHAR, ESCAPE_KEY
+from pathpicker.chrome import (
+    BLOCK_CURSOR,
+    CHROME_MIN_X,
+    CHROME_MIN_Y,
+    COMMAND_MODE,
+    SELECT_MODE,
+    SHORT_COMMAND_PROMPT,
+    X_MODE,
+    HelperChrome,
+    ScrollBar,
+)
 from pathpicker.color_printer import ColorPrinter
 from pathpicker.curses_api import CursesApiBase
+from pathpicker.facets import FacetIndex
+from pathpicker.file_details import FileDetails
 from pathpicker.key_bindings import KeyBindings
 from pathpicker.line_format import LineBase, LineMatch
+from pathpicker.line_search import LineSearch
+from pathpicker.match_sort import (
+    INPUT_ORDER,
+    SORT_DESCRIPTIONS,
+    SORT_ORDERS,
+    MatchSorter,
+)
+from pathpicker.path_groups import PathGroups
+from pathpicker.path_tree import PathTree
+from pathpicker.patterns import get_matching_indexes, parse_selection_pattern
+from pathpicker.regions import PadRegion, Region
+from pathpicker.scheduler import IdleScheduler
 from pathpicker.screen import ScreenBase
 from pathpicker.screen_flags import ScreenFlags
+from pathpicker.selection import SelectionModel
+from pathpicker.stat_cache import StatCache
+from pathpicker.tree_browser import TreeBrowser
+from pathpicker.views import LineView, MatchLineIndexes, RankedLineView
 
 
 def signal_handler(_sig: int, _frame: FrameType) -> None:
@@ -27,265 +57,21 @@ def signal_handler(_sig: int, _frame: FrameType) -> None:
 signal.signal(signal.SIGINT, signal_handler)
 
 
-CHROME_MIN_X = 5
-CHROME_MIN_Y = 0
-
-SELECT_MODE = "SELECT"
-COMMAND_MODE = "COMMAND_MODE"
-X_MODE = "X_MODE"
-
 # characters for quick select mode label(excluded reserved chars: A,F)
 LABELS = "BCDEGHIJKLMNOPQRSTUVWXYZ1234567890~!@#$%^&*()_+<>?{}|;'"
 
-
-# options for displayed to the user at the bottom of the screen
-SHORT_NAV_OPTION_SELECTION_STR = "[f|A] selection"
-SHORT_NAV_OPTION_NAVIGATION_STR = "[down|j|up|k|space|b] navigation"
-SHORT_NAV_OPTION_OPEN_STR = "[enter] open"
-SHORT_NAV_OPTION_QUICK_SELECT_STR = "[x] quick select mode"
-SHORT_NAV_OPTION_COMMAND_STR = "[c] command mode"
-
-SHORT_COMMAND_USAGE = (
-    "command examples: | git add | git checkout HEAD~1 -- | mv $F ../here/ |"
-)
-SHORT_COMMAND_PROMPT = "Type a command below! Paths will be appended or replace $F"
 SHORT_COMMAND_PROMPT2 = "Enter a blank line to go back to the selection process"
 SHORT_PATHS_HEADER = "Paths you have selected:"
+SHORT_PATTERN_PROMPT = "Type a glob (or re:<regex>) to select matching paths"
+SHORT_PATTERN_PROMPT2 = "Start with ! to unselect, or line: to match whole lines"
 
-INVISIBLE_CURSOR = 0
-BLOCK_CURSOR = 2
-
-
-class HelperChrome:
-    def __init__(
-        self, printer: ColorPrinter, screen_control: "Controller", flags: ScreenFlags
-    ):
-        self.printer = printer
-        self.screen_control = screen_control
-        self.flags = flags
-        self.mode = SELECT_MODE
-        self.width = 50
-        self.sidebar_y = 0
-        self.description_clear = True
-        if self.get_is_sidebar_mode():
-            logger.add_event("init_wide_mode")
-        else:
-            logger.add_event("init_narrow_mode")
-
-    def output(self, mode: str) -> None:
-        self.mode = mode
-        for func in [self.output_side, self.output_bottom, self.toggle_cursor]:
-            try:
-                func()
-            except curses.error:
-                pass
-
-    def output_description(self, line_obj: LineMatch) -> None:
-        self.output_description_pane(line_obj)
-
-    def toggle_cursor(self) -> None:
-        # only include cursor when in command mode
-        if self.mode == COMMAND_MODE:
-            curses.curs_set(BLOCK_CURSOR)
-        else:
-            curses.curs_set(INVISIBLE_CURSOR)
-
-    def reduce_max_y(self, max_y: int) -> int:
-        if self.get_is_sidebar_mode():
-            return max_y
-        return max_y - 4
-
-    def reduce_max_x(self, max_x: int) -> int:
-        if not self.get_is_sidebar_mode():
-            return max_x
-        return max_x - self.width
-
-    def get_min_x(self) -> int:
-        if self.mode == COMMAND_MODE:
-            return 0
-        return self.screen_control.get_chrome_boundaries()[0]
-
-    def get_min_y(self) -> int:
-        return self.screen_control.get_chrome_boundaries()[1]
-
-    def get_is_sidebar_mode(self) -> bool:
-        _max_y, max_x = self.screen_control.get_screen_dimensions()
-        return max_x > 200
-
-    def trim_line(self, line: str, width: int) -> str:
-        return line[:width]
-
-    def output_description_pane(self, line_obj: LineMatch) -> None:
-        if not self.get_is_sidebar_mode():
-            return
-        _max_y, max_x = self.screen_control.get_screen_dimensions()
-        border_x = max_x - self.width
-        start_y = self.sidebar_y + 1
-        start_x = border_x + 2
-        header_line = "Description for " + line_obj.path + " :"
-        line_prefix = "    * "
-        desc_lines = [
-            line_obj.get_time_last_accessed(),
-            line_obj.get_time_last_modified(),
-            line_obj.get_owner_user(),
-            line_obj.get_owner_group(),
-            line_obj.get_file_size(),
-            line_obj.get_length_in_lines(),
-        ]
-        self.printer.addstr(start_y, start_x, header_line)
-        y_pos = start_y + 2
-        for desc_line in desc_lines:
-            desc_line = self.trim_line(desc_line, max_x - start_x - len(line_prefix))
-            self.printer.addstr(y_pos, start_x, line_prefix + desc_line)
-            y_pos = y_pos + 1
-        self.description_clear = False
-
-    # to fix bug where description pane may not clear on scroll
-    def clear_description_pane(self) -> None:
-        if self.description_clear:
-            return
-        max_y, max_x = self.screen_control.get_screen_dimensions()
-        border_x = max_x - self.width
-        start_y = self.sidebar_y + 1
-        self.printer.clear_square(start_y, max_y - 1, border_x + 2, max_x)
-        self.description_clear = True
-
-    def output_side(self) -> None:
-        if not self.get_is_sidebar_mode():
-            return
-        max_y, max_x = self.screen_control.get_screen_dimensions()
-        border_x = max_x - self.width
-        if self.mode == COMMAND_MODE:
-            border_x = len(SHORT_COMMAND_PROMPT) + 20
-        usage_lines = usage_strings.USAGE_PAGE.split("\n")
-        if self.mode == COMMAND_MODE:
-            usage_lines = usage_strings.USAGE_COMMAND.split("\n")
-        for index, usage_line in enumerate(usage_lines):
-            self.printer.addstr(self.get_min_y() + index, border_x + 2, usage_line)
-            self.sidebar_y = self.get_min_y() + index
-        for y_pos in range(self.get_min_y(), max_y):
-            self.printer.addstr(y_pos, border_x, "|")
-
-    def output_bottom(self) -> None:
-        if self.get_is_sidebar_mode():
-            return
-        max_y, max_x = self.screen_control.get_screen_dimensions()
-        border_y = max_y - 2
-        # first output text since we might throw an exception during border
-        usage_str = {
-            SELECT_MODE: self.get_short_nav_usage_string(),
-            X_MODE: self.get_short_nav_usage_string(),
-            COMMAND_MODE: SHORT_COMMAND_USAGE,
-        }[self.mode]
-        border_str = "_" * (max_x - self.get_min_x() - 0)
-        self.printer.addstr(border_y, self.get_min_x(), border_str)
-        self.printer.addstr(border_y + 1, self.get_min_x(), usage_str)
-
-    def get_short_nav_usage_string(self) -> str:
-        nav_options = [
-            SHORT_NAV_OPTION_SELECTION_STR,
-            SHORT_NAV_OPTION_NAVIGATION_STR,
-            SHORT_NAV_OPTION_OPEN_STR,
-            SHORT_NAV_OPTION_QUICK_SELECT_STR,
-            SHORT_NAV_OPTION_COMMAND_STR,
-        ]
-
-        # it does not make sense to give the user the option to "open" the selection
-        # in all-input mode
-        if self.flags.get_all_input():
-            nav_options.remove(SHORT_NAV_OPTION_OPEN_STR)
-
-        return ", ".join(nav_options)
-
-
-class ScrollBar:
-    def __init__(
-        self,
-        printer: ColorPrinter,
-        lines: Dict[int, LineBase],
-        screen_control: "Controller",
-    ):
-        self.printer = printer
-        self.screen_control = screen_control
-        self.num_lines = len(lines)
-        self.box_start_fraction = 0.0
-        self.box_stop_fraction = 0.0
-        self.calc_box_fractions()
-
-        # see if we are activated
-        self.activated = True
-        max_y, _max_x = self.screen_control.get_screen_dimensions()
-        if self.num_lines < max_y:
-            self.activated = False
-            logger.add_event("no_scrollbar")
-        else:
-            logger.add_event("needed_scrollbar")
-
-    def get_is_activated(self) -> bool:
-        return self.activated
-
-    def calc_box_fractions(self) -> None:
-        # what we can see is basically the fraction of our screen over
-        # total num lines
-        max_y, _max_x = self.screen_control.get_screen_dimensions()
-        frac_displayed = min(1.0, (max_y / float(self.num_lines)))
-        self.box_start_fraction = -self.screen_control.get_scroll_offset() / float(
-            self.num_lines
-        )
-        self.box_stop_fraction = self.box_start_fraction + frac_displayed
-
-    def output(self) -> None:
-        if not self.activated:
-            return
-        for func in [
-            self.output_caps,
-            self.output_base,
-            self.output_box,
-            self.output_border,
-        ]:
-            try:
-                func()
-            except curses.error:
-                pass
-
-    def get_min_y(self) -> int:
-        return self.screen_control.get_chrome_boundaries()[1] + 1
-
-    def get_x(self) -> int:
-        return 0
-
-    def output_border(self) -> None:
-        x_pos = self.get_x() + 4
-        max_y, _max_x = self.screen_control.get_screen_dimensions()
-        for y_pos in range(0, max_y):
-            self.printer.addstr(y_pos, x_pos, " ")
-
-    def output_box(self) -> None:
-        max_y, _max_x = self.screen_control.get_screen_dimensions()
-        top_y = max_y - 2
-        min_y = self.get_min_y()
-        diff = top_y - min_y
-        x_pos = self.get_x()
-
-        box_start_y = int(diff * self.box_start_fraction) + min_y
-        box_stop_y = int(diff * self.box_stop_fraction) + min_y
-
-        self.printer.addstr(box_start_y, x_pos, "/-\\")
-        for y_pos in range(box_start_y + 1, box_stop_y):
-            self.printer.addstr(y_pos, x_pos, "|-|")
-        self.printer.addstr(box_stop_y, x_pos, "\\-/")
+SHORT_QUERY_USAGE = "[enter] keep, [esc] clear"
 
-    def output_caps(self) -> None:
-        x_pos = self.get_x()
-        max_y, _max_x = self.screen_control.get_screen_dimensions()
-        for y_pos in [self.get_min_y() - 1, max_y - 1]:
-            self.printer.addstr(y_pos, x_pos, "===")
+# what getch returns when it times out waiting for a key
+NO_KEY_CODE = -1
 
-    def output_base(self) -> None:
-        x_pos = self.get_x()
-        max_y, _max_x = self.screen_control.get_screen_dimensions()
-        for y_pos in range(self.get_min_y(), max_y - 1):
-            self.printer.addstr(y_pos, x_pos, " . ")
+# toggle the facets listed in the sidebar
+FACET_KEYS = list("123456789")
 
 
 class Controller:
@@ -307,21 +93,44 @@ class Controller:
         self.line_objs = line_objs
         self.hover_index = 0
         self.scroll_offset = 0
+        # background work that runs between keystrokes
+        self.scheduler = IdleScheduler()
         self.scroll_bar = ScrollBar(self.color_printer, line_objs, self)
         self.helper_chrome = HelperChrome(self.color_printer, self, flags)
+        # lines are drawn relative to the content region, which sits
+        # inside of the chrome boundaries
+        self.content = (
+            PadRegion(self.color_printer)
+            if self.flags.get_pad_scrolling()
+            else Region(self.color_printer)
+        )
         self.old_max_y, self.old_max_x = self.get_screen_dimensions()
         self.mode = SELECT_MODE
 
         # lets loop through and split
         self.line_matches: List[LineMatch] = []
+        # which matches are selected, by their index in line_matches
+        self.selection = SelectionModel()
+        # the matches of every path, for toggle_select_all and grouping
+        # the matches by file
+        self.path_groups = PathGroups()
+        # the matches of every extension, top level directory and root
+        self.facet_index = FacetIndex()
+        # where range selections start, they end at the hovered match
+        self.mark_index: Optional[int] = None
+        # the paths (False) or whole lines (True) of every match, which
+        # we match patterns against, built the first time we need them
+        self.pattern_haystacks: Dict[bool, List[str]] = {}
 
         for line_obj in self.line_objs.values():
-            line_obj.set_controller(self)
             if isinstance(line_obj, LineMatch):
-                self.line_matches.append(line_obj)
+                self.add_line_match(line_obj)
+            line_obj.set_controller(self)
 
         # begin tracking dirty state
         self.dirty = False
+        self.content_dirty = False
+        self.content_stale = False
         self.dirty_indexes: List[int] = []
 
         if self.flags.args.all:
@@ -329,6 +138,42 @@ class Controller:
 
         self.num_lines = len(line_objs.keys())
         self.num_matches = len(self.line_matches)
+        # the lines we show, see set_view
+        self.view = LineView.show_all(self.num_lines, self.num_matches)
+        # the compact view only shows the matches and the lines of
+        # context around them, built on first use
+        self.compact = False
+        self.compact_line_indexes: Optional[List[int]] = None
+        # grouping by file shows one row per path instead
+        self.group_by_file = False
+
+        # the / filter and the fuzzy finder
+        self.search = LineSearch(self)
+        # the tree groups the paths by directory, the top level ones are
+        # grouped in the background and the rest when they are opened
+        self.tree_browser = TreeBrowser(
+            self, PathTree(self.num_matches, self.get_match_path)
+        )
+        self.scheduler.submit("path_tree", None, self.tree_browser.tree.prepare_chunk)
+        # the stats of the files are only fetched once we sort by them
+        self.stat_cache = StatCache()
+        self.match_sorter = MatchSorter(self.line_matches, self.stat_cache)
+        self.sort_order = INPUT_ORDER
+        # the description and the preview of the hovered file
+        self.file_details = FileDetails(self)
+
+        # keys that just call a method, the rest are in process_input
+        self.key_actions: Dict[str, Callable[[], None]] = {
+            "p": self.begin_select_by_pattern,
+            "/": self.search.begin_filter,
+            "z": self.search.begin_fuzzy_find,
+            "m": self.toggle_compact,
+            "t": self.tree_browser.run,
+            "u": self.toggle_group_by_file,
+            "e": self.toggle_expand_file,
+            "o": self.cycle_sort_order,
+            "w": self.file_details.toggle_preview,
+        }
 
         self.set_hover(self.hover_index, True)
 
@@ -340,6 +185,16 @@ class Controller:
 
         logger.add_event("init")
 
+    def add_line_match(self, line_obj: LineMatch) -> None:
+        # lines may have been selected before we took over
+        # (from a previous run, for example)
+        line_obj.set_match_index(len(self.line_matches))
+        if line_obj.get_selected():
+            self.selection.set_selected(line_obj.match_index, True)
+        self.line_matches.append(line_obj)
+        self.path_groups.add(line_obj.get_path(), line_obj.match_index)
+        self.facet_index.add(line_obj.get_path(), line_obj.match_index)
+
     def get_scroll_offset(self) -> int:
         return self.scroll_offset
 
@@ -358,6 +213,12 @@ class Controller:
         # format of (MINX, MINY, MAXX, MAXY)
         return min_x, CHROME_MIN_Y, max_x, max_y
 
+    def get_content_dimensions(self) -> Tuple[int, int]:
+        return self.content.get_size()
+
+    def get_content_offset(self) -> int:
+        return self.content.get_line_offset(self.scroll_offset)
+
     def get_viewport_height(self) -> int:
         (_min_x, min_y, _max_x, max_y) = self.get_chrome_boundaries()
         return max_y - min_y
@@ -369,17 +230,224 @@ class Controller:
         self.line_matches[self.hover_index].toggle_select()
 
     def toggle_select_all(self) -> None:
-        paths = set()
-        for line in self.line_matches:
-            if line.get_path() not in paths:
-                paths.add(line.get_path())
-                line.toggle_select()
+        self.selection.toggle_many(self.path_groups.get_first_indexes())
+        self.dirty_drawn_lines()
 
     def set_select(self, val: bool) -> None:
         self.line_matches[self.hover_index].set_select(val)
 
-    def describe_file(self) -> None:
-        self.helper_chrome.output_description(self.line_matches[self.hover_index])
+    def toggle_mark(self) -> None:
+        self.mark_index = self.hover_index if self.mark_index is None else None
+        logger.add_event("toggle_mark")
+
+    def get_marked_range(self) -> Tuple[int, int]:
+        """The matches from the mark to the hovered match (or just the
+        hovered match if there is no mark), as a half open range"""
+        mark_index = self.hover_index if self.mark_index is None else self.mark_index
+        return min(mark_index, self.hover_index), max(mark_index, self.hover_index) + 1
+
+    def set_select_range(self, val: bool) -> None:
+        (start, end) = self.get_marked_range()
+        self.selection.set_range(start, end, val)
+        self.dirty_drawn_lines()
+
+    def toggle_select_range(self) -> None:
+        (start, end) = self.get_marked_range()
+        self.selection.toggle_range(start, end)
+        self.dirty_drawn_lines()
+
+    def get_pattern_haystack(self, whole_line: bool) -> List[str]:
+        if whole_line not in self.pattern_haystacks:
+            self.pattern_haystacks[whole_line] = [
+                line.get_line() if whole_line else line.get_path()
+                for line in self.line_matches
+            ]
+        return self.pattern_haystacks[whole_line]
+
+    def select_by_pattern(self, text: str) -> None:
+        """Select (or unselect) every match of a pattern in one pass
+        over all matches, see patterns.parse_selection_pattern"""
+        try:
+            pattern = parse_selection_pattern(text)
+        except re.error as error:
+            self.helper_chrome.set_status(f"Invalid pattern: {error}")
+            return
+        indexes = get_matching_indexes(
+            pattern.matches, self.get_pattern_haystack(pattern.whole_line)
+        )
+        old_count = self.selection.get_count()
+        self.selection.set_many(indexes, pattern.select)
+        num_changed = abs(self.selection.get_count() - old_count)
+        action = "selected" if pattern.select else "unselected"
+        self.helper_chrome.set_status(
+            f"{len(indexes)} matched, {num_changed} newly {action}"
+        )
+        self.dirty_drawn_lines()
+        logger.add_event("select_by_pattern", len(indexes))
+
+    def get_line_text(self, index: int) -> str:
+        return self.line_objs[index].get_line()
+
+    def get_match_path(self, index: int) -> str:
+        return self.line_matches[index].get_path()
+
+    def get_match_line_index(self, index: int) -> int:
+        return self.line_matches[index].index
+
+    def set_view(self, view: LineView) -> None:
+        """Show a different set of lines, keeping the hover on a match
+        in view (if there is one)"""
+        self.view = view
+        self.scroll_bar.set_num_lines(view.get_num_rows())
+        self.scroll_offset = 0
+        if view.get_num_matches() and not view.has_match(self.hover_index):
+            self.jump_to_index(view.get_nearest_match(self.hover_index))
+        else:
+            self.update_scroll_offset()
+        self.dirty_all()
+
+    def get_compact_line_indexes(self) -> List[int]:
+        """The sorted indexes of the matches and the lines of context
+        around them"""
+        if self.compact_line_indexes is None:
+            context = self.flags.get_context_lines()
+            line_indexes: List[int] = []
+            for line in self.line_matches:
+                start = max(line.index - context, 0)
+                if line_indexes:
+                    start = max(start, line_indexes[-1] + 1)
+                end = min(line.index + context + 1, self.num_lines)
+                line_indexes.extend(range(start, end))
+            self.compact_line_indexes = line_indexes
+        return self.compact_line_indexes
+
+    def get_unfiltered_view(self) -> LineView:
+        return self.sort_view(self.get_input_order_view())
+
+    def get_input_order_view(self) -> LineView:
+        """The lines we show without the / filter or the fuzzy finder,
+        in order: the matches of the facets, one per file, compact, all"""
+        if self.facet_index.active:
+            match_indexes = self.facet_index.get_active_matches()
+            lines = MatchLineIndexes(match_indexes, self.get_match_line_index)
+            return LineView(lines, match_indexes)
+        if self.group_by_file:
+            match_indexes = self.path_groups.get_shown_indexes()
+            line_indexes = [self.line_matches[index].index for index in match_indexes]
+            if self.path_groups.expanded_paths:
+                # expanded matches are shown under their file, out of order
+                return RankedLineView(line_indexes, match_indexes)
+            return LineView(line_indexes, match_indexes)
+        if self.compact:
+            return LineView(self.get_compact_line_indexes(), range(self.num_matches))
+        return LineView.show_all(self.num_lines, self.num_matches)
+
+    def sort_view(self, view: LineView) -> LineView:
+        """The matches of the view in the sort order, without the lines
+        around them. The hover stays on its match, wherever it goes"""
+        if self.sort_order == INPUT_ORDER:
+            return view
+        match_indexes = self.match_sorter.sort(view.match_indexes, self.sort_order)
+        lines = self.line_matches
+        line_indexes = [lines[match_index].index for match_index in match_indexes]
+        return RankedLineView(line_indexes, match_indexes)
+
+    def cycle_sort_order(self) -> None:
+        position = SORT_ORDERS.index(self.sort_order)
+        self.sort_order = SORT_ORDERS[(position + 1) % len(SORT_ORDERS)]
+        logger.add_event("cycle_sort_order")
+        self.helper_chrome.set_status(
+            f"Sorted by {SORT_DESCRIPTIONS[self.sort_order]}, [o] to change"
+        )
+        self.search.refresh()
+
+    def toggle_compact(self) -> None:
+        """Switch between showing every line and only the matches (and
+        their context), keeping the / filter"""
+        self.compact = not self.compact
+        logger.add_event("toggle_compact")
+        self.search.refresh()
+
+    def toggle_listed_facet(self, number: int) -> None:
+        """Turn the facet listed under the number in the sidebar on or
+        off, keeping the / filter"""
+        listed = self.facet_index.listed
+        if not 0 < number <= len(listed):
+            return
+        self.facet_index.toggle(listed[number - 1])
+        logger.add_event("toggle_facet")
+        self.search.refresh()
+
+    def is_grouped_by_file(self) -> bool:
+        """Whether we show one row per file, which the / filter and the
+        fuzzy finder take precedence over"""
+        return self.group_by_file and not self.search.is_active()
+
+    def hover_first_file_match(self) -> str:
+        """Move the hover to the first match of its file, returning the
+        path of the file"""
+        path = self.line_matches[self.hover_index].get_path()
+        self.jump_to_index(self.path_groups.get_matches(path)[0])
+        return path
+
+    def toggle_group_by_file(self) -> None:
+        """Switch between showing every line and one row per file, which
+        clears the / filter and the fuzzy finder"""
+        self.group_by_file = not self.group_by_file
+        logger.add_event("toggle_group_by_file")
+        if self.group_by_file:
+            self.hover_first_file_match()
+        self.search.set_filter("")
+
+    def toggle_expand_file(self) -> None:
+        """Show (or hide) the other matches of the hovered file under
+        it when grouping by file"""
+        if not self.is_grouped_by_file():
+            return
+        self.path_groups.toggle_expanded(self.hover_first_file_match())
+        logger.add_event("toggle_expand_file")
+        self.set_view(self.get_unfiltered_view())
+
+    def get_match_prefix(self, line: LineMatch) -> str:
+        if not self.is_grouped_by_file():
+            return ""
+        return self.path_groups.get_prefix(
+            line.get_path(), line.match_index, line.get_line_num()
+        )
+
+    def prompt_query(
+        self, prompt: str, query: str, set_query: Callable[[str], None]
+    ) -> None:
+        """Call set_query as the user edits the query in the status line.
+        Enter keeps the query and escape clears it"""
+        self.dirty_all()
+        while True:
+            if self.dirty:
+                self.helper_chrome.set_status(
+                    f"{prompt}{query}  ({self.view.get_num_matches()} matches) "
+                    f"{SHORT_QUERY_USAGE}"
+                )
+                self.print_all()
+                self.reset_dirty()
+                self.move_cursor()
+                self.refresh_screen()
+            key = self.get_key()
+            if key == "ENTER":
+                break
+            if key == ESCAPE_KEY:
+                set_query("")
+                break
+            if key in BACKSPACE_KEYS:
+                query = query[:-1]
+                set_query(query)
+            elif len(key) == 1 and key.isprintable():
+                query += key
+                set_query(query)
+        if not self.view.get_num_matches():
+            # there is nothing to hover, so go back to everything
+            set_query("")
+        self.helper_chrome.clear_status()
+        self.dirty_all()
 
     def control(self) -> None:
         execute_keys = self.flags.get_execute_keys()
@@ -388,26 +456,49 @@ class Controller:
         self.print_all()
         self.reset_dirty()
         self.move_cursor()
+        if self.content.get_is_offscreen():
+            # getch only refreshes the root screen for us
+            self.refresh_screen()
         while True:
             if len(execute_keys) > 0:
                 in_key = execute_keys.pop(0)
             else:
                 in_key = self.get_key()
             self.check_resize()
-            self.process_input(in_key)
+            if in_key:
+                # no key means getch timed out to run the idle jobs,
+                # which only need what they drew pushed out
+                self.process_input(in_key)
             self.process_dirty()
             self.reset_dirty()
             self.move_cursor()
-            self.stdscr.refresh()
+            self.refresh_screen()
+
+    def refresh_screen(self) -> None:
+        """Push the changes of every region to the terminal in one go"""
+        # pads do not share memory with the root screen, so they have to
+        # be copied after it
+        self.stdscr.noutrefresh()
+        for region in [
+            self.content,
+            self.scroll_bar.region,
+            self.helper_chrome.side_region,
+            self.helper_chrome.bottom_region,
+        ]:
+            region.noutrefresh()
+        # nothing changed on the root screen since, but this puts the
+        # cursor back where we moved it
+        self.stdscr.noutrefresh()
+        self.stdscr.doupdate()
 
     def check_resize(self) -> None:
         max_y, max_x = self.get_screen_dimensions()
-        if max_y is not self.old_max_y or max_x is not self.old_max_x:
+        if max_y != self.old_max_y or max_x != self.old_max_x:
             # we resized so print all!
             self.print_all()
             self.reset_dirty()
             self.update_scroll_offset()
-            self.stdscr.refresh()
+            self.refresh_screen()
             logger.add_event("resize")
         self.old_max_y, self.old_max_x = self.get_screen_dimensions()
 
@@ -437,8 +528,13 @@ class Controller:
         ):
             # need to reassign now we have gone too far
             self.scroll_offset = new_offset
-        if old_offset is not self.scroll_offset:
-            self.dirty_all()
+        if old_offset != self.scroll_offset:
+            # only the lines moved, the chrome stays where it is
+            self.dirty_content()
+
+        # idle work for rows far from the new viewport is now stale
+        top_row = -self.scroll_offset
+        self.scheduler.set_viewport(top_row, top_row + window_height)
 
         # also update our scroll bar
         self.scroll_bar.calc_box_fractions()
@@ -452,18 +548,26 @@ class Controller:
         self.move_index(-page_height)
 
     def move_index(self, delta: int) -> None:
-        new_index = (self.hover_index + delta) % self.num_matches
+        if not self.view.get_num_matches():
+            return
+        new_index = self.view.get_nearest_match(self.hover_index, delta)
         self.jump_to_index(new_index)
         # also clear the description pane if necessary
         self.helper_chrome.clear_description_pane()
+        if self.file_details.prefetch_descriptions:
+            self.file_details.prefetch_file_infos()
 
     def jump_to_index(self, new_index: int) -> None:
         self.set_hover(self.hover_index, False)
         self.hover_index = new_index
         self.set_hover(self.hover_index, True)
         self.update_scroll_offset()
+        if self.file_details.preview_file:
+            self.print_chrome()
 
     def process_input(self, key: str) -> None:
+        if self.helper_chrome.clear_status():
+            self.dirty_all()
         if key in ["k", "UP"]:
             self.move_index(-1)
         elif key in ["j", "DOWN"]:
@@ -472,16 +576,18 @@ class Controller:
             self.toggle_x_mode()
         elif key == "c":
             self.begin_enter_command()
+        elif key in self.key_actions:
+            self.key_actions[key]()
         elif key in [" ", "NPAGE"]:
             self.page_down()
         elif key in ["b", "PPAGE"]:
             self.page_up()
         elif key in ["g", "HOME"]:
-            self.jump_to_index(0)
+            self.jump_to_index(self.view.match_indexes[0])
         elif (key == "G" and not self.mode == X_MODE) or key == "END":
-            self.jump_to_index(self.num_matches - 1)
+            self.jump_to_index(self.view.match_indexes[-1])
         elif key == "d":
-            self.describe_file()
+            self.file_details.describe_file()
         elif key == "f":
             self.toggle_select()
         elif key == "F":
@@ -489,6 +595,14 @@ class Controller:
             self.move_index(1)
         elif key == "A" and not self.mode == X_MODE:
             self.toggle_select_all()
+        elif key == "v":
+            self.toggle_mark()
+        elif key == "S" and not self.mode == X_MODE:
+            self.set_select_range(True)
+        elif key == "U" and not self.mode == X_MODE:
+            self.set_select_range(False)
+        elif key == "I" and not self.mode == X_MODE:
+            self.toggle_select_range()
         elif key == "ENTER" and (
             not self.flags.get_all_input() or self.flags.get_preset_command()
         ):
@@ -501,7 +615,9 @@ class Controller:
             # reuse before exiting the program
             self.get_paths_to_use()
             self.curses_api.exit()
-        elif self.mode == X_MODE and key in LABELS:
+        elif self.mode != X_MODE and key in FACET_KEYS:
+            self.toggle_listed_facet(int(key))
+        elif self.mode == X_MODE and key and key in LABELS:
             self.select_x_mode(key)
 
         for bound_key, command in self.key_bindings:
@@ -521,17 +637,11 @@ class Controller:
 
     def get_selected_paths(self) -> List[LineMatch]:
         return [
-            line_obj
-            for index, line_obj in enumerate(self.line_matches)
-            if line_obj.get_selected()
+            self.line_matches[index] for index in self.selection.get_selected_indexes()
         ]
 
     def get_hovered_paths(self) -> List[LineMatch]:
-        return [
-            line_obj
-            for index, line_obj in enumerate(self.line_matches)
-            if index == self.hover_index
-        ]
+        return [self.line_matches[self.hover_index]]
 
     def show_and_get_command(self) -> str:
         path_objs = self.get_paths_to_use()
@@ -590,7 +700,7 @@ class Controller:
         except curses.error:
             pass
 
-        self.stdscr.refresh()
+        self.refresh_screen()
         self.curses_api.echo()
         max_x = int(round(max_x - 1))
 
@@ -598,6 +708,7 @@ class Controller:
 
     def begin_enter_command(self) -> None:
         self.stdscr.erase()
+        self.content.hide()
         # first check if they are trying to enter command mode
         # but already have a command...
         if self.flags.get_preset_command():
@@ -605,8 +716,8 @@ class Controller:
             (min_x, min_y, _, max_y) = self.get_chrome_boundaries()
             y_start = (max_y + min_y) // 2 - 3
             self.print_provided_command_warning(y_start, min_x)
-            self.stdscr.refresh()
-            self.get_key()
+            self.refresh_screen()
+            self.wait_for_key()
             self.mode = SELECT_MODE
             self.dirty_all()
             return
@@ -624,12 +735,50 @@ class Controller:
             logger.add_event("exit_command_mode")
             return
         line_objs = self.get_paths_to_use()
-        output.exec_composed_command(command, line_objs)
+        output.exec_composed_command(command, line_objs, self.flags.get_parallel_jobs())
         sys.exit(0)
 
+    def show_and_get_pattern(self) -> str:
+        (min_x, min_y, max_x, max_y) = self.get_chrome_boundaries()
+        begin_height = (max_y + min_y) // 2 - 2
+        border_line = "=" * len(SHORT_PATTERN_PROMPT2)
+        prompt_line = "." * len(SHORT_PATTERN_PROMPT2)
+        prompt_lines = [
+            border_line,
+            SHORT_PATTERN_PROMPT,
+            SHORT_PATTERN_PROMPT2,
+            SHORT_COMMAND_PROMPT2,
+            border_line,
+            prompt_line,
+        ]
+        try:
+            for index, line in enumerate(prompt_lines):
+                self.color_printer.addstr(begin_height + index, min_x, line)
+            curses.curs_set(BLOCK_CURSOR)
+        except curses.error:
+            pass
+
+        self.refresh_screen()
+        self.curses_api.echo()
+        return self.stdscr.getstr(
+            begin_height + len(prompt_lines) - 1, min_x, max_x - min_x - 1
+        )
+
+    def begin_select_by_pattern(self) -> None:
+        self.stdscr.erase()
+        self.content.hide()
+        self.helper_chrome.output(self.mode)
+        logger.add_event("enter_pattern_prompt")
+
+        pattern = self.show_and_get_pattern()
+        self.curses_api.noecho()
+        if pattern:
+            self.select_by_pattern(pattern)
+        self.dirty_all()
+
     def execute_preconfigured_command(self, command: str) -> None:
         line_objs = self.get_paths_to_use()
-        output.exec_composed_command(command, line_objs)
+        output.exec_composed_command(command, line_objs, self.flags.get_parallel_jobs())
         sys.exit(0)
 
     def on_enter(self) -> None:
@@ -642,7 +791,9 @@ class Controller:
         # commands passed from the command line get used immediately
         preset_command = self.flags.get_preset_command()
         if len(preset_command) > 0:
-            output.exec_composed_command(preset_command, line_objs)
+            output.exec_composed_command(
+                preset_command, line_objs, self.flags.get_parallel_jobs()
+            )
         else:
             output.edit_files(line_objs)
 
@@ -651,11 +802,21 @@ class Controller:
     def reset_dirty(self) -> None:
         # reset all dirty state for our components
         self.dirty = False
+        self.content_dirty = False
+        self.content_stale = False
         self.dirty_indexes = []
 
     def dirty_line(self, index: int) -> None:
         self.dirty_indexes.append(index)
 
+    def dirty_content(self) -> None:
+        self.content_dirty = True
+
+    def dirty_drawn_lines(self) -> None:
+        """Every line we have drawn so far is out of date (e.g. after a
+        bulk selection change), but only redraw the ones in view"""
+        self.content_stale = True
+
     def dirty_all(self) -> None:
         self.dirty = True
 
@@ -663,41 +824,66 @@ class Controller:
         if self.dirty:
             self.print_all()
             return
-        (_min_x, min_y, _max_x, max_y) = self.get_chrome_boundaries()
-        did_clear_line = False
+        drawn_rows: Collection[int] = ()
+        if self.content_stale:
+            self.content.reset()
+            drawn_rows = self.print_lines()
+        elif self.content_dirty:
+            self.content.scroll()
+            drawn_rows = self.print_lines()
+        (max_y, _max_x) = self.get_content_dimensions()
         for index in self.dirty_indexes:
-            y_pos = min_y + index + self.get_scroll_offset()
-            if min_y <= y_pos < max_y:
-                did_clear_line = True
+            if not self.view.has_line(index):
+                continue
+            row = self.view.get_row(index)
+            y_pos = row + self.get_content_offset()
+            if 0 <= y_pos < max_y and row not in drawn_rows:
                 self.clear_line(y_pos)
-                self.line_objs[index].output(self.color_printer)
-        if did_clear_line and self.helper_chrome.get_is_sidebar_mode():
-            # now we need to output the chrome again since on wide
-            # monitors we will have cleared out a line of the chrome
-            self.helper_chrome.output(self.mode)
+                self.output_line(self.line_objs[index])
+        if self.scroll_bar.update():
+            # the quick select labels share their column with the scroll bar
+            self.print_x_mode()
 
     def clear_line(self, y_pos: int) -> None:
         """Clear a line of content, excluding the chrome"""
-        (min_x, _, _, _) = self.get_chrome_boundaries()
-        (_, max_x) = self.stdscr.getmaxyx()
-        chars_to_delete = range(min_x, max_x)
-        # we go in the **reverse** order since the original documentation
-        # of delchar (http://dell9.ma.utexas.edu/cgi-bin/man-cgi?delch+3)
-        # mentions that delchar actually moves all the characters to the right
-        # of the cursor
-        for x_pos in reversed(chars_to_delete):
-            self.stdscr.delch(y_pos, x_pos)
+        screen = self.content.printer.screen
+        screen.move(y_pos, 0)
+        screen.clrtoeol()
 
     def print_all(self) -> None:
         self.stdscr.erase()
-        self.print_lines()
+        # everything is drawn again, so the color pairs used before are
+        # free to be redefined (and the ones we use from now on are not)
+        self.color_printer.begin_frame()
+        self.print_content()
         self.print_scroll()
         self.print_x_mode()
         self.print_chrome()
 
-    def print_lines(self) -> None:
-        for line_obj in self.line_objs.values():
-            line_obj.output(self.color_printer)
+    def print_content(self) -> None:
+        (min_x, min_y, max_x, max_y) = self.get_chrome_boundaries()
+        self.content.set_geometry(min_y, min_x, max_y, max_x)
+        self.content.reset()
+        self.print_lines()
+
+    def print_lines(self) -> Collection[int]:
+        """Draw the lines needed to show the viewport, returning their
+        rows"""
+        top_row = -self.scroll_offset
+        rows = self.content.reveal(top_row, top_row + self.get_viewport_height())
+        num_rows = self.view.get_num_rows()
+        for row in rows:
+            if 0 <= row < num_rows:
+                self.output_line(self.line_objs[self.view.get_line_index(row)])
+        return rows
+
+    def output_line(self, line_obj: LineBase) -> None:
+        try:
+            line_obj.output(self.content.printer)
+        except curses.error:
+            # curses complains when we write the bottom right corner of
+            # a window since the cursor can not move past it
+            pass
 
     def print_scroll(self) -> None:
         self.scroll_bar.output()
@@ -730,9 +916,21 @@ class Controller:
         self.stdscr.move(y_pos, x_pos)
 
     def get_key(self) -> str:
+        # only block waiting for a key when there is no background
+        # work to do, otherwise do a slice of it whenever we time out
+        self.stdscr.timeout(self.scheduler.get_timeout())
         char_code = self.stdscr.getch()
+        if char_code == NO_KEY_CODE:
+            self.scheduler.run_slice()
         return CODE_TO_CHAR.get(char_code, "")
 
+    def wait_for_key(self) -> str:
+        """Keep running the idle jobs until a key is pressed"""
+        key = self.get_key()
+        while not key:
+            key = self.get_key()
+        return key
+
     def toggle_x_mode(self) -> None:
         self.mode = X_MODE if self.mode != X_MODE else SELECT_MODE
         self.print_all()
@@ -745,13 +943,13 @@ class Controller:
             for i in range(min_y, top_y + 1):
                 idx = i - min_y
                 if idx < len(LABELS):
-                    self.color_printer.addstr(i, 1, LABELS[idx])
+                    self.scroll_bar.region.printer.addstr(i, 1, LABELS[idx])
 
     def select_x_mode(self, key: str) -> None:
-        if LABELS.index(key) >= len(self.line_objs):
+        row = LABELS.index(key) - self.scroll_offset
+        if row >= self.view.get_num_rows():
             return
-        line_obj = self.line_objs[LABELS.index(key) - self.scroll_offset]
+        line_obj = self.line_objs[self.view.get_line_index(row)]
         if isinstance(line_obj, LineMatch):
-            line_match_index = self.line_matches.index(line_obj)
-            self.hover_index = line_match_index
+            self.hover_index = line_obj.match_index
             self.toggle_select()
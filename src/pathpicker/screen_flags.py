@@ -43,6 +43,15 @@ class ScreenFlags:
     def get_keep_open(self) -> bool:
         return bool(self.args.keep_open)
 
+    def get_pad_scrolling(self) -> bool:
+        return bool(self.args.pad_scrolling)
+
+    def get_context_lines(self) -> int:
+        return max(int(self.args.context), 0)
+
+    def get_parallel_jobs(self) -> int:
+        return max(int(self.args.parallel), 0)
+
     @staticmethod
     def get_arg_parser() -> argparse.ArgumentParser:
         parser = argparse.ArgumentParser(prog="fpp")
@@ -148,6 +157,33 @@ subshell, like a normal shell script.""",
             action="store_true",
             help="""Automatically select all available lines
 once the interactive editor has been entered.""",
+        )
+        parser.add_argument(
+            "--pad-scrolling",
+            default=False,
+            action="store_true",
+            help="""Draw the lines into an off screen curses pad
+a few thousand lines at a time, so scrolling only has to draw the lines
+that come into view. This makes scrolling through very long inputs
+(like the output of git log --stat) much faster.""",
+        )
+        parser.add_argument(
+            "--context",
+            default=0,
+            type=int,
+            help="""The number of lines to show around every match
+when only showing matches (toggled with [m]).""",
+        )
+        parser.add_argument(
+            "--parallel",
+            default=0,
+            type=int,
+            metavar="N",
+            help="""Run the command (see --command) once for every
+selected file, N at a time, instead of once over all of them. Each
+file's output is shown in one piece as it finishes, and the files the
+command failed on are listed at the end. The command is run with sh,
+so it cannot use your aliases.""",
         )
         return parser
 
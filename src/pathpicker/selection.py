@@ -0,0 +1,59 @@
+# Copyright (c) Facebook, Inc. and its affiliates.
+#
+# This source code is licensed under the MIT license found in the
+# LICENSE file in the root directory of this source tree.
+from typing import Iterable, List, Optional
+
+from pathpicker.interval_set import IntervalSet
+
+
+class SelectionModel:
+
+    """Keeps track of which matches are selected, by their index in the
+    list of matches. Selections are stored as ranges, so checking or
+    changing the selection of a whole range of matches is a binary
+    search, and bulk updates change the state once for all of their
+    indexes instead of going through every line"""
+
+    def __init__(self, selected: Iterable[int] = ()):
+        self.selected = IntervalSet.from_indexes(selected)
+        # the selected indexes in order, rebuilt lazily after a change
+        self.ordered: Optional[List[int]] = None
+
+    def is_selected(self, index: int) -> bool:
+        return index in self.selected
+
+    def get_count(self) -> int:
+        return len(self.selected)
+
+    def get_selected_indexes(self) -> List[int]:
+        if self.ordered is None:
+            self.ordered = list(self.selected)
+        return self.ordered
+
+    def set_selected(self, index: int, val: bool) -> None:
+        self.set_range(index, index + 1, val)
+
+    def set_range(self, start: int, end: int, val: bool) -> None:
+        if val:
+            self.selected.add_range(start, end)
+        else:
+            self.selected.remove_range(start, end)
+        self.ordered = None
+
+    def toggle_range(self, start: int, end: int) -> None:
+        self.selected.toggle_range(start, end)
+        self.ordered = None
+
+    def set_many(self, indexes: Iterable[int], val: bool) -> None:
+        others = IntervalSet.from_indexes(indexes)
+        if val:
+            self.selected = self.selected.combine(others, lambda a, b: a or b)
+        else:
+            self.selected = self.selected.combine(others, lambda a, b: a and not b)
+        self.ordered = None
+
+    def toggle_many(self, indexes: Iterable[int]) -> None:
+        others = IntervalSet.from_indexes(indexes)
+        self.selected = self.selected.combine(others, lambda a, b: a != b)
+        self.ordered = None
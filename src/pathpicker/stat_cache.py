@@ -0,0 +1,52 @@
+# Copyright (c) Facebook, Inc. and its affiliates.
+#
+# This source code is licensed under the MIT license found in the
+# LICENSE file in the root directory of this source tree.
+import os
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Iterable, List, Optional, Tuple
+
+# stat releases the GIL while it waits on the file system, so a few
+# threads hide most of the latency of slow (e.g. network) mounts
+STAT_WORKERS = 8
+
+
+def stat_or_none(path: str) -> Optional[os.stat_result]:
+    try:
+        return os.stat(path)
+    except (OSError, ValueError):
+        return None
+
+
+def stat_all(paths: List[str]) -> List[Tuple[str, Optional[os.stat_result]]]:
+    return [(path, stat_or_none(path)) for path in paths]
+
+
+class StatCache:
+
+    """The stat of every path we have looked at (None for the ones that
+    do not exist), so each file is only stat'd once per run"""
+
+    def __init__(self) -> None:
+        self.stats: Dict[str, Optional[os.stat_result]] = {}
+
+    def get(self, path: str) -> Optional[os.stat_result]:
+        if path not in self.stats:
+            self.stats[path] = stat_or_none(path)
+        return self.stats[path]
+
+    def get_all(self, paths: List[str]) -> List[Optional[os.stat_result]]:
+        self.fetch(paths)
+        return list(map(self.stats.__getitem__, paths))
+
+    def fetch(self, paths: Iterable[str]) -> None:
+        """Stat the paths we have not yet, concurrently. Every worker
+        takes a whole slice of the paths, since a future per path costs
+        more than the stat itself on a local disk"""
+        missing = [path for path in dict.fromkeys(paths) if path not in self.stats]
+        if not missing:
+            return
+        slices = [missing[start::STAT_WORKERS] for start in range(STAT_WORKERS)]
+        with ThreadPoolExecutor(STAT_WORKERS) as executor:
+            for stats in executor.map(stat_all, slices):
+                self.stats.update(stats)
@@ -10,6 +10,10 @@ PICKLE_FILE = ".pickle"
 SELECTION_PICKLE = ".selection.pickle"
 OUTPUT_FILE = ".fpp.sh"
 LOGGER_FILE = ".fpp.log"
+FILE_LIST = ".fpp.files"
+QUICKFIX_FILE = ".fpp.quickfix"
+ARGS_FILE = ".fpp.args"
+ACTION_FILE = ".fpp.action"
 
 
 def assert_dir_created() -> None:
@@ -43,6 +47,26 @@ def get_logger_file_path() -> str:
     return os.path.expanduser(os.path.join(FPP_DIR, LOGGER_FILE))
 
 
+def get_file_list_path() -> str:
+    assert_dir_created()
+    return os.path.expanduser(os.path.join(FPP_DIR, FILE_LIST))
+
+
+def get_quickfix_file_path() -> str:
+    assert_dir_created()
+    return os.path.expanduser(os.path.join(FPP_DIR, QUICKFIX_FILE))
+
+
+def get_args_file_path() -> str:
+    assert_dir_created()
+    return os.path.expanduser(os.path.join(FPP_DIR, ARGS_FILE))
+
+
+def get_action_file_path() -> str:
+    assert_dir_created()
+    return os.path.expanduser(os.path.join(FPP_DIR, ACTION_FILE))
+
+
 def get_all_state_files() -> List[str]:
     # keep this update to date! We do not include
     # the script output path since that gets cleaned automatically
@@ -51,4 +75,8 @@ def get_all_state_files() -> List[str]:
         get_selection_file_path(),
         get_logger_file_path(),
         get_script_output_file_path(),
+        get_file_list_path(),
+        get_quickfix_file_path(),
+        get_args_file_path(),
+        get_action_file_path(),
     ]
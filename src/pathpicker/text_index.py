@@ -0,0 +1,115 @@
+# Copyright (c) Facebook, Inc. and its affiliates.
+#
+# This source code is licensed under the MIT license found in the
+# LICENSE file in the root directory of this source tree.
+import operator
+from array import array
+from bisect import bisect_left
+from itertools import compress, repeat
+from typing import Callable, Dict, List, Optional, Sequence, Set
+
+TRIGRAM_LENGTH = 3
+# how many lines we index per call, small enough to fit in the time
+# slice of the idle scheduler
+INDEX_CHUNK_LINES = 1000
+
+EMPTY_POSTINGS = array("i")
+
+
+def intersect_sorted(small: Sequence[int], large: Sequence[int]) -> List[int]:
+    """The items of small that are in large, both sorted, looking each of
+    them up in large rather than going through all of it"""
+    found = []
+    for item in small:
+        position = bisect_left(large, item)
+        if position < len(large) and large[position] == item:
+            found.append(item)
+    return found
+
+
+def get_trigrams(text: str) -> Set[str]:
+    return {
+        text[start : start + TRIGRAM_LENGTH]
+        for start in range(len(text) - TRIGRAM_LENGTH + 1)
+    }
+
+
+class TrigramIndex:
+
+    """A case insensitive substring index over every line of input.
+
+    For every three character substring we keep the (sorted) indexes of
+    the lines it appears in, so we only have to look at the lines that
+    contain the rarest trigram of a query. The index is built a chunk
+    at a time in the background, and lines we have not gotten to yet
+    are searched directly"""
+
+    def __init__(self, num_lines: int, get_text: Callable[[int], str]):
+        self.num_lines = num_lines
+        self.get_text = get_text
+        # the lowercased text of the lines indexed so far
+        self.texts: List[str] = []
+        self.postings: Dict[str, "array[int]"] = {}
+
+    def get_num_indexed(self) -> int:
+        return len(self.texts)
+
+    def index_chunk(self) -> bool:
+        """Index the next chunk of lines, returning whether there are
+        lines left to index"""
+        start = len(self.texts)
+        for line_index in range(start, min(start + INDEX_CHUNK_LINES, self.num_lines)):
+            text = self.get_text(line_index).lower()
+            self.texts.append(text)
+            for trigram in get_trigrams(text):
+                postings = self.postings.get(trigram)
+                if postings is None:
+                    postings = self.postings[trigram] = array("i")
+                postings.append(line_index)
+        return len(self.texts) < self.num_lines
+
+    def search(self, query: str, within: Optional[Sequence[int]] = None) -> List[int]:
+        """The sorted indexes of the lines that contain the query.
+        Within can be a sorted superset of the result (e.g. the result
+        for a shorter query), which we search instead if it is smaller
+        than what the index gives us"""
+        query = query.lower()
+        num_indexed = len(self.texts)
+        indexed: Sequence[int] = range(num_indexed)
+        unindexed: Sequence[int] = range(num_indexed, self.num_lines)
+        restricted = within is not None and len(within) < self.num_lines
+        if within is not None and restricted:
+            split = bisect_left(within, num_indexed)
+            (indexed, unindexed) = (within[:split], within[split:])
+        # whether the candidates are known to contain the query
+        exact = False
+        if len(query) >= TRIGRAM_LENGTH:
+            rarest = min(
+                (
+                    self.postings.get(trigram, EMPTY_POSTINGS)
+                    for trigram in get_trigrams(query)
+                ),
+                key=len,
+            )
+            if len(rarest) <= len(indexed):
+                # the lines outside of within are still ruled out
+                indexed = intersect_sorted(rarest, indexed) if restricted else rarest
+                # the lines with the trigram are exactly the ones we want
+                exact = len(query) == TRIGRAM_LENGTH
+        found: List[int]
+        if exact:
+            found = list(indexed)
+        else:
+            # checking the candidates is done with map and compress to
+            # keep the loop over (potentially) every line in C
+            texts = (
+                self.texts
+                if indexed == range(num_indexed)
+                else map(self.texts.__getitem__, indexed)
+            )
+            found = list(
+                compress(indexed, map(operator.contains, texts, repeat(query)))
+            )
+        return found + [
+            index for index in unindexed if query in self.get_text(index).lower()
+        ]
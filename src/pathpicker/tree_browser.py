@@ -0,0 +1,183 @@
+# Copyright (c) Facebook, Inc. and its affiliates.
+#
+# This source code is licensed under the MIT license found in the
+# LICENSE file in the root directory of this source tree.
+import curses
+from typing import TYPE_CHECKING, Dict, List, Optional
+
+from pathpicker import logger
+from pathpicker.char_code_mapping import ESCAPE_KEY
+from pathpicker.path_tree import PathTree, TreeNode
+
+if TYPE_CHECKING:
+    from pathpicker.screen_control import Controller
+
+SHORT_TREE_USAGE = "[l|h] open/close, [f|F] select, [enter] go to match, [t|esc] back"
+TREE_EXIT_KEYS = ["t", "q", ESCAPE_KEY]
+INDENT = "  "
+
+
+class TreeBrowser:
+
+    """Shows the matched paths as a tree of directories that can be
+    opened and closed, with the number of matches under each of them.
+    Selecting a directory selects (or unselects) every match under it.
+    The tree is kept between runs so directories stay open"""
+
+    def __init__(self, controller: "Controller", tree: PathTree):
+        self.controller = controller
+        self.tree = tree
+        self.rows: List[TreeNode] = []
+        self.cursor = 0
+        self.top = 0
+        # how many matches under a node are selected, for the nodes we
+        # have drawn since the selection last changed
+        self.selected_counts: Dict[TreeNode, int] = {}
+
+    def get_selected_count(self, node: TreeNode) -> int:
+        if node not in self.selected_counts:
+            selection = self.controller.selection
+            self.selected_counts[node] = (
+                sum(map(selection.is_selected, self.tree.get_match_indexes(node)))
+                if selection.get_count()
+                else 0
+            )
+        return self.selected_counts[node]
+
+    def get_row_text(self, node: TreeNode) -> str:
+        selected = self.get_selected_count(node)
+        if selected == 0:
+            mark = "[ ]"
+        elif selected == node.count:
+            mark = "[x]"
+        else:
+            mark = "[~]"
+        if node.is_dir():
+            marker = "-" if node.expanded else "+"
+        else:
+            marker = " "
+        count = f" ({node.count})" if node.is_dir() or node.count > 1 else ""
+        return f"{INDENT * (node.depth - 1)}{mark} {marker} {node.name}{count}"
+
+    def get_row_attributes(self, node: TreeNode, hovered: bool) -> Optional[int]:
+        selected = self.get_selected_count(node) == node.count
+        printer = self.controller.color_printer
+        if hovered:
+            background = curses.COLOR_RED if selected else curses.COLOR_BLUE
+            return printer.get_attributes(curses.COLOR_WHITE, background, curses.A_BOLD)
+        if selected:
+            return printer.get_attributes(
+                curses.COLOR_WHITE, curses.COLOR_GREEN, curses.A_BOLD
+            )
+        return None
+
+    def update_rows(self) -> None:
+        node = self.rows[self.cursor] if self.rows else None
+        self.rows = self.tree.get_visible_nodes()
+        # stay on the same node, or on its closest open directory
+        while node is not None and node.parent is not None:
+            if node in self.rows:
+                self.cursor = self.rows.index(node)
+                return
+            node = node.parent
+        self.cursor = min(self.cursor, max(len(self.rows) - 1, 0))
+
+    def draw(self) -> None:
+        controller = self.controller
+        controller.stdscr.erase()
+        controller.content.hide()
+        (min_x, min_y, max_x, max_y) = controller.get_chrome_boundaries()
+        height = max_y - min_y
+        # keep the cursor in view
+        self.top = min(max(self.top, self.cursor - height + 1), self.cursor)
+        for row in range(self.top, min(self.top + height, len(self.rows))):
+            node = self.rows[row]
+            try:
+                controller.color_printer.addstr(
+                    min_y + row - self.top,
+                    min_x,
+                    self.get_row_text(node)[: max_x - min_x],
+                    self.get_row_attributes(node, row == self.cursor),
+                )
+            except curses.error:
+                pass
+        controller.print_chrome()
+        controller.stdscr.move(min_y + self.cursor - self.top, min_x)
+        controller.refresh_screen()
+
+    def set_expanded(self, node: TreeNode, expanded: bool) -> None:
+        if node.is_dir() and node.expanded != expanded:
+            node.expanded = expanded
+            self.update_rows()
+            logger.add_event("expand_tree_node" if expanded else "collapse_tree_node")
+
+    def collapse_or_go_up(self, node: TreeNode) -> None:
+        if node.is_dir() and node.expanded:
+            self.set_expanded(node, False)
+        elif node.parent is not None and node.parent.parent is not None:
+            self.cursor = self.rows.index(node.parent)
+
+    def toggle_select(self, node: TreeNode) -> None:
+        select = self.get_selected_count(node) < node.count
+        self.controller.selection.set_many(self.tree.get_match_indexes(node), select)
+        self.controller.dirty_drawn_lines()
+        self.selected_counts = {}
+        logger.add_event("select_tree_node", node.count)
+
+    def move_cursor(self, delta: int) -> None:
+        self.cursor = min(max(self.cursor + delta, 0), len(self.rows) - 1)
+
+    def process_input(self, key: str) -> bool:
+        """Handle a key, returning whether to leave the tree"""
+        node = self.rows[self.cursor]
+        if key in TREE_EXIT_KEYS:
+            return True
+        if key == "ENTER":
+            if not node.is_dir():
+                return True
+            self.set_expanded(node, not node.expanded)
+        elif key in ["j", "DOWN"]:
+            self.move_cursor(1)
+        elif key in ["k", "UP"]:
+            self.move_cursor(-1)
+        elif key in ["l", "RIGHT"]:
+            self.set_expanded(node, True)
+        elif key in ["h", "LEFT"]:
+            self.collapse_or_go_up(node)
+        elif key in ["g", "HOME"]:
+            self.cursor = 0
+        elif key in ["G", "END"]:
+            self.cursor = len(self.rows) - 1
+        elif key == "f":
+            self.toggle_select(node)
+        elif key == "F":
+            self.toggle_select(node)
+            self.move_cursor(1)
+        return False
+
+    def run(self) -> None:
+        """Browse the tree until the user goes back, then hover the
+        first match under the node they were on"""
+        logger.add_event("enter_tree_mode")
+        controller = self.controller
+        # the selection may have changed since we last ran
+        self.selected_counts = {}
+        self.update_rows()
+        controller.helper_chrome.set_status(SHORT_TREE_USAGE)
+        (dirty, key) = (True, "")
+        while self.rows:
+            if dirty:
+                self.draw()
+            key = controller.get_key()
+            dirty = key != ""
+            if self.process_input(key):
+                break
+        controller.helper_chrome.clear_status()
+        if self.rows:
+            match_index = min(self.tree.get_match_indexes(self.rows[self.cursor]))
+            if controller.view.has_match(match_index):
+                controller.jump_to_index(match_index)
+        controller.dirty_all()
+        if key == "q":
+            # quitting works the same as from the list of lines
+            controller.process_input(key)
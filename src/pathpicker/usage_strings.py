@@ -73,6 +73,22 @@ them via command mode:
     * [c] enter command mode
 """
 
+USAGE_MORE_KEYS = """
+To narrow down, select or look at the files:
+
+    * [v] set (or clear) a mark at the cursor
+    * [S|U|I] select/unselect/invert to the mark
+    * [p] select (or !unselect) by glob or re:
+    * [/] filter the lines as you type
+    * [z] fuzzy find paths as you type
+    * [m] only show matches (and --context)
+    * [t] browse (and select) by directory
+    * [u|e] one row per file, [e]xpand its hits
+    * [1-9] toggle the facets listed below
+    * [o] sort by path, mtime or size
+    * [w] preview the file in the sidebar
+"""
+
 USAGE_COMMAND_HEADER = """
 == Command Mode ==
 
@@ -125,6 +141,20 @@ with "vim" as a last resort.
 The $FPP_DISABLE_SPLIT environment variable will disable splitting
 files into panes for vim clients (aka sequential editing).
 
+More than $FPP_MAX_SPLITS files (10 by default) are opened as a
+quickfix list in vim and neovim (vim -q), and in grep-mode in emacs,
+rather than in a split or tab each, unless $FPP_DISABLE_SPLIT is set.
+
+Set the $FPP_DIRECT_EXEC environment variable to run the editor, and
+commands that are a program on your $PATH with plain arguments, straight
+away rather than in an interactive shell, which saves loading your
+shell's startup files. Your aliases and shell functions (like an alias
+of vim to nvim) are then not used for those commands.
+
+Set the $FPP_PREFETCH environment variable to have the selected files
+read into the page cache (with posix_fadvise) while PathPicker exits,
+so an editor opens many large files on a cold disk without stalling.
+
 ~ Directory ~
 
 PathPicker saves state files for use when starting up, including the
@@ -135,7 +165,8 @@ PathPicker to use another directory.
 ~ Colors ~
 
 FPP will understand colors if the piped input uses them. In general, most
-tools do not unless requested to do so.
+tools do not unless requested to do so. 256-color and 24-bit colors are
+mapped onto the closest colors your terminal supports.
 
 For git, try `git config --global color.ui always` or use the command
 line option --color.
@@ -163,6 +194,7 @@ USAGE_STR = (
     USAGE_INTRO
     + USAGE_PAGE_HEADER
     + USAGE_PAGE
+    + USAGE_MORE_KEYS
     + USAGE_COMMAND_HEADER
     + USAGE_COMMAND
     + USAGE_CONFIGURATION
@@ -187,6 +219,7 @@ MANPAGE_STR = "\n\n".join(
         INTRO,
         USAGE_PAGE_HEADER,
         USAGE_PAGE,
+        USAGE_MORE_KEYS,
         USAGE_COMMAND_HEADER,
         USAGE_COMMAND,
         USAGE_CONFIGURATION,
@@ -0,0 +1,120 @@
+# Copyright (c) Facebook, Inc. and its affiliates.
+#
+# This source code is licensed under the MIT license found in the
+# LICENSE file in the root directory of this source tree.
+from bisect import bisect_left
+from typing import Callable, Optional, Sequence, Union, overload
+
+
+class LineView:
+    """The lines we show and the order we show them in. Rows are
+    positions in the view, so when every line is shown a line is drawn
+    on the row of its own index. Both the lines and the matches in view
+    are sorted sequences (a range when nothing is hidden), so mapping a
+    line to its row or finding the next visible match is a binary search
+    and switching views does not touch every line"""
+
+    def __init__(self, line_indexes: Sequence[int], match_indexes: Sequence[int]):
+        self.line_indexes = line_indexes
+        self.match_indexes = match_indexes
+
+    @staticmethod
+    def show_all(num_lines: int, num_matches: int) -> "LineView":
+        return LineView(range(num_lines), range(num_matches))
+
+    def get_num_rows(self) -> int:
+        return len(self.line_indexes)
+
+    def get_line_index(self, row: int) -> int:
+        return self.line_indexes[row]
+
+    def get_row(self, line_index: int) -> int:
+        """The row of the line, or of the first line after it if it is
+        not in view"""
+        return bisect_left(self.line_indexes, line_index)
+
+    def has_line(self, line_index: int) -> bool:
+        row = self.get_row(line_index)
+        return row < len(self.line_indexes) and self.line_indexes[row] == line_index
+
+    def get_num_matches(self) -> int:
+        return len(self.match_indexes)
+
+    def get_match_position(self, match_index: int) -> int:
+        """The position of the match among the matches in view, or of
+        the first match after it if it is not in view"""
+        return bisect_left(self.match_indexes, match_index)
+
+    def has_match(self, match_index: int) -> bool:
+        position = self.get_match_position(match_index)
+        return (
+            position < len(self.match_indexes)
+            and self.match_indexes[position] == match_index
+        )
+
+    def get_nearest_match(self, match_index: int, delta: int = 0) -> int:
+        """The match delta matches away from the given one (wrapping
+        around), counting from the first match after it if it is not in
+        view. There has to be a match in view"""
+        position = self.get_match_position(match_index)
+        if delta > 0 and not self.has_match(match_index):
+            # we are already past the match we were on
+            delta -= 1
+        return self.match_indexes[(position + delta) % len(self.match_indexes)]
+
+
+class RankedLineView(LineView):
+    """A view that shows lines in an order of its own (e.g. best match
+    first), so rows are looked up instead of searched for. Lines and
+    matches that are not in view sort before everything else"""
+
+    def __init__(self, line_indexes: Sequence[int], match_indexes: Sequence[int]):
+        super().__init__(line_indexes, match_indexes)
+        self.rows = {line_index: row for row, line_index in enumerate(line_indexes)}
+        self.match_positions = {
+            match_index: position for position, match_index in enumerate(match_indexes)
+        }
+
+    def get_row(self, line_index: int) -> int:
+        return self.rows.get(line_index, 0)
+
+    def has_line(self, line_index: int) -> bool:
+        return line_index in self.rows
+
+    def get_match_position(self, match_index: int) -> int:
+        return self.match_positions.get(match_index, 0)
+
+    def has_match(self, match_index: int) -> bool:
+        return match_index in self.match_positions
+
+
+class MatchLineIndexes(Sequence[int]):
+    """The (sorted) indexes of the lines of some (sorted) matches,
+    looked up as they are needed, so a view of a big list of matches
+    can be made without going through all of them"""
+
+    def __init__(
+        self, match_indexes: Sequence[int], get_line_index: Callable[[int], int]
+    ):
+        self.match_indexes = match_indexes
+        self.get_line_index = get_line_index
+
+    def __len__(self) -> int:
+        return len(self.match_indexes)
+
+    @overload
+    def __getitem__(self, position: int) -> int:
+        pass
+
+    @overload
+    def __getitem__(
+        self, position: "slice[Optional[int], Optional[int], Optional[int]]"
+    ) -> Sequence[int]:
+        pass
+
+    def __getitem__(
+        self, position: Union[int, "slice[Optional[int], Optional[int], Optional[int]]"]
+    ) -> Union[int, Sequence[int]]:
+        if isinstance(position, slice):
+            return list(map(self.get_line_index, self.match_indexes[position]))
+        return self.get_line_index(self.match_indexes[position])
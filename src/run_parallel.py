@@ -0,0 +1,10 @@
+# Copyright (c) Facebook, Inc. and its affiliates.
+#
+# This source code is licensed under the MIT license found in the
+# LICENSE file in the root directory of this source tree.
+import sys
+
+from pathpicker import parallel
+
+if __name__ == "__main__":
+    sys.exit(parallel.main(sys.argv))
@@ -37,6 +37,9 @@ class CursesForTest(CursesApiBase):
         # pretend we are on 256 color
         return 256
 
+    def get_colors(self) -> int:
+        return 256
+
     def exit(self) -> None:
         raise StopIteration("stopping program")
 
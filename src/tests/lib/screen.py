@@ -6,7 +6,8 @@ from copy import copy
 from typing import Dict, List, NewType, Optional, Tuple
 
 from pathpicker.char_code_mapping import CHAR_TO_CODE
-from pathpicker.screen import ScreenBase
+from pathpicker.screen import PadBase, ScreenBase
+from pathpicker.screen_control import NO_KEY_CODE
 
 ATTRIBUTE_SYMBOL_MAPPING: Dict[int, str] = {
     0: " ",
@@ -41,6 +42,7 @@ class ScreenForTest(ScreenBase):
         self.output = ScreenType({})
         self.past_screens: List[ScreenType] = []
         self.char_inputs = char_inputs
+        self.cursor = (0, 0)
         self.erase()
         self.current_attribute = 0
 
@@ -52,6 +54,20 @@ class ScreenForTest(ScreenBase):
             # we have an old screen, so add it
             self.past_screens.append(copy(self.output))
 
+    def noutrefresh(self) -> None:
+        pass
+
+    def doupdate(self) -> None:
+        self.refresh()
+
+    def derwin(
+        self, num_lines: int, num_cols: int, begin_y: int, begin_x: int
+    ) -> ScreenBase:
+        return WindowForTest(self, num_lines, num_cols, begin_y, begin_x)
+
+    def newpad(self, num_lines: int, num_cols: int) -> PadBase:
+        return PadForTest(self, num_lines, num_cols)
+
     def contains_content(self, screen: ScreenType) -> bool:
         for _coord, pair in screen.items():
             (char, _attr) = pair
@@ -61,13 +77,19 @@ class ScreenForTest(ScreenBase):
 
     def erase(self) -> None:
         self.output = ScreenType({})
-        for x_pos in range(self.max_x):
-            for y_pos in range(self.max_y):
+        self.clear_square(0, 0, self.max_y, self.max_x)
+
+    def clear_square(
+        self, top_y: int, left_x: int, bottom_y: int, right_x: int
+    ) -> None:
+        """Clear the output, NOT by printing spaces"""
+        for x_pos in range(left_x, right_x):
+            for y_pos in range(top_y, bottom_y):
                 coord = (x_pos, y_pos)
                 self.output[coord] = ("", 1)
 
-    def move(self, _y_pos: int, _x_pos: int) -> None:
-        pass
+    def move(self, y_pos: int, x_pos: int) -> None:
+        self.cursor = (y_pos, x_pos)
 
     def attrset(self, attr: int) -> None:
         self.current_attribute = attr
@@ -81,13 +103,17 @@ class ScreenForTest(ScreenBase):
             coord = (x_pos + delta_x, y_pos)
             self.output[coord] = (value, self.current_attribute)
 
-    def delch(self, y_pos: int, x_pos: int) -> None:
-        """Delete a character. We implement this by removing the output,
-        NOT by printing a space"""
-        self.output[(x_pos, y_pos)] = ("", 1)
+    def clrtoeol(self) -> None:
+        y_pos, x_pos = self.cursor
+        self.clear_square(y_pos, x_pos, y_pos + 1, self.max_x)
+
+    def timeout(self, _delay: int) -> None:
+        pass
 
     def getch(self) -> int:
-        return CHAR_TO_CODE[self.char_inputs.pop(0)]
+        char = self.char_inputs.pop(0)
+        # an empty input stands for getch timing out with no key
+        return CHAR_TO_CODE[char] if char else NO_KEY_CODE
 
     def getstr(self, _y: int, _x: int, _max_len: int) -> str:
         # TODO -- enable editing this
@@ -161,3 +187,116 @@ class ScreenForTest(ScreenBase):
         if symbol is None:
             raise ValueError(f"{code} not mapped")
         return symbol
+
+
+class WindowForTest(ScreenBase):
+    """A subwindow of a ScreenForTest which draws into the same output,
+    offset by its position"""
+
+    def __init__(
+        self,
+        screen: ScreenForTest,
+        num_lines: int,
+        num_cols: int,
+        begin_y: int,
+        begin_x: int,
+    ):
+        self.screen = screen
+        self.num_lines = num_lines
+        self.num_cols = num_cols
+        self.begin_y = begin_y
+        self.begin_x = begin_x
+        self.cursor = (0, 0)
+
+    def getmaxyx(self) -> Tuple[int, int]:
+        return self.num_lines, self.num_cols
+
+    def refresh(self) -> None:
+        self.screen.refresh()
+
+    def noutrefresh(self) -> None:
+        pass
+
+    def doupdate(self) -> None:
+        self.screen.doupdate()
+
+    def derwin(
+        self, num_lines: int, num_cols: int, begin_y: int, begin_x: int
+    ) -> ScreenBase:
+        return WindowForTest(
+            self.screen,
+            num_lines,
+            num_cols,
+            self.begin_y + begin_y,
+            self.begin_x + begin_x,
+        )
+
+    def newpad(self, num_lines: int, num_cols: int) -> PadBase:
+        return self.screen.newpad(num_lines, num_cols)
+
+    def erase(self) -> None:
+        self.screen.clear_square(
+            self.begin_y,
+            self.begin_x,
+            self.begin_y + self.num_lines,
+            self.begin_x + self.num_cols,
+        )
+
+    def move(self, y_pos: int, x_pos: int) -> None:
+        self.cursor = (y_pos, x_pos)
+
+    def addstr(
+        self, y_pos: int, x_pos: int, string: str, attr: Optional[int] = None
+    ) -> None:
+        self.screen.addstr(self.begin_y + y_pos, self.begin_x + x_pos, string, attr)
+
+    def clrtoeol(self) -> None:
+        y_pos, x_pos = self.cursor
+        self.screen.clear_square(
+            self.begin_y + y_pos,
+            self.begin_x + x_pos,
+            self.begin_y + y_pos + 1,
+            self.begin_x + self.num_cols,
+        )
+
+    def timeout(self, delay: int) -> None:
+        self.screen.timeout(delay)
+
+    def getch(self) -> int:
+        return self.screen.getch()
+
+    def getstr(self, y_pos: int, x_pos: int, max_len: int) -> str:
+        return self.screen.getstr(self.begin_y + y_pos, self.begin_x + x_pos, max_len)
+
+
+class PadForTest(ScreenForTest, PadBase):
+    """An off screen pad, parts of which are copied onto the output of
+    a ScreenForTest when refreshed"""
+
+    def __init__(self, screen: ScreenForTest, num_lines: int, num_cols: int):
+        self.screen = screen
+        super().__init__([], num_cols, num_lines)
+
+    def erase(self) -> None:
+        # pads are big, so only keep track of what was drawn
+        self.output = ScreenType({})
+
+    def noutrefresh_region(
+        self,
+        pad_min_y: int,
+        pad_min_x: int,
+        min_y: int,
+        min_x: int,
+        max_y: int,
+        max_x: int,
+    ) -> None:
+        for y_pos in range(min_y, max_y + 1):
+            for x_pos in range(min_x, max_x + 1):
+                coord = (x_pos - min_x + pad_min_x, y_pos - min_y + pad_min_y)
+                self.screen.output[(x_pos, y_pos)] = self.get_cell(coord)
+
+    def get_cell(self, coord: Tuple[int, int]) -> Tuple[str, int]:
+        # we never erased the whole pad, so unset cells are empty
+        if coord not in self.output:  # pylint: disable=unsupported-membership-test
+            return ("", 1)
+        return self.output[coord]  # pylint: disable=unsubscriptable-object
@@ -0,0 +1,100 @@
+# Copyright (c) Facebook, Inc. and its affiliates.
+#
+# This source code is licensed under the MIT license found in the
+# LICENSE file in the root directory of this source tree.
+import curses
+import unittest
+
+from pathpicker import palette
+from pathpicker.color_printer import ColorPrinter
+from pathpicker.formatted_text import FormattedText
+from pathpicker.regions import Region
+from tests.lib.curses_api import CursesForTest
+from tests.lib.screen import ScreenForTest
+
+
+class CursesWithFewColorsForTest(CursesForTest):
+    def get_color_pairs(self) -> int:
+        # the two hardcoded pairs plus room for two more
+        return 4
+
+    def get_colors(self) -> int:
+        return 8
+
+
+class TestColorPrinter(unittest.TestCase):
+    def setUp(self) -> None:
+        self.curses_api = CursesWithFewColorsForTest()
+        self.printer = ColorPrinter(ScreenForTest([], 10, 10), self.curses_api)
+
+    def test_reuses_least_recently_used_pair(self) -> None:
+        self.printer.begin_frame()
+        self.assertEqual(self.printer.get_attributes(1, -1, 0), 2)
+        self.assertEqual(self.printer.get_attributes(2, -1, 0), 3)
+        self.assertEqual(self.printer.get_attributes(1, -1, 0), 2)
+        # everything is in use this frame, so we fall back to the default
+        self.assertEqual(
+            self.printer.get_attributes(3, -1, 0), ColorPrinter.DEFAULT_COLOR_INDEX
+        )
+
+        self.printer.begin_frame()
+        self.assertEqual(self.printer.get_attributes(1, -1, 0), 2)
+        # pair 3 (color 2) was not used this frame and is least recent
+        self.assertEqual(self.printer.get_attributes(3, -1, 0), 3)
+        self.assertEqual(self.curses_api.color_pairs[3], (3, -1))
+        self.assertEqual(self.printer.get_attributes(1, -1, 0), 2)
+
+    def test_region_reset_keeps_pairs_of_the_frame(self) -> None:
+        region = Region(self.printer)
+        region.set_geometry(0, 0, 5, 10)
+        self.printer.begin_frame()
+        # like the chrome drawing before the content is redrawn
+        self.assertEqual(self.printer.get_attributes(1, -1, 0), 2)
+        self.assertEqual(region.printer.get_attributes(2, -1, 0), 3)
+        region.reset()
+        # both pairs may still be on screen, so neither is redefined
+        self.assertEqual(
+            region.printer.get_attributes(3, -1, 0), ColorPrinter.DEFAULT_COLOR_INDEX
+        )
+        self.assertEqual(self.curses_api.color_pairs[2], (1, -1))
+
+    def test_quantizes_to_terminal_palette(self) -> None:
+        self.printer.begin_frame()
+        # bright red is displayed as red on an 8 color terminal
+        self.printer.get_attributes(9, -1, curses.A_BOLD)
+        self.assertEqual(self.curses_api.color_pairs[2], (1, -1))
+        # 256-color pure blue becomes blue
+        self.printer.get_attributes(palette.get_xterm_index_for_rgb(0, 0, 255), 0, 0)
+        self.assertEqual(self.curses_api.color_pairs[3], (4, 0))
+
+
+class TestParseFormatting(unittest.TestCase):
+    def test_basic_colors(self) -> None:
+        self.assertEqual(
+            FormattedText.parse_formatting("1;32;44"), (2, 4, curses.A_BOLD)
+        )
+        self.assertEqual(FormattedText.parse_formatting("91;103"), (9, 11, 0))
+
+    def test_256_colors(self) -> None:
+        self.assertEqual(FormattedText.parse_formatting("38;5;208"), (208, -1, 0))
+        self.assertEqual(
+            FormattedText.parse_formatting("4;38;5;17;48;5;255"),
+            (17, 255, curses.A_UNDERLINE),
+        )
+
+    def test_true_colors(self) -> None:
+        self.assertEqual(
+            FormattedText.parse_formatting("38;2;255;0;0;48;2;128;128;128"),
+            (196, 244, 0),
+        )
+        self.assertEqual(
+            FormattedText.parse_formatting("38;2;0;0;0;1"), (16, -1, curses.A_BOLD)
+        )
+
+    def test_malformed_extended_colors(self) -> None:
+        self.assertEqual(FormattedText.parse_formatting("31;38;5"), (1, -1, 0))
+        self.assertEqual(FormattedText.parse_formatting("48;7;1"), (-1, -1, 0))
+
+
+if __name__ == "__main__":
+    unittest.main()
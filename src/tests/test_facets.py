@@ -0,0 +1,72 @@
+# Copyright (c) Facebook, Inc. and its affiliates.
+#
+# This source code is licensed under the MIT license found in the
+# LICENSE file in the root directory of this source tree.
+import unittest
+
+from pathpicker.facets import (
+    EXTENSION,
+    ROOT,
+    TOP_DIR,
+    Facet,
+    FacetIndex,
+    get_facet_label,
+    get_facets,
+)
+
+
+class TestFacets(unittest.TestCase):
+    def test_get_facets(self) -> None:
+        self.assertEqual(
+            get_facets("./src/pathpicker/parse.py"),
+            (Facet(ROOT, "./"), Facet(TOP_DIR, "src/"), Facet(EXTENSION, ".py")),
+        )
+        self.assertEqual(
+            get_facets("/etc/hosts"),
+            (Facet(ROOT, "/"), Facet(TOP_DIR, "etc/"), Facet(EXTENSION, "")),
+        )
+        self.assertEqual(get_facets("../README.md")[1], Facet(TOP_DIR, ""))
+
+    def test_labels(self) -> None:
+        self.assertEqual(get_facet_label(Facet(EXTENSION, ".py")), "*.py")
+        self.assertEqual(get_facet_label(Facet(EXTENSION, "")), "no extension")
+        self.assertEqual(get_facet_label(Facet(TOP_DIR, "src/")), "src/")
+        self.assertEqual(get_facet_label(Facet(ROOT, "./")), "under ./")
+
+    def test_active_matches(self) -> None:
+        index = FacetIndex()
+        paths = ["./a/x.py", "./b/y.py", "./a/z.md", "./b/w.md", "./a/v.py"]
+        for match_index, path in enumerate(paths):
+            index.add(path, match_index)
+        self.assertEqual(list(index.get_active_matches()), [0, 1, 2, 3, 4])
+        index.toggle(Facet(EXTENSION, ".py"))
+        self.assertEqual(list(index.get_active_matches()), [0, 1, 4])
+        # facets of another kind narrow it down
+        index.toggle(Facet(TOP_DIR, "a/"))
+        self.assertEqual(list(index.get_active_matches()), [0, 4])
+        # facets of the same kind add up
+        index.toggle(Facet(TOP_DIR, "b/"))
+        self.assertEqual(list(index.get_active_matches()), [0, 1, 4])
+        index.toggle(Facet(EXTENSION, ".py"))
+        index.toggle(Facet(TOP_DIR, "b/"))
+        self.assertEqual(list(index.get_active_matches()), [0, 2, 4])
+
+    def test_list_facets(self) -> None:
+        index = FacetIndex()
+        for match_index, path in enumerate(["./a/x.py", "./a/y.py", "./b/z.md"]):
+            index.add(path, match_index)
+        # every match is under ./ so that would not narrow anything down
+        self.assertEqual(
+            index.list_facets(),
+            [
+                Facet(EXTENSION, ".py"),
+                Facet(EXTENSION, ".md"),
+                Facet(TOP_DIR, "a/"),
+                Facet(TOP_DIR, "b/"),
+            ],
+        )
+        self.assertEqual(index.get_count(Facet(TOP_DIR, "a/")), 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
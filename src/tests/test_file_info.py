@@ -0,0 +1,83 @@
+# Copyright (c) Facebook, Inc. and its affiliates.
+#
+# This source code is licensed under the MIT license found in the
+# LICENSE file in the root directory of this source tree.
+import os
+import tempfile
+import unittest
+
+from pathpicker.file_info import (
+    LINE_COUNT_CHUNK,
+    FileInfoCache,
+    FileInfoPrefetcher,
+    count_lines,
+    format_size,
+)
+
+
+class TestFileInfo(unittest.TestCase):
+    def setUp(self) -> None:
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.temp_dir.name, "file.txt")
+
+    def tearDown(self) -> None:
+        self.temp_dir.cleanup()
+
+    def write(self, text: str, mtime: int) -> None:
+        with open(self.path, "w") as file:
+            file.write(text)
+        os.utime(self.path, (mtime, mtime))
+
+    def test_count_lines(self) -> None:
+        for text, num_lines in [
+            ("", 0),
+            ("no newline", 0),
+            ("a\nb\n", 2),
+            ("a\nb\nc", 2),
+            ("x\n" * LINE_COUNT_CHUNK, LINE_COUNT_CHUNK),
+        ]:
+            self.write(text, 1000)
+            self.assertEqual(count_lines(self.path, os.stat(self.path)), num_lines)
+        directory = self.temp_dir.name
+        self.assertEqual(count_lines(directory, os.stat(directory)), 0)
+
+    def test_format_size(self) -> None:
+        self.assertEqual(format_size(21), "21B")
+        self.assertEqual(format_size(3 * 1024 * 1024), "3M")
+
+    def test_cache(self) -> None:
+        cache = FileInfoCache()
+        self.write("a\n", 1000)
+        info = cache.get(self.path)
+        assert info is not None
+        self.assertEqual(info.num_lines, 1)
+        # until the file is modified we keep what we read
+        cache.infos[self.path] = info._replace(num_lines=42)
+        info = cache.get(self.path)
+        assert info is not None
+        self.assertEqual(info.num_lines, 42)
+        self.write("a\nb\nc\n", 2000)
+        info = cache.get(self.path)
+        assert info is not None
+        self.assertEqual(info.num_lines, 3)
+        os.remove(self.path)
+        self.assertIsNone(cache.get(self.path))
+
+    def test_prefetch(self) -> None:
+        cache = FileInfoCache()
+        prefetcher = FileInfoPrefetcher(cache)
+        self.write("a\nb\n", 1000)
+        missing = os.path.join(self.temp_dir.name, "missing.txt")
+        prefetcher.prefetch([self.path, missing])
+        self.assertTrue(prefetcher.wait_for(missing, 5))
+        self.assertTrue(prefetcher.wait_for(self.path, 5))
+        info = cache.peek(self.path)
+        assert info is not None
+        self.assertEqual(info.num_lines, 2)
+        # we know we could not read it, which is not the same as not knowing
+        self.assertTrue(cache.has(missing))
+        self.assertIsNone(cache.peek(missing))
+
+
+if __name__ == "__main__":
+    unittest.main()
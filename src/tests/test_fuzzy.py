@@ -0,0 +1,76 @@
+# Copyright (c) Facebook, Inc. and its affiliates.
+#
+# This source code is licensed under the MIT license found in the
+# LICENSE file in the root directory of this source tree.
+import unittest
+from typing import List
+
+from pathpicker.fuzzy import (
+    MAX_RESULTS,
+    NO_SCORE,
+    PREPARE_CHUNK_PATHS,
+    FuzzyFinder,
+    get_score,
+)
+
+PATHS = [
+    "src/pathpicker/screen_control.py",
+    "src/tests/test_screen.py",
+    "src/pathpicker/selection.py",
+    "README.md",
+    "src/pathpicker/screen.py",
+]
+
+
+class TestFuzzyFinder(unittest.TestCase):
+    def get_results(self, finder: FuzzyFinder, query: str) -> List[int]:
+        finder.start(query)
+        while finder.score_batch():
+            pass
+        return finder.get_results()
+
+    def test_scores(self) -> None:
+        self.assertEqual(get_score("sel", "src/screen.py"), NO_SCORE)
+        # consecutive and basename matches win
+        self.assertGreater(
+            get_score("screen", "src/screen.py"), get_score("screen", "src/s/c/r/een")
+        )
+        self.assertGreater(
+            get_score("sc", "src/pathpicker/sc.py"), get_score("sc", "sc/pathpicker.py")
+        )
+        # shorter paths break ties
+        self.assertGreater(get_score("a", "a/b"), get_score("a", "a/bb"))
+
+    def test_ranking(self) -> None:
+        finder = FuzzyFinder(len(PATHS), PATHS.__getitem__)
+        while finder.prepare_chunk():
+            pass
+        # ties go to the earlier match
+        self.assertEqual(self.get_results(finder, "screen"), [1, 4, 0, 2])
+        self.assertEqual(self.get_results(finder, "scrnctl"), [0])
+        self.assertEqual(self.get_results(finder, "SelPy"), [2, 0])
+        self.assertEqual(self.get_results(finder, "zzz"), [])
+
+    def test_unprepared_and_many_paths(self) -> None:
+        paths = [f"dir_{index % 7}/file_{index}.py" for index in range(12345)]
+        finder = FuzzyFinder(len(paths), paths.__getitem__)
+        finder.prepare_chunk()
+        self.assertEqual(finder.get_text(PREPARE_CHUNK_PATHS + 1), paths[5001])
+        results = self.get_results(finder, "d3f")
+        self.assertEqual(len(results), MAX_RESULTS)
+        expected = sorted(
+            (index for index, path in enumerate(paths) if path.startswith("dir_3")),
+            key=lambda index: (-get_score("d3f", paths[index]), index),
+        )[:MAX_RESULTS]
+        self.assertEqual(results, expected)
+        # refining the query only looks at the previous candidates, but
+        # finds the same paths as starting over
+        fresh_finder = FuzzyFinder(len(paths), paths.__getitem__)
+        self.assertEqual(
+            self.get_results(finder, "d3f12"), self.get_results(fresh_finder, "d3f12")
+        )
+        self.assertLess(len(finder.candidates), len(paths))
+
+
+if __name__ == "__main__":
+    unittest.main()
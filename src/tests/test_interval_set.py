@@ -0,0 +1,60 @@
+# Copyright (c) Facebook, Inc. and its affiliates.
+#
+# This source code is licensed under the MIT license found in the
+# LICENSE file in the root directory of this source tree.
+import random
+import unittest
+from typing import Set
+
+from pathpicker.interval_set import IntervalSet
+
+
+class TestIntervalSet(unittest.TestCase):
+    def assert_same(self, interval_set: IntervalSet, expected: Set[int]) -> None:
+        self.assertEqual(list(interval_set), sorted(expected))
+        self.assertEqual(len(interval_set), len(expected))
+        for index in range(-1, 60):
+            self.assertEqual(index in interval_set, index in expected)
+
+    def test_merges_adjacent_ranges(self) -> None:
+        interval_set = IntervalSet([(0, 5), (10, 15)])
+        interval_set.add_range(5, 10)
+        self.assertEqual(interval_set.get_ranges(), [(0, 15)])
+        interval_set.remove_range(3, 12)
+        self.assertEqual(interval_set.get_ranges(), [(0, 3), (12, 15)])
+        interval_set.toggle_range(2, 13)
+        self.assertEqual(interval_set.get_ranges(), [(0, 2), (3, 12), (13, 15)])
+
+    def test_from_indexes(self) -> None:
+        interval_set = IntervalSet.from_indexes([7, 1, 2, 3, 9, 8, 2])
+        self.assertEqual(interval_set.get_ranges(), [(1, 4), (7, 10)])
+        self.assertEqual(len(interval_set), 6)
+
+    def test_matches_python_sets(self) -> None:
+        rand = random.Random(0)
+        interval_set = IntervalSet()
+        expected: Set[int] = set()
+        for _ in range(500):
+            start = rand.randrange(0, 50)
+            end = start + rand.randrange(0, 10)
+            operation = rand.choice(["add", "remove", "toggle", "combine"])
+            if operation == "add":
+                interval_set.add_range(start, end)
+                expected |= set(range(start, end))
+            elif operation == "remove":
+                interval_set.remove_range(start, end)
+                expected -= set(range(start, end))
+            elif operation == "toggle":
+                interval_set.toggle_range(start, end)
+                expected ^= set(range(start, end))
+            else:
+                others = set(rand.sample(range(50), 10))
+                interval_set = interval_set.combine(
+                    IntervalSet.from_indexes(others), lambda a, b: a != b
+                )
+                expected ^= others
+            self.assert_same(interval_set, expected)
+
+
+if __name__ == "__main__":
+    unittest.main()
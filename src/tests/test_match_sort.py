@@ -0,0 +1,58 @@
+# Copyright (c) Facebook, Inc. and its affiliates.
+#
+# This source code is licensed under the MIT license found in the
+# LICENSE file in the root directory of this source tree.
+import os
+import tempfile
+import unittest
+
+import process_input
+from pathpicker.line_format import LineMatch
+from pathpicker.match_sort import (
+    MTIME_ORDER,
+    PATH_ORDER,
+    SIZE_ORDER,
+    MatchSorter,
+)
+from pathpicker.stat_cache import StatCache
+
+
+class TestMatchSort(unittest.TestCase):
+    def setUp(self) -> None:
+        self.temp_dir = tempfile.TemporaryDirectory()
+        root = self.temp_dir.name
+        for name, size, mtime in [("big", 300, 1000), ("small", 10, 3000)]:
+            path = os.path.join(root, f"{name}.txt")
+            with open(path, "w") as file:
+                file.write("x" * size)
+            os.utime(path, (mtime, mtime))
+        lines = [
+            f"{root}/small.txt:7: a",
+            f"{root}/missing.txt:1: b",
+            f"{root}/big.txt:9: c",
+            f"{root}/small.txt:2: d",
+        ]
+        line_objs = process_input.get_line_objs_from_lines(
+            lines, validate_file_exists=False
+        )
+        matches = [line for line in line_objs.values() if isinstance(line, LineMatch)]
+        self.stat_cache = StatCache()
+        self.sorter = MatchSorter(matches, self.stat_cache)
+
+    def tearDown(self) -> None:
+        self.temp_dir.cleanup()
+
+    def test_sort_all(self) -> None:
+        self.assertEqual(self.sorter.get_order(PATH_ORDER), [2, 1, 3, 0])
+        # the matches of a file stay together, and missing files go last
+        self.assertEqual(self.sorter.get_order(MTIME_ORDER), [3, 0, 2, 1])
+        self.assertEqual(self.sorter.get_order(SIZE_ORDER), [2, 3, 0, 1])
+        self.assertIsNone(self.stat_cache.get(f"{self.temp_dir.name}/missing.txt"))
+
+    def test_sort_some(self) -> None:
+        self.assertEqual(self.sorter.sort([0, 1, 2], MTIME_ORDER), [0, 2, 1])
+        self.assertEqual(self.sorter.sort([1, 3], PATH_ORDER), [1, 3])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,180 @@
+# Copyright (c) Facebook, Inc. and its affiliates.
+#
+# This source code is licensed under the MIT license found in the
+# LICENSE file in the root directory of this source tree.
+import os
+import subprocess
+import tempfile
+import unittest
+from typing import Optional
+from unittest import mock
+
+import process_input
+from pathpicker import output, state_files
+from pathpicker.line_format import LineMatch
+
+
+def which_for_test(program: str) -> Optional[str]:
+    # every program is on the PATH but the one that is made up, so the
+    # tests do not depend on what is installed
+    return None if program.startswith("fpp-no-such") else f"/usr/bin/{program}"
+
+
+class TestOutput(unittest.TestCase):
+    def setUp(self) -> None:
+        self.temp_dir = tempfile.TemporaryDirectory()
+        patcher = mock.patch.object(state_files, "FPP_DIR", self.temp_dir.name)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.addCleanup(self.temp_dir.cleanup)
+        self.path = state_files.get_script_output_file_path()
+
+    def read_script(self) -> str:
+        with open(self.path) as file:
+            return file.read()
+
+    def test_script_written_once(self) -> None:
+        output.clear_file()
+        self.assertEqual(self.read_script(), "")
+        output.append_to_file("echo a")
+        output.append_to_file("echo b")
+        # nothing reaches the disk before the flush
+        self.assertEqual(self.read_script(), "")
+        output.flush()
+        self.assertEqual(self.read_script(), "echo a\necho b\n")
+        # the temporary file was renamed over the script
+        self.assertEqual(
+            sorted(os.listdir(self.temp_dir.name)),
+            sorted(
+                [
+                    state_files.OUTPUT_FILE,
+                    state_files.ACTION_FILE,
+                    state_files.LOGGER_FILE,
+                ]
+            ),
+        )
+
+    def test_write_replaces_script(self) -> None:
+        output.clear_file()
+        output.append_to_file("echo a")
+        output.write_to_file("echo b")
+        output.append_to_file("echo c")
+        output.flush()
+        self.assertEqual(self.read_script(), "echo b\necho c\n")
+
+    @mock.patch.object(output, "get_argument_budget", return_value=4096)
+    def test_batched_command(self, _get_argument_budget: mock.Mock) -> None:
+        paths = [f"./dir {index}/it's {index}.txt" for index in range(1000)]
+        self.assertGreater(output.get_arguments_size(paths), 4096)
+        command = output.compose_batched_command("echo 'files:' $F", paths)
+        with open(state_files.get_file_list_path(), "rb") as file:
+            self.assertEqual(
+                file.read().split(b"\0"), [path.encode() for path in paths] + [b""]
+            )
+        batches = subprocess.run(
+            ["sh", "-c", command],
+            stdout=subprocess.PIPE,
+            check=True,
+            universal_newlines=True,
+        ).stdout.splitlines()
+        self.assertGreater(len(batches), 1)
+        for batch in batches:
+            self.assertLessEqual(len(batch), 4096)
+            self.assertTrue(batch.startswith("files: "))
+        echoed = " ".join(batch[len("files: ") :] for batch in batches)
+        self.assertEqual(echoed, " ".join(paths))
+
+    @mock.patch.dict(os.environ, {"FPP_EDITOR": "vim", "FPP_MAX_SPLITS": "2"})
+    def test_quickfix(self) -> None:
+        lines = ["/a/x.py:7: a", "/a/y.py:2: b", "/b/z.py:3: c"]
+        line_objs = process_input.get_line_objs_from_lines(
+            lines, validate_file_exists=False
+        )
+        matches = [line for line in line_objs.values() if isinstance(line, LineMatch)]
+        output.clear_file()
+        output.edit_files(matches[:2])
+        output.edit_files(matches)
+        with open(state_files.get_quickfix_file_path()) as file:
+            self.assertEqual(
+                file.read().splitlines(),
+                [
+                    "/a/x.py:7:a",
+                    "/a/y.py:2:b",
+                    "/b/z.py:3:c",
+                ],
+            )
+        with open(state_files.get_args_file_path()) as file:
+            self.assertEqual(file.read(), "/a/x.py\n/a/y.py\n/b/z.py\n")
+        self.assertTrue(output.script_lines[0].startswith("vim  +7 /a/x.py"))
+        self.assertIn('+"vsp +2 /a/y.py"', output.script_lines[0])
+        self.assertTrue(
+            output.script_lines[2].startswith(
+                f"vim -q {state_files.get_quickfix_file_path()} +"
+            )
+        )
+
+    @mock.patch.dict(
+        os.environ,
+        {"FPP_EDITOR": "vim", "FPP_MAX_SPLITS": "2", "FPP_DISABLE_SPLIT": "1"},
+    )
+    def test_quickfix_disable_split(self) -> None:
+        lines = ["/a/x.py:7: a", "/a/y.py:2: b", "/b/z.py:3: c"]
+        line_objs = process_input.get_line_objs_from_lines(
+            lines, validate_file_exists=False
+        )
+        matches = [line for line in line_objs.values() if isinstance(line, LineMatch)]
+        output.clear_file()
+        output.edit_files(matches)
+        # the files are edited in sequence, not from a quickfix list
+        self.assertEqual(output.script_lines[0], "vim  '/a/x.py' '/a/y.py' '/b/z.py'")
+
+    @mock.patch("shutil.which", which_for_test)
+    def test_direct_arguments(self) -> None:
+        self.assertEqual(
+            output.get_direct_arguments("vim  +7 './a b.py' +\"vsp +2 ./c.py\""),
+            ["vim", "+7", "./a b.py", "+vsp +2 ./c.py"],
+        )
+        self.assertEqual(
+            output.get_direct_arguments("git add './a.py'"), ["git", "add", "./a.py"]
+        )
+        for command in [
+            "git add $HOME",
+            "wc -l *.py",
+            "cat './a.py' | wc -l",
+            "echo hi; ls",
+            "cat < ./a.py",
+            "ls ~/a.py",
+            "FOO=1 ls",
+            "ls 'unbalanced",
+            "fpp-no-such-program ./a.py",
+        ]:
+            self.assertIsNone(output.get_direct_arguments(command), command)
+
+    @mock.patch.dict(os.environ, {"FPP_EDITOR": "vim", "FPP_DIRECT_EXEC": "1"})
+    @mock.patch("shutil.which", which_for_test)
+    def test_direct_action(self) -> None:
+        path = os.path.join(self.temp_dir.name, "file.txt")
+        with open(path, "w") as file:
+            file.write("a\n" * 9)
+        line_objs = process_input.get_line_objs_from_lines([f"{path}:9: a"])
+        matches = [line for line in line_objs.values() if isinstance(line, LineMatch)]
+        output.clear_file()
+        output.edit_files(matches)
+        output.flush()
+        with open(state_files.get_action_file_path(), "rb") as file:
+            action = file.read().split(b"\0")
+        self.assertEqual(action, [b"vim", b"+9", path.encode(), b""])
+        # a new script drops the action
+        output.write_to_file("echo hi")
+        output.flush()
+        self.assertEqual(os.path.getsize(state_files.get_action_file_path()), 0)
+        # the shell runs everything unless asked not to
+        del os.environ["FPP_DIRECT_EXEC"]
+        output.clear_file()
+        output.edit_files(matches)
+        output.flush()
+        self.assertEqual(os.path.getsize(state_files.get_action_file_path()), 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,42 @@
+# Copyright (c) Facebook, Inc. and its affiliates.
+#
+# This source code is licensed under the MIT license found in the
+# LICENSE file in the root directory of this source tree.
+import io
+import os
+import tempfile
+import unittest
+
+from pathpicker.output import get_arguments_command
+from pathpicker.parallel import read_file_list, run_in_parallel
+
+
+class TestParallel(unittest.TestCase):
+    def test_run_in_parallel(self) -> None:
+        paths = [f"file {index}.txt" for index in range(20)]
+        # two lines per file, which would interleave without grouping
+        command = get_arguments_command(
+            'echo "start $F"; sleep 0.01; echo "end $F"; case $F in *5*) exit 3;; esac'
+        )
+        out = io.BytesIO()
+        failed = run_in_parallel(command, paths, 4, out)
+        self.assertEqual(failed, ["file 5.txt", "file 15.txt"])
+        lines = out.getvalue().decode().splitlines()
+        self.assertEqual(len(lines), 3 * len(paths))
+        for index in range(0, len(lines), 3):
+            (progress, start, end) = lines[index : index + 3]
+            path = start[len("start ") :]
+            self.assertTrue(progress.startswith(f"[{index // 3 + 1}/20] {path}"))
+            self.assertEqual(path in failed, "failed with 3" in progress)
+            self.assertEqual(end, f"end {path}")
+
+    def test_read_file_list(self) -> None:
+        with tempfile.TemporaryDirectory() as temp_dir:
+            path = os.path.join(temp_dir, "list")
+            with open(path, "wb") as file:
+                file.write(b"./a b.txt\0it's\0")
+            self.assertEqual(read_file_list(path), ["./a b.txt", "it's"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,33 @@
+# Copyright (c) Facebook, Inc. and its affiliates.
+#
+# This source code is licensed under the MIT license found in the
+# LICENSE file in the root directory of this source tree.
+import unittest
+
+from pathpicker.path_groups import EXPANDED_INDENT, PathGroups
+
+
+class TestPathGroups(unittest.TestCase):
+    def test_groups(self) -> None:
+        groups = PathGroups()
+        for index, path in enumerate(["a.py", "b.py", "a.py", "c.py", "b.py"]):
+            groups.add(path, index)
+        self.assertEqual(groups.get_first_indexes(), [0, 1, 3])
+        self.assertEqual(groups.get_shown_indexes(), [0, 1, 3])
+        groups.toggle_expanded("a.py")
+        self.assertEqual(groups.get_shown_indexes(), [0, 2, 1, 3])
+        groups.toggle_expanded("a.py")
+        self.assertEqual(groups.get_shown_indexes(), [0, 1, 3])
+
+    def test_prefix(self) -> None:
+        groups = PathGroups()
+        groups.add("a.py", 0)
+        groups.add("a.py", 1)
+        groups.add("b.py", 2)
+        self.assertEqual(groups.get_prefix("a.py", 0, 12), "[2 hits, line 12] ")
+        self.assertEqual(groups.get_prefix("a.py", 1, 40), EXPANDED_INDENT)
+        self.assertEqual(groups.get_prefix("b.py", 2, 0), "[1 hit] ")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,63 @@
+# Copyright (c) Facebook, Inc. and its affiliates.
+#
+# This source code is licensed under the MIT license found in the
+# LICENSE file in the root directory of this source tree.
+import unittest
+from typing import List
+
+from pathpicker import path_tree
+from pathpicker.path_tree import PathTree, TreeNode
+
+PATHS = [
+    "src/a/b/one.py",
+    "README.md",
+    "src/a/b/two.py",
+    "src/c.py",
+    "src/a/b/one.py",
+    "/etc/hosts",
+]
+
+
+def get_rows(nodes: List[TreeNode]) -> List[str]:
+    return [f"{node.depth}:{node.name}:{node.count}" for node in nodes]
+
+
+class TestPathTree(unittest.TestCase):
+    def test_tree(self) -> None:
+        tree = PathTree(len(PATHS), PATHS.__getitem__)
+        self.assertEqual(
+            get_rows(tree.get_visible_nodes()),
+            ["1:/etc/:1", "1:src/:4", "1:README.md:1"],
+        )
+        src = tree.get_visible_nodes()[1]
+        src.expanded = True
+        self.assertEqual(
+            get_rows(tree.get_visible_nodes()),
+            ["1:/etc/:1", "1:src/:4", "2:a/b/:3", "2:c.py:1", "1:README.md:1"],
+        )
+        self.assertEqual(sorted(tree.get_match_indexes(src)), [0, 2, 3, 4])
+        a_b = tree.get_visible_nodes()[2]
+        a_b.expanded = True
+        self.assertEqual(
+            get_rows(tree.get_visible_nodes())[3:5], ["3:one.py:2", "3:two.py:1"]
+        )
+
+    def test_chunks(self) -> None:
+        paths = [f"dir_{index % 3}/file_{index}" for index in range(10)]
+        tree = PathTree(len(paths), paths.__getitem__)
+        old_chunk_paths = path_tree.GROUP_CHUNK_PATHS
+        path_tree.GROUP_CHUNK_PATHS = 4
+        try:
+            self.assertTrue(tree.prepare_chunk())
+            self.assertTrue(tree.prepare_chunk())
+            self.assertFalse(tree.prepare_chunk())
+        finally:
+            path_tree.GROUP_CHUNK_PATHS = old_chunk_paths
+        self.assertEqual(
+            get_rows(tree.get_visible_nodes()),
+            ["1:dir_0/:4", "1:dir_1/:3", "1:dir_2/:3"],
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,69 @@
+# Copyright (c) Facebook, Inc. and its affiliates.
+#
+# This source code is licensed under the MIT license found in the
+# LICENSE file in the root directory of this source tree.
+import re
+import unittest
+
+import process_input
+from pathpicker.line_format import LineMatch
+from pathpicker.patterns import get_matching_indexes, parse_selection_pattern
+
+# the paths get prepended like the ones of real matches, so they end up
+# absolute or starting with ./
+LINES = [
+    "src/pathpicker/parse.py:12: def parse",
+    "./src/tests/test_parse.py",
+    "README.md",
+    "src/pathpicker/screen_control.py",
+]
+PATHS = [
+    line_obj.get_path()
+    for line_obj in process_input.get_line_objs_from_lines(
+        LINES, validate_file_exists=False
+    ).values()
+    if isinstance(line_obj, LineMatch)
+]
+
+
+class TestPatterns(unittest.TestCase):
+    def get_matches(self, text: str) -> list:
+        pattern = parse_selection_pattern(text)
+        return get_matching_indexes(pattern.matches, PATHS)
+
+    def test_globs_match_end_of_path(self) -> None:
+        self.assertEqual(len(PATHS), len(LINES))
+        self.assertEqual(self.get_matches("*.py"), [0, 1, 3])
+        self.assertEqual(self.get_matches("src/*.py"), [0, 1, 3])
+        self.assertEqual(self.get_matches("src/pathpicker/*"), [0, 3])
+        self.assertEqual(self.get_matches("tests/*"), [1])
+        self.assertEqual(self.get_matches("parse.py"), [0])
+        self.assertEqual(self.get_matches("arse.py"), [])
+        self.assertEqual(self.get_matches("*parse*"), [0, 1])
+        self.assertEqual(self.get_matches(PATHS[2]), [2])
+
+    def test_line_globs_match_whole_line(self) -> None:
+        pattern = parse_selection_pattern("line:def*")
+        self.assertFalse(pattern.matches("    def parse"))
+        self.assertTrue(pattern.matches("def parse"))
+
+    def test_regexes_search(self) -> None:
+        self.assertEqual(self.get_matches("re:parse"), [0, 1])
+        self.assertEqual(self.get_matches("re:/[A-Z][^/]*$"), [2])
+
+    def test_prefixes(self) -> None:
+        pattern = parse_selection_pattern("!line:re:TODO")
+        self.assertFalse(pattern.select)
+        self.assertTrue(pattern.whole_line)
+        self.assertTrue(pattern.matches("  # TODO: fix"))
+        pattern = parse_selection_pattern("*.md")
+        self.assertTrue(pattern.select)
+        self.assertFalse(pattern.whole_line)
+
+    def test_invalid_regex(self) -> None:
+        with self.assertRaises(re.error):
+            parse_selection_pattern("re:(")
+
+
+if __name__ == "__main__":
+    unittest.main()
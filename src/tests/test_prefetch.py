@@ -0,0 +1,42 @@
+# Copyright (c) Facebook, Inc. and its affiliates.
+#
+# This source code is licensed under the MIT license found in the
+# LICENSE file in the root directory of this source tree.
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+from pathpicker import prefetch
+from pathpicker.prefetch import PagePrefetcher, prefetch_file
+
+
+@unittest.skipUnless(prefetch.is_supported(), "needs posix_fadvise")
+class TestPrefetch(unittest.TestCase):
+    def setUp(self) -> None:
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.temp_dir.cleanup)
+        self.paths = []
+        for (name, size) in [("a.txt", 100), ("b.txt", 2000)]:
+            path = os.path.join(self.temp_dir.name, name)
+            with open(path, "wb") as file:
+                file.write(b"x" * size)
+            self.paths.append(path)
+
+    def test_prefetch_file(self) -> None:
+        self.assertEqual(prefetch_file(self.paths[1]), 2000)
+        self.assertEqual(prefetch_file(self.temp_dir.name), 0)
+        self.assertEqual(prefetch_file(os.path.join(self.temp_dir.name, "no")), 0)
+        with mock.patch.object(prefetch, "MAX_PREFETCH_FILE_BYTES", 1024):
+            self.assertEqual(prefetch_file(self.paths[1]), 1024)
+
+    def test_prefetcher(self) -> None:
+        prefetcher = PagePrefetcher()
+        self.assertEqual(prefetcher.wait(1), 0)
+        # a path selected twice is only counted once
+        prefetcher.start(self.paths + self.paths[:1])
+        self.assertEqual(prefetcher.wait(10), 2100)
+
+
+if __name__ == "__main__":
+    unittest.main()
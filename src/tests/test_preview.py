@@ -0,0 +1,74 @@
+# Copyright (c) Facebook, Inc. and its affiliates.
+#
+# This source code is licensed under the MIT license found in the
+# LICENSE file in the root directory of this source tree.
+import os
+import tempfile
+import unittest
+
+from pathpicker.preview import INDEX_CHUNK_BYTES, FilePreviewer
+
+
+class TestPreview(unittest.TestCase):
+    def setUp(self) -> None:
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.previewer = FilePreviewer()
+
+    def tearDown(self) -> None:
+        self.temp_dir.cleanup()
+
+    def write(self, name: str, content: bytes) -> str:
+        path = os.path.join(self.temp_dir.name, name)
+        with open(path, "wb") as file:
+            file.write(content)
+        return path
+
+    def test_lines_around_match(self) -> None:
+        path = self.write("a.txt", b"".join(b"line %d\n" % i for i in range(1, 21)))
+        preview = self.previewer.get_preview(path, 10, 6)
+        assert preview is not None
+        self.assertEqual(preview.first_line, 8)
+        self.assertEqual(preview.lines, [f"line {i}" for i in range(8, 14)])
+        # the end of the file, and the newline there does not add a line
+        preview = self.previewer.get_preview(path, 20, 6)
+        assert preview is not None
+        self.assertEqual(preview.lines, ["line 18", "line 19", "line 20"])
+        # without a line number we show the top
+        preview = self.previewer.get_preview(path, 0, 2)
+        assert preview is not None
+        self.assertEqual(preview.lines, ["line 1", "line 2"])
+        self.assertIs(self.previewer.get_preview(path, 0, 2), preview)
+
+    def test_line_endings(self) -> None:
+        path = self.write("b.txt", b"a\tb\r\nlast")
+        preview = self.previewer.get_preview(path, 1, 4)
+        assert preview is not None
+        self.assertEqual(preview.lines, ["a   b", "last"])
+
+    def test_pending(self) -> None:
+        line = b"x" * 99 + b"\n"
+        num_lines = 3 * INDEX_CHUNK_BYTES // len(line)
+        path = self.write("big.txt", line * num_lines)
+        self.assertIsNone(self.previewer.get_preview(path, num_lines, 3))
+        num_chunks = 1
+        while self.previewer.index_pending():
+            num_chunks += 1
+        self.assertEqual(num_chunks, 3)
+        preview = self.previewer.get_preview(path, num_lines, 3)
+        assert preview is not None
+        self.assertEqual(preview.first_line, num_lines - 1)
+        self.assertEqual(len(preview.lines), 2)
+
+    def test_skipped_files(self) -> None:
+        path = self.write("c.bin", b"\x7fELF\0\0\0")
+        preview = self.previewer.get_preview(path, 1, 4)
+        assert preview is not None
+        self.assertEqual(preview.note, "binary file")
+        missing = os.path.join(self.temp_dir.name, "missing.txt")
+        preview = self.previewer.get_preview(missing, 1, 4)
+        assert preview is not None
+        self.assertEqual(preview.note, "could not read the file")
+
+
+if __name__ == "__main__":
+    unittest.main()
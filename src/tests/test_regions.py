@@ -0,0 +1,48 @@
+# Copyright (c) Facebook, Inc. and its affiliates.
+#
+# This source code is licensed under the MIT license found in the
+# LICENSE file in the root directory of this source tree.
+import unittest
+
+from pathpicker.color_printer import ColorPrinter
+from pathpicker.regions import PadRegion
+from tests.lib.curses_api import CursesForTest
+from tests.lib.screen import ScreenForTest
+
+
+class TestPadRegion(unittest.TestCase):
+    def setUp(self) -> None:
+        self.screen = ScreenForTest([], 20, 10)
+        printer = ColorPrinter(self.screen, CursesForTest())
+        self.region = PadRegion(printer, chunk_lines=10)
+        self.region.set_geometry(0, 0, 10, 20)
+        self.region.reset()
+
+    def test_only_draws_revealed_chunks(self) -> None:
+        self.assertEqual(list(self.region.reveal(0, 10)), list(range(0, 10)))
+        # scrolling within drawn chunks draws nothing new
+        self.assertEqual(list(self.region.reveal(0, 10)), [])
+        self.assertEqual(list(self.region.reveal(5, 15)), list(range(10, 20)))
+        self.assertEqual(list(self.region.reveal(3, 13)), [])
+        self.assertEqual(self.region.get_line_offset(-3), 0)
+
+    def test_moves_pad_when_scrolling_past_it(self) -> None:
+        self.region.reveal(0, 10)
+        self.region.printer.addstr(0, 0, "first")
+        # the pad holds 3 chunks, so this is out of range
+        self.assertEqual(list(self.region.reveal(55, 65)), list(range(50, 70)))
+        self.assertEqual(self.region.get_line_offset(-55), -50)
+        self.region.noutrefresh()
+        self.assertEqual(self.screen.get_rows()[0], "")
+
+    def test_copies_viewport_to_screen(self) -> None:
+        for index in self.region.reveal(5, 15):
+            self.region.printer.addstr(index, 0, f"line {index}")
+        self.region.noutrefresh()
+        rows = self.screen.get_rows()
+        self.assertEqual(rows[0], "line 5")
+        self.assertEqual(rows[9], "line 14")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,78 @@
+# Copyright (c) Facebook, Inc. and its affiliates.
+#
+# This source code is licensed under the MIT license found in the
+# LICENSE file in the root directory of this source tree.
+import unittest
+from typing import Hashable, List
+
+from pathpicker.scheduler import NO_TIMEOUT, IdleScheduler, Job
+
+
+class FakeClock:  # pylint: disable=too-few-public-methods
+    def __init__(self, step: float):
+        self.now = 0.0
+        self.step = step
+
+    def __call__(self) -> float:
+        # every reading of the clock costs some time
+        self.now += self.step
+        return self.now
+
+
+def recorder(ran: List[Hashable], value: Hashable) -> Job:
+    def job() -> bool:
+        ran.append(value)
+        return False
+
+    return job
+
+
+class TestIdleScheduler(unittest.TestCase):
+    def test_runs_closest_to_viewport_first(self) -> None:
+        scheduler = IdleScheduler(time_slice=1.0, clock=FakeClock(0.01))
+        scheduler.set_viewport(10, 20)
+        ran: List[Hashable] = []
+        for row in [40, 15, 5, None, 22]:
+            scheduler.submit(row, row, recorder(ran, row))
+        self.assertEqual(scheduler.run_slice(), 5)
+        self.assertEqual(ran, [15, 22, 5, 40, None])
+        self.assertEqual(scheduler.get_timeout(), NO_TIMEOUT)
+
+    def test_cancels_stale_jobs_on_scroll(self) -> None:
+        scheduler = IdleScheduler(time_slice=1.0, clock=FakeClock(0.01))
+        scheduler.set_viewport(0, 10)
+        ran: List[Hashable] = []
+        scheduler.submit("near", 5, recorder(ran, "near"))
+        scheduler.submit("global", None, recorder(ran, "global"))
+        scheduler.set_viewport(1000, 1010)
+        scheduler.run_slice()
+        self.assertEqual(ran, ["global"])
+
+    def test_respects_time_slice_and_resumes(self) -> None:
+        scheduler = IdleScheduler(time_slice=0.1, clock=FakeClock(0.01))
+        chunks = list(range(100))
+
+        def process_chunk() -> bool:
+            chunks.pop()
+            return bool(chunks)
+
+        scheduler.submit("index", None, process_chunk)
+        num_run = scheduler.run_slice()
+        self.assertLess(num_run, 100)
+        self.assertTrue(scheduler.has_pending())
+        while scheduler.has_pending():
+            scheduler.run_slice()
+        self.assertEqual(chunks, [])
+
+    def test_resubmit_replaces_job(self) -> None:
+        scheduler = IdleScheduler(time_slice=1.0, clock=FakeClock(0.01))
+        ran: List[Hashable] = []
+        scheduler.submit("job", 0, recorder(ran, "old"))
+        scheduler.submit("job", 0, recorder(ran, "new"))
+        scheduler.cancel("other")
+        scheduler.run_slice()
+        self.assertEqual(ran, ["new"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -149,6 +149,13 @@ SCREEN_TEST_CASES: List[ScreenTestCase] = [
         with_attributes=True,
         inputs=["x", "G", "J"],
     ),
+    ScreenTestCase(
+        "xModeIdleTicks",
+        input_file="gitDiff.txt",
+        with_attributes=True,
+        # getch timing out must not pick a label
+        inputs=["x", "", ""],
+    ),
     ScreenTestCase(
         "gitAbbreviatedFiles",
         input_file="gitAbbreviatedFiles.txt",
@@ -156,6 +163,89 @@ SCREEN_TEST_CASES: List[ScreenTestCase] = [
         inputs=["f", "j"],
     ),
     ScreenTestCase("selectAllBug", input_file="gitLongDiff.txt", inputs=["A"]),
+    ScreenTestCase(
+        "rangeSelectAndInvert",
+        inputs=["j", "v", "j", "j", "j", "S", "k", "v", "j", "j", "I"],
+    ),
+    ScreenTestCase(
+        "filterAndSelect",
+        inputs=["/", "t", "e", "s", "s", "BACKSPACE", "t", "ENTER", "j", "f"],
+    ),
+    ScreenTestCase(
+        "filterAndClear",
+        inputs=["j", "/", "c", "h", "\x1b", "f"],
+    ),
+    ScreenTestCase(
+        "fuzzyFindAndSelect",
+        inputs=["z", "s", "c", "p", "y", "ENTER", "j", "f"],
+    ),
+    ScreenTestCase(
+        "compactOnlyMatches",
+        input_file="gitLongDiff.txt",
+        inputs=["m", "j", "f"],
+    ),
+    ScreenTestCase(
+        "compactWithContext",
+        input_file="gitLongDiff.txt",
+        args=["--context", "1"],
+        inputs=["m", "G", "f"],
+    ),
+    ScreenTestCase(
+        "treeSelectDirectory",
+        input_file="tonsOfFiles.txt",
+        validate_file_exists=False,
+        inputs=["t", "l", "j", "l", "j", "f", "j"],
+    ),
+    ScreenTestCase(
+        "treeGoToMatch",
+        input_file="tonsOfFiles.txt",
+        validate_file_exists=False,
+        inputs=["t", "l", "G", "l", "j", "ENTER", "f"],
+        with_attributes=True,
+    ),
+    ScreenTestCase(
+        "groupByFileAndExpand",
+        input_file="gitGrepLineNumbers.txt",
+        validate_file_exists=False,
+        inputs=["u", "j", "e", "j", "f"],
+        with_attributes=True,
+    ),
+    ScreenTestCase(
+        "sortByPath",
+        input_file="tonsOfFiles.txt",
+        validate_file_exists=False,
+        inputs=["j", "f", "o"],
+        with_attributes=True,
+    ),
+    ScreenTestCase(
+        "sortStatusAfterIdleTick",
+        input_file="tonsOfFiles.txt",
+        validate_file_exists=False,
+        # the status stays up while getch times out
+        inputs=["o", ""],
+    ),
+    ScreenTestCase(
+        "previewFile",
+        input_file="gitGrepPreview.txt",
+        inputs=["w", "j"],
+        screen_config={"maxX": 201, "maxY": 50},
+    ),
+    ScreenTestCase(
+        "facetToggleTopDir",
+        input_file="tonsOfFiles.txt",
+        validate_file_exists=False,
+        inputs=["2", "j", "f"],
+        screen_config={"maxX": 201, "maxY": 50},
+    ),
+    ScreenTestCase(
+        "facetThenFilter",
+        input_file="facetFilter.txt",
+        validate_file_exists=False,
+        # once the index is built, turning *.txt on searches for zzz
+        # within it, and zzz is rarer than *.txt but mostly outside of it
+        inputs=["", "", "/", "z", "z", "z", "ENTER", "1"],
+        screen_config={"maxX": 201, "maxY": 50},
+    ),
     ScreenTestCase(
         "allInputBranch", input_file="gitBranch.txt", args=["-ai"], inputs=["j", "f"]
     ),
@@ -187,6 +277,22 @@ SCREEN_TEST_CASES: List[ScreenTestCase] = [
         validate_file_exists=False,
         screen_config={"maxY": 10},
     ),
+    ScreenTestCase(
+        "longListPageUpAndDownWithPad",
+        input_file="longList.txt",
+        inputs=["NPAGE", "NPAGE", "NPAGE", "PPAGE"],
+        args=["--pad-scrolling"],
+        validate_file_exists=False,
+    ),
+    ScreenTestCase(
+        "longListEndKeyWithPad",
+        input_file="longList.txt",
+        inputs=["END"],
+        args=["--pad-scrolling"],
+        with_attributes=True,
+        validate_file_exists=False,
+        screen_config={"maxY": 10},
+    ),
     ScreenTestCase(
         "tonsOfFiles",
         input_file="tonsOfFiles.txt",
@@ -0,0 +1,41 @@
+# Copyright (c) Facebook, Inc. and its affiliates.
+#
+# This source code is licensed under the MIT license found in the
+# LICENSE file in the root directory of this source tree.
+import unittest
+
+from pathpicker.selection import SelectionModel
+
+
+class TestSelectionModel(unittest.TestCase):
+    def test_single_updates(self) -> None:
+        selection = SelectionModel([5])
+        selection.set_selected(2, True)
+        selection.set_selected(9, True)
+        selection.set_selected(5, False)
+        self.assertTrue(selection.is_selected(2))
+        self.assertFalse(selection.is_selected(5))
+        self.assertEqual(selection.get_count(), 2)
+        self.assertEqual(selection.get_selected_indexes(), [2, 9])
+
+    def test_bulk_updates(self) -> None:
+        selection = SelectionModel()
+        selection.set_many(range(0, 10), True)
+        selection.set_many([3, 4], False)
+        self.assertEqual(selection.get_count(), 8)
+        selection.toggle_many(range(0, 6))
+        self.assertEqual(selection.get_selected_indexes(), [3, 4, 6, 7, 8, 9])
+
+    def test_range_updates(self) -> None:
+        selection = SelectionModel([0])
+        selection.set_range(10, 5010, True)
+        selection.toggle_range(5000, 5020)
+        self.assertEqual(selection.get_count(), 1 + 4990 + 10)
+        self.assertTrue(selection.is_selected(4999))
+        self.assertFalse(selection.is_selected(5005))
+        selection.set_range(0, 5015, False)
+        self.assertEqual(selection.get_selected_indexes(), list(range(5015, 5020)))
+
+
+if __name__ == "__main__":
+    unittest.main()
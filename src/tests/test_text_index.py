@@ -0,0 +1,66 @@
+# Copyright (c) Facebook, Inc. and its affiliates.
+#
+# This source code is licensed under the MIT license found in the
+# LICENSE file in the root directory of this source tree.
+import random
+import unittest
+
+from pathpicker.text_index import INDEX_CHUNK_LINES, TrigramIndex
+
+WORDS = ["src", "Test", "parse", "screen", "py", "md", "/", "_", "."]
+
+
+def make_lines(num_lines: int) -> list:
+    rand = random.Random(4)
+    return [
+        "".join(rand.choice(WORDS) for _ in range(rand.randint(0, 8)))
+        for _ in range(num_lines)
+    ]
+
+
+class TestTrigramIndex(unittest.TestCase):
+    def setUp(self) -> None:
+        self.lines = make_lines(2 * INDEX_CHUNK_LINES + 10)
+        self.index = TrigramIndex(len(self.lines), self.lines.__getitem__)
+
+    def get_expected(self, query: str) -> list:
+        return [
+            index
+            for index, line in enumerate(self.lines)
+            if query.lower() in line.lower()
+        ]
+
+    def check_queries(self) -> None:
+        for query in ["", "s", "te", "test", "ESTP", "py/src", "_.md", "zzz"]:
+            self.assertEqual(self.index.search(query), self.get_expected(query))
+
+    def test_search_while_indexing(self) -> None:
+        self.check_queries()
+        self.assertTrue(self.index.index_chunk())
+        self.check_queries()
+        while self.index.index_chunk():
+            pass
+        self.assertEqual(self.index.get_num_indexed(), len(self.lines))
+        self.check_queries()
+
+    def test_search_within_previous_result(self) -> None:
+        self.index.index_chunk()
+        within = self.index.search("scr")
+        self.assertEqual(
+            self.index.search("screen", within), self.get_expected("screen")
+        )
+
+    def test_search_within_outside_rarest(self) -> None:
+        lines = ["a/x.txt", "b/y.txt", "c/zzz.py", "d/w.txt"]
+        index = TrigramIndex(len(lines), lines.__getitem__)
+        index.index_chunk()
+        # the rarest trigram (zzz) is only in a line outside of within
+        within = [0, 1, 3]
+        self.assertEqual(index.search("zzz", within), [])
+        self.assertEqual(index.search("zzz.", within), [])
+        self.assertEqual(index.search(".txt", within), [0, 1, 3])
+        self.assertEqual(index.search("y.t", [1, 2]), [1])
+
+
+if __name__ == "__main__":
+    unittest.main()
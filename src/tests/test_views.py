@@ -0,0 +1,33 @@
+# Copyright (c) Facebook, Inc. and its affiliates.
+#
+# This source code is licensed under the MIT license found in the
+# LICENSE file in the root directory of this source tree.
+import unittest
+
+from pathpicker.views import LineView
+
+
+class TestLineView(unittest.TestCase):
+    def test_show_all(self) -> None:
+        view = LineView.show_all(10, 4)
+        self.assertEqual(view.get_num_rows(), 10)
+        self.assertEqual(view.get_row(7), 7)
+        self.assertEqual(view.get_line_index(7), 7)
+        self.assertEqual(view.get_nearest_match(3, 1), 0)
+
+    def test_subset(self) -> None:
+        view = LineView([2, 5, 9], [1, 4])
+        self.assertEqual(view.get_row(5), 1)
+        self.assertTrue(view.has_line(9))
+        self.assertFalse(view.has_line(6))
+        self.assertEqual(view.get_line_index(2), 9)
+        # matches that are not in view move to their neighbours
+        self.assertEqual(view.get_nearest_match(2), 4)
+        self.assertEqual(view.get_nearest_match(2, 1), 4)
+        self.assertEqual(view.get_nearest_match(2, -1), 1)
+        self.assertEqual(view.get_nearest_match(4, 1), 1)
+        self.assertEqual(view.get_num_matches(), 2)
+
+
+if __name__ == "__main__":
+    unittest.main()